@@ -0,0 +1,147 @@
+import gzip
+import html
+import json
+import re
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+# Kasus benchmark: game di utils.games -> nama fixture untuk setiap halamannya
+CASES = {
+    "genshin": ("genshin_active", "genshin_history"),
+    "starrail": ("starrail",),
+    "honkai": ("honkai",),
+}
+
+TABLE_PATTERN = re.compile(rb'<table class="wikitable.*?</table>', re.S)
+ROW_PATTERN = re.compile(rb"<tr[ >].*?</tr>\n?", re.S)
+# Tabel wikitext: baris data diawali "|-" hingga penutup "|}"
+WIKI_TABLE_PATTERN = re.compile(r"^\{\|[^\n]*wikitable.*?^\|\}", re.S | re.M)
+WIKI_ROW_PATTERN = re.compile(r"^\|-.*?(?=^\|-|^\|\})", re.S | re.M)
+
+
+# Gambar hadiah di HTML Fandom: nama file & URL CDN-nya
+IMAGE_PATTERN = re.compile(rb'data-image-name="([^"]+)"[^>]*?data-src="([^"]+)"')
+
+# Fixture per mode ingest: HTML halaman Fandom atau respons wikitext MediaWiki API
+SUFFIXES = {"html": ".html.gz", "wikitext": ".wikitext.json.gz"}
+
+
+# Fixture yang benar-benar direkam dari wiki asli lewat --record: {"nama@ingest": waktu}.
+# Fixture lain disusun ulang dari layout halaman, bukan salinan respons asli.
+RECORDED_FILE = FIXTURE_DIR / "recorded.json"
+
+
+def fixture_path(name: str, ingest: str = "html") -> Path:
+    return FIXTURE_DIR / f"{name}{SUFFIXES[ingest]}"
+
+
+def load_fixture(name: str, ingest: str = "html") -> bytes:
+    """Snapshot halaman Fandom atau respons API (disimpan ter-gzip)."""
+    return gzip.decompress(fixture_path(name, ingest).read_bytes())
+
+
+def save_fixture(name: str, content: bytes, ingest: str = "html"):
+    # mtime=0 agar file fixture deterministik (tidak berubah jika isinya sama)
+    fixture_path(name, ingest).write_bytes(gzip.compress(content, compresslevel=9, mtime=0))
+
+
+def recorded_fixtures() -> dict[str, str]:
+    try:
+        return json.loads(RECORDED_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def mark_recorded(name: str, ingest: str):
+    recorded = recorded_fixtures()
+    recorded[f"{name}@{ingest}"] = datetime.now(UTC).isoformat(timespec="seconds")
+    RECORDED_FILE.write_text(json.dumps(recorded, indent=4, sort_keys=True), encoding="utf-8")
+
+
+def is_recorded(case: str) -> bool:
+    """True jika semua fixture kasus ini (HTML & wikitext) direkam dari wiki asli."""
+    recorded = recorded_fixtures()
+    return all(f"{name}@{ingest}" in recorded for name in CASES[case] for ingest in SUFFIXES)
+
+
+def count_rows(html: bytes) -> int:
+    """Jumlah baris data (tanpa header) di semua table.wikitable."""
+    return sum(max(len(ROW_PATTERN.findall(table)) - 1, 0) for table in TABLE_PATTERN.findall(html))
+
+
+def scale_page(html: bytes, factor: int) -> bytes:
+    """
+    Halaman sintetis dengan baris data setiap table.wikitable diulang `factor` kali.
+    Salinan ke-n mendapat sufiks "S<n>" pada setiap kode agar kode tetap unik.
+    """
+    if factor <= 1:
+        return html
+
+    def scale_table(match: re.Match) -> bytes:
+        table = match.group(0)
+        rows = list(ROW_PATTERN.finditer(table))
+        if len(rows) < 2:
+            return table
+
+        start, end = rows[1].start(), rows[-1].end()
+        data = table[start:end]
+        copies = [data] + [data.replace(b"</code>", b"S%d</code>" % n) for n in range(1, factor)]
+        return table[:start] + b"".join(copies) + table[end:]
+
+    return TABLE_PATTERN.sub(scale_table, html)
+
+
+def count_wiki_rows(content: bytes) -> int:
+    """Padanan count_rows untuk respons wikitext API."""
+    text = json.loads(content)["parse"]["wikitext"]
+    return sum(len(WIKI_ROW_PATTERN.findall(table)) for table in WIKI_TABLE_PATTERN.findall(text))
+
+
+def scale_wikitext(content: bytes, factor: int) -> bytes:
+    """Padanan scale_page untuk respons wikitext API: baris tabel diulang `factor` kali."""
+    if factor <= 1:
+        return content
+
+    def scale_table(match: re.Match) -> str:
+        table = match.group(0)
+        rows = list(WIKI_ROW_PATTERN.finditer(table))
+        if not rows:
+            return table
+
+        start, end = rows[0].start(), rows[-1].end()
+        data = table[start:end]
+        copies = [data] + [data.replace("</code>", f"S{n}</code>") for n in range(1, factor)]
+        return table[:start] + "".join(copies) + table[end:]
+
+    data = json.loads(content)
+    data["parse"]["wikitext"] = WIKI_TABLE_PATTERN.sub(scale_table, data["parse"]["wikitext"])
+    return json.dumps(data, ensure_ascii=False).encode()
+
+
+def image_sources(pages: Iterable[bytes]) -> dict[str, str]:
+    """{nama file: URL CDN} dari gambar hadiah di fixture HTML."""
+    sources = {}
+    for page in pages:
+        for name, src in IMAGE_PATTERN.findall(page):
+            sources.setdefault(html.unescape(name.decode()), html.unescape(src.decode()))
+    return sources
+
+
+def file_info_response(sources: dict[str, str], url: str) -> bytes:
+    """
+    Respons prop=imageinfo (formatversion=2) untuk URL API, dibangun dari
+    image_sources(); pengganti wiki asli saat benchmark mode wikitext.
+    """
+    titles = parse_qs(urlsplit(url).query).get("titles", [""])[0].split("|")
+    pages = []
+    for title in filter(None, titles):
+        src = sources.get(title.removeprefix("File:"))
+        if src:
+            pages.append({"ns": 6, "title": title, "imageinfo": [{"url": src}]})
+        else:
+            pages.append({"ns": 6, "title": title, "missing": True})
+    return json.dumps({"batchcomplete": True, "query": {"pages": pages}}).encode()
@@ -0,0 +1,450 @@
+"""
+Benchmark offline untuk pipeline scraper, tanpa request ke Fandom.
+
+Setiap kasus (genshin, starrail, honkai) dijalankan pada snapshot HTML di
+bench/fixtures dan pada halaman sintetis berisi 10x/100x baris. Tahap yang diukur
+terpisah:
+- parse   : HTML -> BeautifulSoup (make_soup, sesuai --parser/--full-page),
+            atau respons API -> baris tabel wikitext (--ingest wikitext)
+- extract : scrape() pada soup yang sudah diparse (tanpa fetch & tanpa simpan);
+            dengan --row-cache diukur saat cache baris sudah terisi (run kedua dst.)
+- save    : IncrementalStore.save() ke folder kosong
+
+SHA-256 all.json hasil setiap kasus ikut disimpan: output yang berbeda dari
+baseline dihitung regresi, dan --check-output membandingkan output semua mode
+(backend parser, ingest, cache baris) satu sama lain. Selama fixture belum
+direkam dengan --record (fixture HTML disusun ulang, wikitext diturunkan
+darinya), hasil identik hanya membuktikan kedua set fixture konsisten, bukan
+paritas penamaan hadiah dengan halaman Fandom asli.
+
+Contoh:
+    python -m bench.run
+    python -m bench.run --scales 1,10 --repeat 5
+    python -m bench.run --save-baseline
+    python -m bench.run --ingest wikitext
+    python -m bench.run --row-cache
+    python -m bench.run --check-output
+    python -m bench.run --record
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from utils.game_scraper import INGEST_MODES, GameScraper
+from utils.games import GAMES
+from utils.http_cache import Page
+from utils.metrics import Metrics
+from utils.parsers import BACKENDS, available_backends, resolve_backend
+from utils.row_cache import RowCache
+from utils.store import IncrementalStore, file_digest
+
+from .pages import (
+    CASES,
+    count_rows,
+    count_wiki_rows,
+    file_info_response,
+    image_sources,
+    is_recorded,
+    load_fixture,
+    mark_recorded,
+    save_fixture,
+    scale_page,
+    scale_wikitext,
+)
+
+console = Console()
+
+STAGES = ("parse", "extract", "save")
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+
+def measure(func: Callable[[], object], repeat: int) -> tuple[float, float, float, object]:
+    """
+    Jalankan `func` sebanyak `repeat` kali.
+    Return (waktu terbaik, median, puncak memori dalam MiB, hasil terakhir).
+    Puncak memori diukur pada satu putaran terpisah karena tracemalloc memperlambat.
+    """
+    timings = []
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return min(timings), statistics.median(timings), peak / 2**20, result
+
+
+def make_scraper(game: str, parser_backend: str, scoped: bool, ingest: str = "html") -> GameScraper:
+    """Scraper tanpa cache & log, dengan pengaturan parser dari CLI."""
+    scraper = GameScraper(GAMES[game])
+    scraper.cache = None
+    scraper.parser_backend = parser_backend
+    scraper.scoped_parse = scoped
+    scraper.ingest = ingest
+    scraper.row_cache = None
+    scraper.log = lambda *args, **kwargs: None
+    # Span instrumentasi tidak perlu ditampung selama benchmark
+    scraper.metrics = Metrics()
+    return scraper
+
+
+def run_case(
+    name: str,
+    factor: int,
+    repeat: int,
+    parser_backend: str,
+    scoped: bool,
+    ingest: str = "html",
+    row_cache: bool = False,
+) -> dict:
+    """Ukur ketiga tahap untuk satu kasus pada skala tertentu."""
+    scraper = make_scraper(name, parser_backend, scoped, ingest)
+    wikitext = ingest == "wikitext"
+    scale = scale_wikitext if wikitext else scale_page
+
+    pages = {}
+    all_tables = {}
+    for page_spec, fixture in zip(scraper.spec.pages, CASES[name], strict=True):
+        # URL yang diminta scraper untuk halaman ini (HTML atau API)
+        url = scraper.page_sources(page_spec)[0]
+        pages[url] = Page(url, scale(load_fixture(fixture, ingest), factor))
+        all_tables[url] = page_spec.all_tables
+    rows = sum((count_wiki_rows if wikitext else count_rows)(p.content) for p in pages.values())
+    html_bytes = sum(len(page.content) for page in pages.values())
+
+    # 1. Parse
+    def parse():
+        if wikitext:
+            return {
+                url: list(scraper.wiki_rows(page, all_tables[url])) for url, page in pages.items()
+            }
+        return {url: scraper.make_soup(page) for url, page in pages.items()}
+
+    parse_best, parse_median, parse_peak, soups = measure(parse, repeat)
+
+    # 2. Extract: scrape() dengan fetch & parse diganti hasil tahap sebelumnya
+    captured = []
+    scraper.fetch = pages.get
+    if wikitext:
+        # URL gambar (prop=imageinfo) dijawab dari gambar di fixture HTML halaman yang sama
+        images = image_sources(load_fixture(fixture) for fixture in CASES[name])
+        scraper.fetch = lambda url: pages.get(url) or Page(url, file_info_response(images, url))
+    scraper.fetch_pages = lambda items: [pages[item[0]] for item in items]
+    scraper.make_soup = lambda page: soups[page.url] if page else None
+    scraper.wiki_rows = lambda page, all_tables: iter(soups[page.url]) if page else iter(())
+    scraper.is_unchanged = lambda pages: False
+    scraper.save_results = captured.extend
+
+    def extract():
+        captured.clear()
+        scraper.scrape()
+        return list(captured)
+
+    if row_cache:
+        # Cache di memori saja (tidak disimpan), cukup besar untuk semua baris; diisi sekali
+        scraper.row_cache = RowCache(os.path.join(os.getcwd(), "rows.json"), max_rows=rows)
+        extract()
+
+    extract_best, extract_median, extract_peak, codes = measure(extract, repeat)
+
+    # 3. Save: selalu ke folder kosong (semua file ditulis)
+    def save():
+        with tempfile.TemporaryDirectory() as folder:
+            return IncrementalStore(folder).save(codes)
+
+    save_best, save_median, save_peak, _ = measure(save, repeat)
+
+    return {
+        "rows": rows,
+        "codes": len(codes),
+        "html_bytes": html_bytes,
+        "output_sha256": output_digest(codes),
+        "stages": {
+            "parse": {"best": parse_best, "median": parse_median, "peak_mib": parse_peak},
+            "extract": {"best": extract_best, "median": extract_median, "peak_mib": extract_peak},
+            "save": {"best": save_best, "median": save_median, "peak_mib": save_peak},
+        },
+    }
+
+
+def output_digest(codes) -> str | None:
+    """SHA-256 all.json yang ditulis IncrementalStore untuk kode ini."""
+    with tempfile.TemporaryDirectory() as folder:
+        IncrementalStore(folder).save(codes)
+        return file_digest(os.path.join(folder, "all.json"))
+
+
+def check_outputs(cases: list[str], scoped: bool) -> list[str]:
+    """
+    Jalankan setiap kasus (skala 1x) di semua mode yang tersedia dan bandingkan
+    SHA-256 all.json-nya; mode mana pun harus menghasilkan file yang identik.
+    Kasus dengan fixture yang belum direkam (is_recorded) diberi catatan.
+    """
+    modes = [
+        (backend, ingest, row_cache)
+        for ingest in INGEST_MODES
+        for backend in (available_backends() if ingest == "html" else ["html.parser"])
+        for row_cache in (False, True)
+    ]
+    mismatches = []
+    for case in cases:
+        digests = {}
+        for backend, ingest, row_cache in modes:
+            label = f"{ingest}/{backend}" + (" +row-cache" if row_cache else "")
+            console.print(f"[dim]🔎 {case}: {label}...[/dim]")
+            result = run_case(case, 1, 1, backend, scoped, ingest, row_cache)
+            digests[label] = result["output_sha256"]
+
+        reference_label, reference = next(iter(digests.items()))
+        for label, digest in digests.items():
+            if digest != reference:
+                mismatches.append(f"{case}: all.json {label} berbeda dari {reference_label}")
+        if all(digest == reference for digest in digests.values()):
+            console.print(f"[green]✅ {case}: {len(digests)} mode, all.json identik[/green]")
+            if not is_recorded(case):
+                console.print(
+                    f"[dim]   {case}: fixture belum direkam (--record), hanya konsistensi "
+                    f"antar fixture, bukan paritas dengan halaman asli.[/dim]"
+                )
+    return mismatches
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Tandai regresi: waktu terbaik lebih lambat dari baseline melebihi threshold,
+    atau all.json yang berbeda dari baseline.
+    """
+    regressions = []
+    for key, result in results["cases"].items():
+        old_case = baseline.get("cases", {}).get(key)
+        if not old_case:
+            continue
+        old_output = old_case.get("output_sha256")
+        if old_output and old_output != result.get("output_sha256"):
+            regressions.append(f"{key}: all.json berbeda dari baseline")
+        for stage, stats in result["stages"].items():
+            old = old_case["stages"].get(stage)
+            if not old or not old["best"]:
+                continue
+            ratio = stats["best"] / old["best"]
+            stats["vs_baseline"] = ratio
+            if ratio > 1 + threshold:
+                regressions.append(f"{key} {stage}: {ratio:.2f}x lebih lambat dari baseline")
+    return regressions
+
+
+def print_results(results: dict, threshold: float):
+    table = Table(title="Benchmark scraper (offline)")
+    table.add_column("Kasus", style="cyan", no_wrap=True)
+    table.add_column("Tahap")
+    table.add_column("Terbaik (ms)", justify="right")
+    table.add_column("Median (ms)", justify="right")
+    table.add_column("Baris/s", justify="right")
+    table.add_column("Puncak MiB", justify="right")
+    table.add_column("vs baseline", justify="right")
+
+    for key, result in results["cases"].items():
+        for stage in STAGES:
+            stats = result["stages"][stage]
+            ratio = stats.get("vs_baseline")
+            if ratio is None:
+                versus = "-"
+            else:
+                style = "red" if ratio > 1 + threshold else "green" if ratio < 1 else "white"
+                versus = f"[{style}]{ratio:.2f}x[/{style}]"
+            table.add_row(
+                key if stage == STAGES[0] else "",
+                stage,
+                f"{stats['best'] * 1000:.1f}",
+                f"{stats['median'] * 1000:.1f}",
+                f"{result['rows'] / stats['best']:,.0f}" if stats["best"] else "-",
+                f"{stats['peak_mib']:.1f}",
+                versus,
+            )
+        table.add_section()
+
+    console.print(table)
+
+
+def record_fixtures():
+    """Unduh ulang snapshot halaman Fandom & respons API ke bench/fixtures (butuh internet)."""
+    for ingest in INGEST_MODES:
+        count = count_wiki_rows if ingest == "wikitext" else count_rows
+        for game, fixtures in CASES.items():
+            scraper = make_scraper(game, "html.parser", True, ingest)
+            for page_spec, fixture in zip(scraper.spec.pages, fixtures, strict=True):
+                url = scraper.page_sources(page_spec)[0]
+                page = scraper.fetch(url)
+                if page is None:
+                    console.print(f"[red]❌ Gagal mengunduh {url}[/red]")
+                    continue
+                save_fixture(fixture, page.content, ingest)
+                mark_recorded(fixture, ingest)
+                console.print(
+                    f"[green]✅ {fixture} ({ingest})[/green]: {len(page.content):,} bytes, "
+                    f"{count(page.content)} baris"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline Hoyo Code Scraper")
+    parser.add_argument(
+        "--cases",
+        default=",".join(CASES),
+        metavar="LIST",
+        help=f"Kasus dipisah koma (default: {','.join(CASES)}).",
+    )
+    parser.add_argument(
+        "--scales",
+        default="1,10,100",
+        metavar="LIST",
+        help="Pengali jumlah baris halaman sintetis (default: 1,10,100).",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Jumlah pengulangan per tahap (default: 3)."
+    )
+    parser.add_argument("--parser", choices=BACKENDS, default="auto", help="Backend parser HTML.")
+    parser.add_argument(
+        "--full-page", action="store_true", help="Parse seluruh halaman, bukan hanya div konten."
+    )
+    parser.add_argument(
+        "--ingest",
+        choices=INGEST_MODES,
+        default="html",
+        help="Fixture yang diukur: HTML halaman atau wikitext MediaWiki API (default: html).",
+    )
+    parser.add_argument(
+        "--row-cache",
+        action="store_true",
+        help="Ukur tahap extract dengan cache baris yang sudah terisi.",
+    )
+    parser.add_argument(
+        "--check-output",
+        action="store_true",
+        help=(
+            "Bandingkan all.json semua mode (parser, ingest, cache baris) lalu keluar; "
+            "paritas dengan halaman asli hanya berlaku untuk fixture hasil --record."
+        ),
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=DEFAULT_BASELINE,
+        metavar="PATH",
+        help="File baseline untuk deteksi regresi (default: bench/baseline.json).",
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Simpan hasil run ini sebagai baseline."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Batas perlambatan sebelum dianggap regresi (default: 0.2 = 20%%).",
+    )
+    parser.add_argument("--output", type=Path, metavar="PATH", help="Tulis hasil ke file JSON.")
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help="Perbarui fixture dari halaman Fandom asli lalu keluar.",
+    )
+    args = parser.parse_args()
+
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    for case in cases:
+        if case not in CASES:
+            parser.error(f"Kasus tidak dikenal: {case} (pilihan: {', '.join(CASES)})")
+    try:
+        scales = [int(s) for s in args.scales.split(",") if s.strip()]
+        parser_backend = resolve_backend(args.parser)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Scraper membuat folder output di cwd, jadi semuanya dijalankan di folder sementara
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            if args.record:
+                record_fixtures()
+                return
+            if args.check_output:
+                mismatches = check_outputs(cases, not args.full_page)
+                for line in mismatches:
+                    console.print(f"[bold red]❌ {line}[/bold red]")
+                sys.exit(1 if mismatches else 0)
+
+            results = {
+                "python": platform.python_version(),
+                "parser": parser_backend,
+                "scoped": not args.full_page,
+                "ingest": args.ingest,
+                "row_cache": args.row_cache,
+                "cases": {},
+            }
+            for case in cases:
+                for factor in scales:
+                    key = f"{case}@{factor}x"
+                    console.print(f"[dim]⏱️ {key}...[/dim]")
+                    results["cases"][key] = run_case(
+                        case,
+                        factor,
+                        args.repeat,
+                        parser_backend,
+                        not args.full_page,
+                        args.ingest,
+                        args.row_cache,
+                    )
+        finally:
+            os.chdir(cwd)
+
+    regressions = []
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if (
+            baseline.get("parser") != parser_backend
+            or baseline.get("scoped") != results["scoped"]
+            or baseline.get("ingest", "html") != args.ingest
+            or baseline.get("row_cache", False) != args.row_cache
+        ):
+            console.print("[yellow]⚠️ Baseline memakai pengaturan parser berbeda.[/yellow]")
+        regressions = compare(results, baseline, args.threshold)
+
+    print_results(results, args.threshold)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=4), encoding="utf-8")
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=4), encoding="utf-8")
+        console.print(f"[green]✅ Baseline disimpan ke {args.baseline}[/green]")
+
+    if regressions:
+        for line in regressions:
+            console.print(f"[bold red]📉 {line}[/bold red]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
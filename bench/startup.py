@@ -0,0 +1,102 @@
+"""
+Anggaran waktu start-up CLI berdasarkan `python -X importtime`.
+
+Setiap kasus di-import di interpreter baru. Waktu import dihitung sebagai
+selisih total dengan interpreter kosong (`-c pass`), jadi site-packages &
+modul bawaan interpreter tidak ikut terhitung. Kasus gagal jika melebihi
+anggaran atau jika memuat modul berat yang seharusnya lazy (bs4, requests, rich).
+
+Contoh:
+    python -m bench.startup
+    python -m bench.startup --budget 80 --top 15
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Kasus: kode yang dijalankan; setara dengan import yang dilakukan perintah tersebut
+CASES = {
+    "cli": "import main",
+    "check": "import main, utils.check",
+    "query": "import main, utils.db",
+}
+# Modul yang hanya boleh dimuat oleh perintah scraping
+HEAVY = ("bs4", "lxml", "selectolax", "requests", "urllib3", "rich")
+# Anggaran default (ms) di atas interpreter kosong
+DEFAULT_BUDGET = 100.0
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def import_times(code: str) -> dict[str, tuple[int, int]]:
+    """{modul: (self us, cumulative us)} dari satu interpreter baru."""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for match in LINE.finditer(result.stderr):
+        times[match[4]] = (int(match[1]), int(match[2]))
+    return times
+
+
+def measure(code: str, repeat: int) -> tuple[float, dict[str, tuple[int, int]]]:
+    """Median waktu import (ms) di atas interpreter kosong, plus rincian run terakhir."""
+    totals = []
+    times = {}
+    for _ in range(repeat):
+        base = sum(s for s, _ in import_times("pass").values())
+        times = import_times(code)
+        totals.append((sum(s for s, _ in times.values()) - base) / 1000)
+    totals.sort()
+    return totals[len(totals) // 2], times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cek anggaran start-up CLI (-X importtime)")
+    parser.add_argument("--cases", default=",".join(CASES), help="Kasus dipisah koma.")
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=DEFAULT_BUDGET,
+        help=f"Batas waktu import per kasus dalam ms (default: {DEFAULT_BUDGET:.0f}).",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Jumlah pengulangan (median).")
+    parser.add_argument("--top", type=int, default=0, help="Tampilkan N modul paling lambat.")
+    args = parser.parse_args()
+
+    failed = False
+    for name in filter(None, args.cases.split(",")):
+        if name not in CASES:
+            parser.error(f"Kasus tidak dikenal: {name} (pilihan: {', '.join(CASES)})")
+
+        total, times = measure(CASES[name], args.repeat)
+        heavy = sorted(m for m in times if m.split(".")[0] in HEAVY and "." not in m)
+        ok = total <= args.budget and not heavy
+        failed |= not ok
+        label = "OK  " if ok else "FAIL"
+        print(f"{label} {name:<6} {total:7.1f} ms (anggaran {args.budget:.0f} ms)")
+        if heavy:
+            print(f"     modul berat ter-import: {', '.join(heavy)}")
+
+        if args.top:
+            slowest = sorted(times.items(), key=lambda kv: kv[1][0], reverse=True)
+            for module, (self_us, cumulative_us) in slowest[: args.top]:
+                print(f"     {self_us / 1000:6.1f} ms  {cumulative_us / 1000:6.1f} ms  {module}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
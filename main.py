@@ -1,71 +1,427 @@
 # main.py
 import argparse
+import json
 import os
-import shutil
+import signal
+import threading
 
-from rich.console import Console
-from rich.panel import Panel
+# Hanya modul ringan yang di-import di sini; requests, bs4, rich, dan http.server
+# di-import di dalam perintah yang membutuhkannya agar start-up tetap cepat
+from utils.console import console, panel, table
+from utils.http_cache import response_cache
+from utils.metrics import metrics
+from utils.parsers import BACKENDS, resolve_backend
+from utils.registry import parse_shard, select
+from utils.row_cache import MAX_ROWS, row_cache
+from utils.runner import MODES
+from utils.serialization import DEFAULT_FORMATS, available_formats
+from utils.serialization import resolve_backend as resolve_json_backend
 
-# Import scrapers
-from utils.genshin_scraper import GenshinScraper
-from utils.starrail_scraper import StarrailScraper
 
-# Inisialisasi Console Rich
-console = Console()
-
-
-def reset_folders():
-    """Menghapus dan membuat ulang folder data game."""
-    console.print("[bold yellow]🔄 Mereset folder data...[/bold yellow]")
-    for folder in ["genshin", "honkai", "starrail"]:
-        if os.path.exists(folder):
-            shutil.rmtree(folder)
-        os.makedirs(folder, exist_ok=True)
-    console.print("[bold green]✅ Folder berhasil di-reset.[/bold green]")
+def reset_caches():
+    """
+    Persiapan --reset: cache HTTP & cache baris dikosongkan agar semua halaman
+    diunduh, diekstrak, dan ditulis ulang. Folder data tidak dihapus di sini;
+    isinya diganti (IncrementalStore reset) setelah data baru siap.
+    """
+    console.print("[bold yellow]🔄 Mereset data...[/bold yellow]")
+    response_cache.clear()
+    row_cache.clear()
+    console.print(
+        "[bold green]✅ Cache dikosongkan, folder data diganti setelah data baru siap.[/bold green]"
+    )
 
 
-def main(should_reset=False):
-    """Fungsi utama untuk menjalankan semua scraper secara berurutan."""
+def main(
+    entries=None,
+    shard=None,
+    should_reset=False,
+    mode="linear",
+    max_per_host=2,
+    use_cache=True,
+    retries=3,
+    backoff=1.0,
+    host_pool_sizes=None,
+    rate=1.0,
+    burst=4,
+    parser_backend="auto",
+    scoped_parse=True,
+    stream=False,
+    db_path=None,
+    formats=DEFAULT_FORMATS,
+    json_backend="auto",
+    metrics_jsonl=None,
+    metrics_prom=None,
+    show_timings=False,
+    notify=True,
+    watch=False,
+    watch_scale=1.0,
+    serve_address=None,
+    parse_workers=0,
+    ingest="html",
+    row_cache_size=MAX_ROWS,
+):
+    """Fungsi utama untuk menjalankan scraper terpilih (linear, paralel, atau watch)."""
+    from utils.db import CodeDB
+    from utils.notify import DiscordNotifier
+    from utils.procpool import make_pool
+    from utils.rate_limit import HostRateLimiter
+    from utils.runner import run
+    from utils.session import configure_session
+    from utils.sources import source_stats
+    from utils.store import IncrementalStore
+    from utils.watch import Watcher
 
     # Header Tampilan
+    label = "Watch (Daemon)" if watch else f"{mode.title()} Execution"
+    if shard:
+        label += f" | Shard {shard[0]}/{shard[1]}"
     console.print(
-        Panel.fit(
+        panel(
             "🚀 [bold white]Hoyo Code Scraper[/bold white]",
+            fit=True,
             style="bold cyan",
-            subtitle="[dim]Mode: Linear Execution | Requests (No Headers)[/dim]",
+            subtitle=f"[dim]Mode: {label} | Requests (Pooled Session)[/dim]",
         )
     )
 
+    # Daftar scraper yang akan dijalankan (registry: utils.games + entry point plugin)
+    entries = select() if entries is None else entries
+    scrapers = [entry.create() for entry in entries]
+    if not scrapers:
+        console.print("[bold yellow]⚠️ Tidak ada game untuk shard ini.[/bold yellow]")
+        return
+
     if should_reset:
-        reset_folders()
+        reset_caches()
         console.print("")  # Spasi
 
-    # Daftar scraper yang akan dijalankan
-    scrapers = [
-        GenshinScraper(),
-        StarrailScraper(),
-        # HonkaiScraper() # disable due to inconsistent site structure
-    ]
+    # Session bersama: pool per host mengikuti batas request paralel
+    session = configure_session(
+        retries=retries,
+        backoff=backoff,
+        pool_maxsize=max_per_host,
+        host_pool_sizes=host_pool_sizes,
+    )
 
-    # Eksekusi Linear (Satu per satu)
+    # Satu rate limiter per host untuk semua scraper
+    rate_limiter = HostRateLimiter(rate=rate, burst=burst)
+    backend = resolve_backend(parser_backend)
+    db = CodeDB(db_path) if db_path else None
+    # Parsing & ekstraksi di process pool agar tidak tertahan GIL (0 = di thread scraper)
+    parse_pool = make_pool(parse_workers, backend) if parse_workers else None
+    webhook_url = os.getenv("DISCORD_WEBHOOK_URL")
+    notifier = DiscordNotifier(webhook_url) if notify and webhook_url else None
+    row_cache.max_rows = row_cache_size
     for scraper in scrapers:
-        # Tampilkan header untuk setiap game
+        # Scraper dibuat sebelum configure_session dan masih memegang session lama
+        scraper.session = session
+        scraper.db = db
+        scraper.notifier = notifier
+        # Output dipasang (fsync & swap) di background sambil game berikutnya berjalan
+        scraper.store = IncrementalStore(
+            scraper.game_folder, formats, json_backend, reset=should_reset, background=True
+        )
+        scraper.rate_limiter = rate_limiter
+        scraper.parser_backend = backend
+        scraper.scoped_parse = scoped_parse
+        scraper.stream = stream
+        scraper.parse_pool = parse_pool
+        scraper.ingest = ingest
+        if not use_cache:
+            scraper.cache = None
+        if not use_cache or not row_cache_size:
+            scraper.row_cache = None
+
+    if watch:
+        # API lokal opsional di proses yang sama, dimuat ulang setiap selesai siklus
+        index = None
+        if serve_address:
+            index = start_server(*serve_address, entries)
+
+        def on_cycle():
+            for scraper in scrapers:
+                scraper.wait_saved()
+            source_stats.save()
+            row_cache.save()
+            report_metrics(metrics_jsonl, metrics_prom, show_timings)
+            if index:
+                index.reload()
+
+        # Daemon: setiap URL dicek sesuai jadwalnya, metrics dilaporkan per siklus
+        watcher = Watcher(scrapers, scale=watch_scale, max_per_host=max_per_host, on_cycle=on_cycle)
+        signal.signal(signal.SIGTERM, lambda *_: watcher.stop())
         console.print(
-            Panel(
-                f"▶️ Memulai Scraper: [bold]{scraper.game_name}[/bold]",
-                border_style=scraper.game_color,
+            panel(
+                "👀 Mode watch aktif, tekan [bold]Ctrl+C[/bold] untuk berhenti.",
                 expand=False,
             )
         )
+        try:
+            watcher.run()
+        except KeyboardInterrupt:
+            console.print("\n[bold yellow]⛔ Mode watch dihentikan.[/bold yellow]")
+        for scraper in scrapers:
+            scraper.wait_saved()
+        if notifier:
+            notifier.close()
+        if parse_pool:
+            parse_pool.shutdown()
+        return
+
+    if mode == "linear":
+        # Eksekusi Linear (Satu per satu)
+        for scraper in scrapers:
+            # Tampilkan header untuk setiap game
+            console.print(
+                panel(
+                    f"▶️ Memulai Scraper: [bold]{scraper.game_name}[/bold]",
+                    border_style=scraper.game_color,
+                    expand=False,
+                )
+            )
 
-        # Jalankan proses scraping
-        # Method scrape() di base class sudah menghandle logging internal
-        scraper.scrape()
+            # Jalankan proses scraping
+            # Method scrape() di base class sudah menghandle logging internal
+            scraper.scrape()
 
-        console.print("")  # Spasi antar game agar tidak dempet
+            console.print("")  # Spasi antar game agar tidak dempet
+    else:
+        # Eksekusi Paralel: semua game & halaman diambil bersamaan
+        names = ", ".join(f"[{s.game_color}]{s.game_name}[/{s.game_color}]" for s in scrapers)
+        console.print(panel(f"▶️ Memulai Scraper: {names}", expand=False))
+        run(scrapers, mode=mode, max_per_host=max_per_host)
+        console.print("")
+
+    # Semua output harus sudah terpasang sebelum run dianggap selesai
+    for scraper in scrapers:
+        scraper.wait_saved()
+
+    # Latensi per sumber dipakai run berikutnya untuk memilih mirror,
+    # cache baris agar baris riwayat yang sama tidak diekstrak ulang
+    source_stats.save()
+    row_cache.save()
+
+    # Tunggu sisa antrean notifikasi Discord terkirim
+    if notifier:
+        notifier.close()
+    if parse_pool:
+        parse_pool.shutdown()
+
+    report_metrics(metrics_jsonl, metrics_prom, show_timings)
 
     # Penutup
-    console.print(Panel("✨ [bold green]Semua tugas scraping selesai![/bold green]", style="green"))
+    console.print(panel("✨ [bold green]Semua tugas scraping selesai![/bold green]", style="green"))
+
+
+def report_metrics(metrics_jsonl=None, metrics_prom=None, show_timings=False):
+    """Tampilkan/ekspor span per tahap, lalu kosongkan untuk run (siklus) berikutnya."""
+    if show_timings:
+        print_timings()
+    if metrics_jsonl:
+        metrics.write_jsonl(metrics_jsonl)
+    if metrics_prom:
+        metrics.write_prometheus(metrics_prom)
+    metrics.clear()
+    row_cache.reset_stats()
+
+
+def print_timings():
+    """Tabel total waktu, bytes, baris, dan kode per game & tahap."""
+    rows = [
+        (
+            game,
+            stage,
+            total["spans"],
+            f"{total['seconds']:.3f}",
+            f"{total['bytes']:,}",
+            f"{total['rows']:,}",
+            f"{total['codes']:,}",
+        )
+        for (game, stage), total in metrics.summary().items()
+    ]
+    columns = ("Game", "Tahap", "Span", "Detik", "Bytes", "Baris", "Kode")
+    console.print(table("Waktu per tahap", columns, rows, left=("Game", "Tahap")))
+
+    hits, misses = row_cache.stats()
+    if hits or misses:
+        console.print(f"♻️ Cache baris: {hits:,} baris dipakai ulang, {misses:,} diekstrak.")
+
+    # Rata-rata latensi (EWMA) semua sumber yang diminta pada run ini, termasuk mirror
+    from utils.sources import source_stats
+
+    urls = dict.fromkeys(s.url for s in metrics.spans() if s.stage == "fetch" and s.url)
+    if urls:
+        columns = ("Sumber", "Latensi (ms)", "Sukses", "Gagal")
+        rows = source_stats.rows(urls)
+        console.print(table("Latensi per sumber", columns, rows, left=("Sumber",)))
+
+
+def start_server(host, port, entries):
+    """Jalankan API lokal di thread background, return indeksnya."""
+    from utils.api import CodeIndex, make_server
+
+    index = CodeIndex({entry.key: entry.folder() for entry in entries})
+    server = make_server(index, host, port)
+    threading.Thread(target=server.serve_forever, name="api", daemon=True).start()
+    console.print(f"[bold cyan]🌐 API berjalan di http://{host}:{port}/[/bold cyan]")
+    return index
+
+
+def serve_codes(entries, host="127.0.0.1", port=8000, reload_interval=2.0):
+    """Subcommand `serve`: API HTTP dari output yang sudah ada, dengan hot reload."""
+    from utils.api import CodeIndex, make_server, watch_files
+
+    index = CodeIndex({entry.key: entry.folder() for entry in entries})
+    server = make_server(index, host, port)
+    stop = threading.Event()
+
+    def on_reload(games):
+        console.print(f"[cyan]♻️ Data dimuat ulang: {', '.join(games)}[/cyan]")
+
+    threading.Thread(
+        target=watch_files,
+        args=(index, reload_interval, stop, on_reload),
+        name="reload",
+        daemon=True,
+    ).start()
+
+    total = sum(len(s.codes) for s in index.state.games.values())
+    console.print(
+        panel(
+            f"🌐 API berjalan di [bold]http://{host}:{port}/[/bold] ({total} kode dimuat)\n"
+            "[dim]/games, /<game>/<all|active|expired>, /codes/<kode>, "
+            "/codes?game=&status=&reward=[/dim]",
+            expand=False,
+        )
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("\n[bold yellow]⛔ Server dihentikan.[/bold yellow]")
+    finally:
+        stop.set()
+        server.server_close()
+
+
+def merge_shards(sources, entries):
+    """Subcommand `merge`: gabungkan output game dari direktori hasil beberapa shard."""
+    from utils.merge import merge_outputs
+
+    missing = [src for src in sources if not os.path.isdir(src)]
+    if missing:
+        console.print(f"[bold red]❌ Direktori tidak ditemukan: {', '.join(missing)}[/bold red]")
+        return 1
+    try:
+        results = merge_outputs(sources, entries)
+    except ValueError as e:
+        console.print(f"[bold red]❌ {e}[/bold red]")
+        return 1
+
+    for result in results:
+        if result.source:
+            console.print(f"[green]✅ {result.game:<9}[/green] {result.folder} <- {result.source}")
+        else:
+            console.print(f"[yellow]⚠️ {result.game:<9}[/yellow] tidak ada di shard mana pun")
+    merged = sum(result.source is not None for result in results)
+    console.print(f"[bold green]🧩 {merged}/{len(results)} game digabungkan.[/bold green]")
+    return 0
+
+
+def positive_float(value):
+    """Argumen angka desimal > 0 (mis. --rate)."""
+    try:
+        number = float(value)
+    except ValueError:
+        number = 0.0
+    if not number > 0 or number == float("inf"):
+        raise argparse.ArgumentTypeError(f"Harus angka lebih dari 0: {value}")
+    return number
+
+
+def positive_int(value):
+    """Argumen bilangan bulat > 0 (mis. --burst)."""
+    if not value.isdigit() or int(value) < 1:
+        raise argparse.ArgumentTypeError(f"Harus bilangan bulat lebih dari 0: {value}")
+    return int(value)
+
+
+def parse_address(value):
+    """`PORT` atau `HOST:PORT` -> (host, port)."""
+    host, _, port = value.rpartition(":")
+    if not port.isdigit():
+        raise argparse.ArgumentTypeError(f"Alamat tidak valid: {value} (contoh: 8000)")
+    return host or "127.0.0.1", int(port)
+
+
+def query_codes(db_path, as_json=False, **filters):
+    """Subcommand `query`: cari kode di database SQLite."""
+    if not os.path.exists(db_path):
+        console.print(f"[bold red]❌ Database tidak ditemukan: {db_path}[/bold red]")
+        return
+
+    from utils.db import CodeDB
+
+    results = CodeDB(db_path).query(**filters)
+
+    if as_json:
+        for game, code in results:
+            print(json.dumps({"game": game, **code.to_dict()}, ensure_ascii=False))
+        return
+
+    rows = [
+        (
+            game,
+            code.code,
+            code.status,
+            code.server,
+            code.duration.discovered or "-",
+            ", ".join(r.name for r in code.rewards) or "-",
+        )
+        for game, code in results
+    ]
+    columns = ("Game", "Code", "Status", "Server", "Discovered", "Rewards")
+    console.print(table(f"Hasil: {len(results)} kode", columns, rows))
+
+
+def check_pages(entries, ingest="html"):
+    """
+    Subcommand `check`: conditional request ringan ke semua halaman tanpa parsing.
+    Exit code 0 jika tidak ada yang berubah, 1 jika ada halaman yang berubah/gagal
+    dicek atau output game hilang (mis. `python main.py check || python main.py`).
+    Game yang run terakhirnya tidak menemukan kode ("empty") tidak dihitung.
+    """
+    from utils.check import check_games
+
+    # Scraper kustom (tanpa GameSpec) tidak punya daftar halaman, selalu dianggap berubah
+    custom = [entry.key for entry in entries if entry.spec is None]
+    games = {entry.key: entry.spec for entry in entries if entry.spec is not None}
+    results = check_games(games, response_cache, ingest=ingest)
+    styles = {
+        "unchanged": "dim green",
+        "empty": "dim yellow",
+        "changed": "bold yellow",
+        "missing": "bold yellow",
+    }
+    for result in results:
+        style = styles.get(result.state, "bold red")
+        console.print(
+            f"[{style}]{result.state:<9}[/{style}] {result.game:<9} "
+            f"{result.detail} [dim]{result.url}[/dim]"
+        )
+
+    for key in custom:
+        console.print(f"[bold yellow]{'custom':<9}[/bold yellow] {key:<9} tanpa GameSpec")
+
+    changed = sum(result.state in ("changed", "error") for result in results) + len(custom)
+    missing = sum(result.state == "missing" for result in results)
+    if changed:
+        console.print(f"[bold yellow]🔔 {changed} halaman perlu di-scrape.[/bold yellow]")
+    if missing:
+        console.print(f"[bold yellow]📭 {missing} game belum punya output.[/bold yellow]")
+    if not changed and not missing:
+        console.print("[bold green]✅ Tidak ada perubahan.[/bold green]")
+    return 1 if changed or missing else 0
 
 
 if __name__ == "__main__":
@@ -74,11 +430,306 @@ if __name__ == "__main__":
         "-r",
         "--reset",
         action="store_true",
-        help="Hapus dan reset folder data sebelum scraping.",
+        help="Tulis ulang semua data dari nol; folder lama diganti setelah data baru siap.",
+    )
+    parser.add_argument(
+        "-g",
+        "--game",
+        dest="games",
+        metavar="LIST",
+        help=(
+            "Hanya game tertentu, dipisah koma (mis. genshin,starrail,zzz; "
+            "default: game terverifikasi, honkai & zzz opt-in)."
+        ),
+    )
+    parser.add_argument(
+        "--shard",
+        metavar="I/N",
+        help="Jalankan bagian ke-I dari N shard (mis. 1/3 untuk matrix CI), lihat `merge`.",
+    )
+    parser.add_argument(
+        "-m",
+        "--mode",
+        choices=MODES,
+        default="linear",
+        help="Mode eksekusi: linear (berurutan), thread, atau async (paralel).",
+    )
+    parser.add_argument(
+        "--max-per-host",
+        type=int,
+        default=2,
+        help="Batas request bersamaan per host pada mode paralel (default: 2).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Abaikan cache ETag/Last-Modified & cache baris; unduh dan ekstrak ulang semua.",
+    )
+    parser.add_argument(
+        "--row-cache-size",
+        type=int,
+        default=MAX_ROWS,
+        metavar="N",
+        help=f"Jumlah baris tabel di cache ekstraksi (default: {MAX_ROWS:,}, 0 = nonaktif).",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="Jumlah retry untuk error koneksi/5xx (default: 3).",
+    )
+    parser.add_argument(
+        "--backoff",
+        type=float,
+        default=1.0,
+        help="Faktor backoff eksponensial antar retry dalam detik (default: 1.0).",
+    )
+    parser.add_argument(
+        "--pool-size",
+        action="append",
+        default=[],
+        metavar="HOST=N",
+        help="Ukuran pool koneksi untuk host tertentu, boleh diulang.",
+    )
+    parser.add_argument(
+        "--rate",
+        type=positive_float,
+        default=1.0,
+        help="Kuota request per detik untuk setiap host (default: 1.0).",
+    )
+    parser.add_argument(
+        "--burst",
+        type=positive_int,
+        default=4,
+        help="Jumlah request beruntun yang boleh dikirim tanpa jeda per host (default: 4).",
+    )
+    parser.add_argument(
+        "--parser",
+        choices=BACKENDS,
+        default="auto",
+        help="Backend parser HTML (default: auto, yang tercepat dari yang terpasang).",
+    )
+    parser.add_argument(
+        "--full-page",
+        action="store_true",
+        help="Parse seluruh halaman, bukan hanya div konten (lebih lambat).",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse & tulis baris demi baris saat body diunduh (memori datar, butuh lxml).",
+    )
+    parser.add_argument(
+        "--ingest",
+        choices=("html", "wikitext"),
+        default="html",
+        help="Sumber tabel: html (halaman Fandom + mirror) atau wikitext (MediaWiki API).",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Parse & ekstraksi di N proses terpisah (0 = nonaktif, -1 = jumlah core).",
+    )
+    parser.add_argument(
+        "--db",
+        metavar="PATH",
+        help="Simpan kode ke database SQLite; file JSON/TXT diekspor dari database.",
+    )
+    parser.add_argument(
+        "--formats",
+        default="",
+        metavar="LIST",
+        help="Format tambahan dipisah koma: min, ndjson, gz, zst (json & txt selalu ditulis).",
+    )
+    parser.add_argument(
+        "--json-backend",
+        choices=("auto", "orjson", "msgspec", "json"),
+        default="auto",
+        help="Encoder JSON untuk format ringkas (default: auto).",
+    )
+
+    parser.add_argument(
+        "--no-notify",
+        action="store_true",
+        help="Jangan umumkan kode aktif baru ke DISCORD_WEBHOOK_URL.",
+    )
+    parser.add_argument(
+        "--plain",
+        action="store_true",
+        help="Log teks biasa tanpa warna/rich (otomatis jika rich tidak terpasang).",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Tampilkan waktu, bytes, baris, dan kode per tahap setelah selesai.",
+    )
+    parser.add_argument(
+        "--metrics-jsonl",
+        metavar="PATH",
+        help="Tambahkan span per tahap (per game & URL) ke file JSON lines.",
+    )
+    parser.add_argument(
+        "--metrics-prom",
+        metavar="PATH",
+        help="Tulis total per tahap dalam format textfile Prometheus.",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", title="subcommand")
+    query_parser = subparsers.add_parser("query", help="Cari kode di database SQLite.")
+    query_parser.add_argument("--db", help="Path database (default: codes.db).")
+    query_parser.add_argument("--game", help="Filter game (mis. genshin).")
+    query_parser.add_argument("--status", choices=("active", "expired"), help="Filter status.")
+    query_parser.add_argument("--code", help="Cari kode tertentu.")
+    query_parser.add_argument("--reward", help="Filter nama reward (mis. Primogem).")
+    query_parser.add_argument("--since", metavar="YYYY-MM-DD", help="Ditemukan sejak tanggal.")
+    query_parser.add_argument("--limit", type=int, help="Batas jumlah hasil.")
+    query_parser.add_argument("--json", action="store_true", help="Output JSON lines.")
+    watch_parser = subparsers.add_parser(
+        "watch",
+        help="Mode daemon: cek setiap halaman sesuai interval adaptifnya (selalu paralel).",
+    )
+    watch_parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Pengali interval polling semua halaman (mis. 0.5 = dua kali lebih sering).",
+    )
+    watch_parser.add_argument(
+        "--serve",
+        type=parse_address,
+        metavar="[HOST:]PORT",
+        help="Sekaligus jalankan API lokal yang dimuat ulang setiap ada data baru.",
+    )
+    serve_parser = subparsers.add_parser(
+        "serve", help="API HTTP lokal dari output yang sudah ada (tanpa scraping)."
+    )
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Alamat (default: 127.0.0.1).")
+    serve_parser.add_argument("--port", type=int, default=8000, help="Port (default: 8000).")
+    serve_parser.add_argument(
+        "--reload-interval",
+        type=float,
+        default=2.0,
+        help="Interval cek perubahan all.json dalam detik (default: 2).",
+    )
+    subparsers.add_parser(
+        "check",
+        help="Cek perubahan halaman tanpa parsing; exit 1 jika perlu scraping.",
+    )
+    merge_parser = subparsers.add_parser(
+        "merge", help="Gabungkan output game dari direktori hasil beberapa --shard."
+    )
+    merge_parser.add_argument(
+        "sources", nargs="+", metavar="DIR", help="Direktori output shard (mis. artefak CI)."
     )
     args = parser.parse_args()
+    if args.plain:
+        console.use_plain()
+
+    if args.command == "query":
+        query_codes(
+            args.db or "codes.db",
+            as_json=args.json,
+            game=args.game,
+            status=args.status,
+            code=args.code,
+            reward=args.reward,
+            since=args.since,
+            limit=args.limit,
+        )
+        raise SystemExit(0)
+
+    # Scraper terpilih dari registry (--game lalu --shard), juga untuk check/serve/merge
+    try:
+        shard = parse_shard(args.shard) if args.shard else None
+        games = [g.strip() for g in args.games.split(",") if g.strip()] if args.games else None
+        entries = select(games, shard)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.command == "check":
+        raise SystemExit(check_pages(entries, args.ingest))
 
+    if args.command == "serve":
+        serve_codes(entries, args.host, args.port, args.reload_interval)
+        raise SystemExit(0)
+
+    if args.command == "merge":
+        raise SystemExit(merge_shards(args.sources, entries))
+
+    if args.command == "watch" and args.scale <= 0:
+        parser.error("--scale harus lebih besar dari 0.")
+    if args.command == "watch":
+        custom = [entry.key for entry in entries if entry.spec is None]
+        if custom:
+            parser.error(f"Mode watch hanya untuk game dengan GameSpec: {', '.join(custom)}")
     try:
-        main(should_reset=args.reset)
+        resolve_backend(args.parser)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.ingest == "wikitext" and args.stream:
+        parser.error("--ingest wikitext tidak bisa digabung dengan --stream.")
+    if args.parse_workers and args.stream:
+        parser.error("--parse-workers tidak bisa digabung dengan --stream.")
+    if args.parse_workers < -1:
+        parser.error("--parse-workers harus >= -1.")
+    if args.row_cache_size < 0:
+        parser.error("--row-cache-size harus >= 0.")
+    if args.stream:
+        from utils.streaming import streaming_available
+
+        if not streaming_available():
+            parser.error("Mode --stream membutuhkan lxml (pip install lxml).")
+    try:
+        resolve_json_backend(args.json_backend)
+    except ValueError as e:
+        parser.error(str(e))
+
+    formats = list(DEFAULT_FORMATS)
+    for name in filter(None, (f.strip() for f in args.formats.split(","))):
+        if name not in available_formats():
+            choices = ", ".join(available_formats())
+            parser.error(f"Format tidak dikenal/tersedia: {name} (pilihan: {choices})")
+        if name not in formats:
+            formats.append(name)
+
+    host_pool_sizes = {}
+    for item in args.pool_size:
+        host, _, size = item.partition("=")
+        if not size.isdigit():
+            parser.error(f"Format --pool-size tidak valid: {item} (contoh: example.com=4)")
+        host_pool_sizes[host] = int(size)
+
+    try:
+        main(
+            entries=entries,
+            shard=shard,
+            should_reset=args.reset,
+            mode=args.mode,
+            max_per_host=args.max_per_host,
+            use_cache=not args.no_cache,
+            retries=args.retries,
+            backoff=args.backoff,
+            host_pool_sizes=host_pool_sizes,
+            rate=args.rate,
+            burst=args.burst,
+            parser_backend=args.parser,
+            scoped_parse=not args.full_page,
+            stream=args.stream,
+            db_path=args.db,
+            formats=formats,
+            json_backend=args.json_backend,
+            metrics_jsonl=args.metrics_jsonl,
+            metrics_prom=args.metrics_prom,
+            show_timings=args.timings,
+            notify=not args.no_notify,
+            watch=args.command == "watch",
+            watch_scale=getattr(args, "scale", 1.0),
+            serve_address=getattr(args, "serve", None),
+            parse_workers=args.parse_workers,
+            ingest=args.ingest,
+            row_cache_size=args.row_cache_size,
+        )
     except KeyboardInterrupt:
         console.print("\n[bold red]⛔ Proses dihentikan paksa oleh pengguna.[/bold red]")
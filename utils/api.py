@@ -0,0 +1,290 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from .models import Code
+from .serialization import CodeEncoder
+from .store import OUTPUT_KEYS, read_manifest
+
+# Body lebih kecil dari ini tidak dikompres (gzip malah menambah ukuran)
+MIN_GZIP_SIZE = 512
+# Jumlah respons query (?reward=..., /codes/{code}) yang disimpan
+QUERY_CACHE_SIZE = 1024
+# Filter yang diterima pada query string
+FILTERS = ("game", "status", "reward")
+
+
+@dataclass(frozen=True, slots=True)
+class Response:
+    """Respons JSON siap kirim: body, versi gzip, dan ETag-nya."""
+
+    body: bytes
+    gzipped: bytes | None
+    etag: str
+    status: int = 200
+
+    @classmethod
+    def build(cls, body: bytes, status: int = 200) -> "Response":
+        gzipped = gzip.compress(body, mtime=0) if len(body) >= MIN_GZIP_SIZE else None
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        return cls(body, gzipped, etag, status)
+
+
+def _with_game(game: str, fragment: bytes) -> bytes:
+    """Sisipkan field "game" di awal objek JSON satu kode."""
+    return b'{"game":' + json.dumps(game).encode() + b"," + fragment[1:]
+
+
+def _array(fragments) -> bytes:
+    return b"[" + b",".join(fragments) + b"]"
+
+
+@dataclass
+class _Snapshot:
+    """Data satu game di memori: kode beserta fragmen JSON ringkasnya."""
+
+    codes: list[Code]
+    fragments: list[bytes]
+    stamp: str | tuple[int, int, int] | None
+    loaded_at: str = field(default_factory=lambda: datetime.now(UTC).isoformat())
+
+
+@dataclass
+class _State:
+    """Indeks yang dipakai request; diganti utuh saat reload (tanpa lock saat baca)."""
+
+    games: dict[str, _Snapshot]
+    # Rute tetap, dihitung sekali per reload
+    routes: dict[str, Response]
+    # kode -> [(game, indeks)], nama reward (lowercase) -> [(game, indeks)]
+    by_code: dict[str, list[tuple[str, int]]]
+    by_reward: dict[str, list[tuple[str, int]]]
+
+
+class CodeIndex:
+    """
+    Indeks kode hasil scraping di memori, per game, status, kode, dan nama reward.
+    Data dibaca dari <folder>/all.json setiap game; reload() hanya memuat ulang
+    game yang file-nya berubah, lalu semua rute tetap dihitung ulang sekali
+    (JSON, gzip, ETag) sehingga request tidak pernah membaca file.
+    """
+
+    def __init__(self, folders: dict[str, str], backend: str = "auto"):
+        self.folders = folders
+        self.encoder = CodeEncoder(backend)
+        self._lock = threading.Lock()
+        self._queries: OrderedDict[str, Response | None] = OrderedDict()
+        self.state = _State({}, {}, {}, {})
+        self.reload()
+
+    def _stamp(self, game: str) -> str | tuple[int, int, int] | None:
+        """Penanda versi all.json: SHA-256 dari manifest, atau stat jika belum ada manifest."""
+        manifest = read_manifest(self.folders[game])
+        entry = ((manifest or {}).get("files") or {}).get("all.json")
+        if isinstance(entry, dict) and entry.get("sha256"):
+            return entry["sha256"]
+        try:
+            st = os.stat(os.path.join(self.folders[game], "all.json"))
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def _load(self, game: str, stamp) -> _Snapshot:
+        try:
+            with open(os.path.join(self.folders[game], "all.json"), "rb") as f:
+                items = self.encoder.loads(f.read())
+        except (OSError, ValueError):
+            items = []
+        codes = [Code.from_dict(item) for item in items]
+        return _Snapshot(codes, [self.encoder.compact(code) for code in codes], stamp)
+
+    def reload(self) -> list[str]:
+        """Muat ulang game yang all.json-nya berubah. Return daftar game yang dimuat ulang."""
+        with self._lock:
+            games = dict(self.state.games)
+            changed = []
+            for game in self.folders:
+                stamp = self._stamp(game)
+                current = games.get(game)
+                if current is None or current.stamp != stamp:
+                    games[game] = self._load(game, stamp)
+                    changed.append(game)
+
+            if changed:
+                self.state = self._build(games)
+                self._queries.clear()
+            return changed
+
+    def _build(self, games: dict[str, _Snapshot]) -> _State:
+        by_code: dict[str, list[tuple[str, int]]] = {}
+        by_reward: dict[str, list[tuple[str, int]]] = {}
+        routes = {}
+        overview = {}
+
+        for game, snapshot in games.items():
+            groups = {key: [] for key in OUTPUT_KEYS}
+            for i, code in enumerate(snapshot.codes):
+                by_code.setdefault(code.code, []).append((game, i))
+                for name in {reward.name.lower() for reward in code.rewards}:
+                    by_reward.setdefault(name, []).append((game, i))
+                groups["all"].append(snapshot.fragments[i])
+                groups.setdefault(code.status, []).append(snapshot.fragments[i])
+
+            for key in OUTPUT_KEYS:
+                routes[f"/{game}/{key}"] = Response.build(_array(groups[key]))
+            routes[f"/{game}"] = routes[f"/{game}/all"]
+            overview[game] = {
+                **{key: len(groups[key]) for key in OUTPUT_KEYS},
+                "loaded_at": snapshot.loaded_at,
+            }
+
+        routes["/"] = routes["/games"] = Response.build(
+            json.dumps({"games": overview}, ensure_ascii=False).encode()
+        )
+        return _State(games, routes, by_code, by_reward)
+
+    def _select(self, state: _State, filters: dict[str, str], code: str | None) -> bytes:
+        """Hasil filter sebagai array JSON; setiap item diberi field "game"."""
+        if code is not None:
+            refs = state.by_code.get(code.upper(), [])
+        elif "reward" in filters:
+            term = filters["reward"].lower()
+            # Kode dengan beberapa reward yang cocok cukup muncul sekali
+            refs = list(
+                dict.fromkeys(
+                    ref for name, group in state.by_reward.items() if term in name for ref in group
+                )
+            )
+        else:
+            refs = [(game, i) for game, s in state.games.items() for i in range(len(s.codes))]
+
+        items = []
+        for game, i in refs:
+            snapshot = state.games[game]
+            if filters.get("game", game) != game:
+                continue
+            if filters.get("status", snapshot.codes[i].status) != snapshot.codes[i].status:
+                continue
+            items.append(_with_game(game, snapshot.fragments[i]))
+        return _array(items)
+
+    def _query(self, state: _State, path: str, filters: dict[str, str]) -> Response | None:
+        parts = path.strip("/").split("/")
+        if parts[0] == "codes" and len(parts) <= 2:
+            code = unquote(parts[1]) if len(parts) == 2 else None
+            body = self._select(state, filters, code)
+            if code is not None and body == b"[]":
+                return None
+            return Response.build(body)
+
+        # /{game}[/{status}]?reward=... sama dengan /codes?game=...&status=...
+        if parts[0] in state.games and len(parts) <= 2:
+            filters = {**filters, "game": parts[0]}
+            if len(parts) == 2 and parts[1] != "all":
+                if parts[1] not in OUTPUT_KEYS:
+                    return None
+                filters["status"] = parts[1]
+            return Response.build(self._select(state, filters, None))
+        return None
+
+    def get(self, target: str) -> Response | None:
+        """Respons untuk path + query string, None jika tidak ditemukan."""
+        state = self.state
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        filters = {k: v for k, v in parse_qsl(url.query) if k in FILTERS and v}
+
+        if not filters:
+            response = state.routes.get(path)
+            if response is not None:
+                return response
+
+        key = path + "?" + "&".join(f"{k}={filters[k]}" for k in sorted(filters))
+        with self._lock:
+            if key in self._queries and state is self.state:
+                self._queries.move_to_end(key)
+                return self._queries[key]
+
+        response = self._query(state, path, filters)
+        with self._lock:
+            if state is self.state:
+                self._queries[key] = response
+                if len(self._queries) > QUERY_CACHE_SIZE:
+                    self._queries.popitem(last=False)
+        return response
+
+
+NOT_FOUND = Response.build(b'{"error":"not found"}', status=404)
+
+
+class CodeRequestHandler(BaseHTTPRequestHandler):
+    """Handler GET/HEAD: ETag (304), gzip jika diminta, keep-alive HTTP/1.1."""
+
+    protocol_version = "HTTP/1.1"
+    # Header & body dikirim terpisah; tanpa TCP_NODELAY keep-alive tertahan delayed ACK
+    disable_nagle_algorithm = True
+    server_version = "HoyoCode"
+    index: CodeIndex
+
+    def _send(self, head_only: bool = False):
+        response = self.index.get(self.path) or NOT_FOUND
+
+        if response.status == 200 and self.headers.get("If-None-Match") == response.etag:
+            self.send_response(304)
+            self.send_header("ETag", response.etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = response.body
+        use_gzip = response.gzipped is not None and "gzip" in self.headers.get(
+            "Accept-Encoding", ""
+        )
+        if use_gzip:
+            body = response.gzipped
+
+        self.send_response(response.status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", response.etag)
+        self.send_header("Cache-Control", "public, max-age=60")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        self._send()
+
+    def do_HEAD(self):
+        self._send(head_only=True)
+
+    def log_message(self, format, *args):
+        # Log per request dimatikan agar tidak membatasi throughput
+        pass
+
+
+def make_server(index: CodeIndex, host: str = "127.0.0.1", port: int = 8000):
+    """ThreadingHTTPServer yang melayani `index`."""
+    handler = type("Handler", (CodeRequestHandler,), {"index": index})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def watch_files(index: CodeIndex, interval: float, stop: threading.Event, on_reload=None):
+    """Cek stat all.json setiap `interval` detik dan reload game yang berubah (hot reload)."""
+    while not stop.wait(interval):
+        changed = index.reload()
+        if changed and on_reload:
+            on_reload(changed)
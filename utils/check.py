@@ -0,0 +1,98 @@
+import gzip
+import hashlib
+import os
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from .games import GameSpec, PageSpec
+from .http_cache import ResponseCache
+from .sources import SourceStats, source_stats
+from .store import read_manifest
+from .wikitext import api_url
+
+# Status hasil cek: hanya "unchanged" & "empty" (run terakhir tanpa kode) yang
+# berarti scraping boleh dilewati; "missing" = output game belum/tidak ada
+STATES = ("unchanged", "empty", "changed", "missing", "error")
+
+
+@dataclass(slots=True)
+class CheckResult:
+    """Hasil cek satu halaman (atau output game yang hilang)."""
+
+    game: str
+    url: str
+    state: str
+    detail: str = ""
+
+
+def check_url(url: str, cache: ResponseCache, timeout: float = 20) -> tuple[str, str]:
+    """
+    Conditional GET memakai ETag/Last-Modified dari cache, tanpa requests/bs4.
+    304 atau body dengan hash yang sama dengan cache berarti tidak berubah.
+    """
+    headers = {"Accept-Encoding": "gzip", **cache.conditional_headers(url)}
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = response.read()
+            if response.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return "unchanged", "304 Not Modified"
+        return "error", f"HTTP {e.code}"
+    except (urllib.error.URLError, OSError, EOFError) as e:
+        return "error", str(e)
+
+    if hashlib.sha256(body).hexdigest() == cache.digest(url):
+        return "unchanged", "200 OK (hash sama)"
+    return "changed", "200 OK"
+
+
+def probe_url(page: PageSpec, cache: ResponseCache, stats: SourceStats) -> str:
+    """
+    URL yang dicek untuk satu halaman: sumber pertama menurut stats.rank (sumber
+    yang diambil saat scraping, mis. action=render setelah fallback) yang sudah
+    tercatat di cache, selain itu URL utama.
+    """
+    for url in stats.rank(list(page.sources)):
+        if cache.digest(url):
+            return url
+    return page.url
+
+
+def check_games(
+    games: dict[str, GameSpec],
+    cache: ResponseCache,
+    workers: int = 4,
+    ingest: str = "html",
+    stats: SourceStats = source_stats,
+) -> list[CheckResult]:
+    """
+    Cek semua halaman semua game secara paralel. Game tanpa all.json dilaporkan
+    "empty" jika run terakhir memang tidak menemukan kode (manifest tanpa file),
+    selain itu "missing".
+    Dengan ingest "wikitext" yang dicek adalah URL API, sama seperti saat scraping;
+    dengan "html" yang dicek adalah sumber (URL utama/mirror) yang terakhir dipakai.
+    """
+    results = []
+    pages = []
+    for key, game in games.items():
+        if not os.path.exists(os.path.join(game.folder, "all.json")):
+            manifest = read_manifest(game.folder)
+            if manifest is not None and not manifest.get("files"):
+                results.append(CheckResult(key, game.folder, "empty", "run terakhir tanpa kode"))
+            else:
+                results.append(CheckResult(key, game.folder, "missing", "all.json tidak ada"))
+        pages.extend(
+            (key, api_url(page.url) if ingest == "wikitext" else probe_url(page, cache, stats))
+            for page in game.pages
+        )
+
+    with ThreadPoolExecutor(workers, thread_name_prefix="check") as pool:
+        states = pool.map(lambda item: check_url(item[1], cache), pages)
+        for (key, url), (state, detail) in zip(pages, states, strict=True):
+            results.append(CheckResult(key, url, state, detail))
+    return results
@@ -0,0 +1,100 @@
+import os
+import re
+import threading
+
+from .parsers import has_module
+
+# Tag markup rich ([bold red], [/dim], [#1E90FF]); "[Genshin Impact]" bukan tag
+MARKUP = re.compile(r"\[[a-z#/@][^\[\]]*\]")
+
+
+def strip_markup(text: str) -> str:
+    """Hapus tag markup rich dari teks."""
+    return MARKUP.sub("", text)
+
+
+class PlainConsole:
+    """Pengganti rich Console tanpa dependensi: teks biasa tanpa warna & markup."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def print(self, *objects, **kwargs):
+        text = strip_markup(" ".join(str(obj) for obj in objects))
+        with self._lock:
+            print(text, flush=True)
+
+
+class LazyConsole:
+    """
+    Console bersama untuk semua modul. rich baru di-import saat print pertama,
+    sehingga perintah yang tidak mencetak apa pun (atau mode plain) tidak
+    membayar biaya import-nya. Mode plain dipakai jika rich tidak terpasang,
+    HOYO_CODE_PLAIN di-set, atau --plain diberikan.
+    """
+
+    def __init__(self):
+        self.plain = bool(os.getenv("HOYO_CODE_PLAIN")) or not has_module("rich")
+        self._console = None
+        self._lock = threading.Lock()
+
+    def use_plain(self, plain: bool = True):
+        self.plain = plain or not has_module("rich")
+        self._console = None
+
+    def _get(self):
+        if self._console is None:
+            with self._lock:
+                if self._console is None:
+                    if self.plain:
+                        self._console = PlainConsole()
+                    else:
+                        from rich.console import Console
+
+                        self._console = Console()
+        return self._console
+
+    def print(self, *objects, **kwargs):
+        self._get().print(*objects, **kwargs)
+
+
+def panel(text: str, fit: bool = False, **kwargs):
+    """rich Panel (argumen sama dengan Panel), atau teks biasa pada mode plain."""
+    if console.plain:
+        subtitle = kwargs.get("subtitle")
+        return f"{text}\n{subtitle}" if subtitle else text
+
+    from rich.panel import Panel
+
+    return Panel.fit(text, **kwargs) if fit else Panel(text, **kwargs)
+
+
+def table(title: str, columns: tuple[str, ...], rows: list[tuple], left: tuple[str, ...] = ()):
+    """
+    rich Table, atau tabel teks rata kolom pada mode plain.
+    Kolom di `left` rata kiri; sisanya rata kanan jika `left` diisi.
+    """
+    if console.plain:
+        cells = [list(columns)] + [[str(v) for v in row] for row in rows]
+        widths = [max(len(row[i]) for row in cells) for i in range(len(columns))]
+
+        def line(row):
+            return "  ".join(
+                value.ljust(width) if not left or name in left else value.rjust(width)
+                for value, width, name in zip(row, widths, columns, strict=True)
+            )
+
+        return "\n".join([title, *(line(row) for row in cells)])
+
+    from rich.table import Table
+
+    result = Table(title=title)
+    for name in columns:
+        result.add_column(name, justify="left" if not left or name in left else "right")
+    for row in rows:
+        result.add_row(*(str(v) for v in row))
+    return result
+
+
+# Console bersama (rich atau plain)
+console = LazyConsole()
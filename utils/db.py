@@ -0,0 +1,263 @@
+import sqlite3
+from collections.abc import Iterable, Iterator
+from contextlib import closing
+from datetime import UTC, datetime
+
+from .duration import make_duration
+from .games import LEGACY_KEYS
+from .models import Code, Reward
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS codes (
+    id INTEGER PRIMARY KEY,
+    game TEXT NOT NULL,
+    code TEXT NOT NULL,
+    server TEXT NOT NULL,
+    status TEXT NOT NULL,
+    link TEXT,
+    discovered TEXT,
+    valid TEXT,
+    expired TEXT,
+    notes TEXT,
+    discovered_on TEXT,
+    expired_on TEXT,
+    position INTEGER NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    UNIQUE (game, code)
+);
+CREATE INDEX IF NOT EXISTS idx_codes_code ON codes (code);
+CREATE INDEX IF NOT EXISTS idx_codes_game_status ON codes (game, status, position);
+CREATE INDEX IF NOT EXISTS idx_codes_game_last_seen ON codes (game, last_seen, position);
+CREATE INDEX IF NOT EXISTS idx_codes_discovered_on ON codes (discovered_on);
+CREATE INDEX IF NOT EXISTS idx_codes_expired_on ON codes (expired_on);
+CREATE INDEX IF NOT EXISTS idx_codes_first_seen ON codes (first_seen);
+
+CREATE TABLE IF NOT EXISTS rewards (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    image TEXT NOT NULL,
+    UNIQUE (name, image)
+);
+CREATE INDEX IF NOT EXISTS idx_rewards_name ON rewards (name);
+
+CREATE TABLE IF NOT EXISTS code_rewards (
+    code_id INTEGER NOT NULL REFERENCES codes (id) ON DELETE CASCADE,
+    reward_id INTEGER NOT NULL REFERENCES rewards (id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (code_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_code_rewards_reward ON code_rewards (reward_id);
+"""
+
+# PRAGMA user_version; 1 = kolom game berisi key registry (dulu nama folder)
+SCHEMA_VERSION = 1
+
+UPSERT_CODE = """
+INSERT INTO codes (
+    game, code, server, status, link, discovered, valid, expired, notes,
+    discovered_on, expired_on, position, first_seen, last_seen
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (game, code) DO UPDATE SET
+    server = excluded.server,
+    status = excluded.status,
+    link = excluded.link,
+    discovered = excluded.discovered,
+    valid = excluded.valid,
+    expired = excluded.expired,
+    notes = excluded.notes,
+    discovered_on = excluded.discovered_on,
+    expired_on = excluded.expired_on,
+    position = excluded.position,
+    last_seen = excluded.last_seen
+WHERE codes.last_seen != excluded.last_seen
+RETURNING id
+"""
+
+CODE_COLUMNS = (
+    "c.id, c.game, c.code, c.server, c.status, c.link, c.discovered, c.valid, c.expired, c.notes"
+)
+
+
+def _date(value: datetime | None) -> str | None:
+    """Tanggal ISO 'YYYY-MM-DD' (zona waktu sumber) untuk kolom yang di-index."""
+    return None if value is None else value.date().isoformat()
+
+
+class CodeDB:
+    """
+    Penyimpanan kode di SQLite (opsional) dengan index pada kode, game,
+    status, dan tanggal. File JSON/TXT diekspor dari sini.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(SCHEMA)
+            self._migrate(conn)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Koneksi per operasi agar aman dipakai dari beberapa thread scraper
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        """
+        Database lama menyimpan nama folder sebagai game (Star Rail = "honkai").
+        Diganti ke key registry lewat prefix sementara, agar rename berantai
+        (honkai -> starrail, honkai3rd -> honkai) tidak bentrok dengan UNIQUE (game, code).
+        """
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        for folder, key in LEGACY_KEYS.items():
+            conn.execute("UPDATE codes SET game = char(30) || ? WHERE game = ?", (key, folder))
+        conn.execute("UPDATE codes SET game = substr(game, 2) WHERE substr(game, 1, 1) = char(30)")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def upsert(self, game: str, codes: Iterable[Code]) -> str:
+        """
+        Bulk upsert hasil scrape satu game dalam satu transaksi.
+        Kode yang muncul dua kali dalam satu run hanya disimpan kemunculan pertamanya.
+        Return penanda run (last_seen) untuk ekspor.
+        """
+        run = datetime.now(UTC).isoformat()
+        reward_ids: dict[tuple[str, str], int] = {}
+
+        with closing(self._connect()) as conn, conn:
+            for position, code in enumerate(codes):
+                d = code.duration
+                row = conn.execute(
+                    UPSERT_CODE,
+                    (
+                        game,
+                        code.code,
+                        code.server,
+                        code.status,
+                        code.link,
+                        d.discovered,
+                        d.valid,
+                        d.expired,
+                        d.notes,
+                        _date(d.discovered_at),
+                        _date(d.expired_at),
+                        position,
+                        run,
+                        run,
+                    ),
+                ).fetchone()
+                if row is None:
+                    continue
+
+                code_id = row[0]
+                conn.execute("DELETE FROM code_rewards WHERE code_id = ?", (code_id,))
+                conn.executemany(
+                    "INSERT INTO code_rewards (code_id, reward_id, position) VALUES (?, ?, ?)",
+                    [
+                        (code_id, self._reward_id(conn, reward_ids, r), i)
+                        for i, r in enumerate(code.rewards)
+                    ],
+                )
+        return run
+
+    @staticmethod
+    def _reward_id(conn: sqlite3.Connection, cache: dict, reward: Reward) -> int:
+        key = (reward.name, reward.image)
+        if key not in cache:
+            conn.execute(
+                "INSERT INTO rewards (name, image) VALUES (?, ?) ON CONFLICT DO NOTHING", key
+            )
+            cache[key] = conn.execute(
+                "SELECT id FROM rewards WHERE name = ? AND image = ?", key
+            ).fetchone()[0]
+        return cache[key]
+
+    def _build(self, conn: sqlite3.Connection, rows: list[tuple]) -> list[tuple[str, Code]]:
+        """Susun ulang objek Code (beserta nama game) dari baris tabel codes."""
+        if not rows:
+            return []
+
+        rewards: dict[int, list[Reward]] = {}
+        ids = [row[0] for row in rows]
+        for start in range(0, len(ids), 500):
+            chunk = ids[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for code_id, name, image in conn.execute(
+                f"SELECT cr.code_id, r.name, r.image FROM code_rewards cr "
+                f"JOIN rewards r ON r.id = cr.reward_id "
+                f"WHERE cr.code_id IN ({placeholders}) ORDER BY cr.code_id, cr.position",
+                chunk,
+            ):
+                rewards.setdefault(code_id, []).append(Reward.intern(name, image))
+
+        return [
+            (
+                game,
+                Code(
+                    code=code,
+                    server=server,
+                    status=status,
+                    rewards=rewards.get(code_id, []),
+                    duration=make_duration(discovered, valid, expired, notes),
+                    link=link,
+                ),
+            )
+            for code_id, game, code, server, status, link, discovered, valid, expired, notes in rows
+        ]
+
+    def export(self, game: str, run: str) -> Iterator[Code]:
+        """Kode satu game yang terlihat pada run tertentu, sesuai urutan halaman."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT {CODE_COLUMNS} FROM codes c "
+                f"WHERE c.game = ? AND c.last_seen = ? ORDER BY c.position",
+                (game, run),
+            ).fetchall()
+            for _, code in self._build(conn, rows):
+                yield code
+
+    def query(
+        self,
+        game: str | None = None,
+        status: str | None = None,
+        code: str | None = None,
+        reward: str | None = None,
+        since: str | None = None,
+        limit: int | None = None,
+    ) -> list[tuple[str, Code]]:
+        """
+        Cari kode dengan filter opsional. `since` (YYYY-MM-DD) memfilter tanggal
+        Discovered di halaman wiki. Return list (game, Code).
+        """
+        where, params = [], []
+        if game:
+            where.append("c.game = ?")
+            params.append(game)
+        if status:
+            where.append("c.status = ?")
+            params.append(status)
+        if code:
+            where.append("c.code = ?")
+            params.append(code.upper())
+        if since:
+            where.append("c.discovered_on >= ?")
+            params.append(since)
+        if reward:
+            where.append(
+                "c.id IN (SELECT cr.code_id FROM code_rewards cr "
+                "JOIN rewards r ON r.id = cr.reward_id WHERE r.name LIKE ?)"
+            )
+            params.append(f"%{reward}%")
+
+        sql = f"SELECT {CODE_COLUMNS} FROM codes c"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY c.game, c.status, c.position"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with closing(self._connect()) as conn:
+            return self._build(conn, conn.execute(sql, params).fetchall())
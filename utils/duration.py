@@ -0,0 +1,118 @@
+import re
+from datetime import UTC, datetime, timedelta, timezone
+
+from .models import Duration
+
+# Label durasi di kolom wiki, dicari sekali jalan dengan satu pola terkompilasi.
+# Genshin memakai "Note", Star Rail memakai "Notes", keduanya diterima.
+# Tanpa \b karena Star Rail menempelkan label ke nilai sebelumnya ("2023Valid until:").
+LABEL_PATTERN = re.compile(r"(Discovered|Valid(?: until)?|Expired|Notes?)\s*:\s*")
+LABEL_FIELDS = {
+    "Discovered": "discovered",
+    "Valid": "valid",
+    "Valid until": "valid",
+    "Expired": "expired",
+    "Note": "notes",
+    "Notes": "notes",
+}
+
+# "March 28, 2023", "Sept. 5 2023 04:00", "2023-03-28 10:00", opsional "(UTC+8)"
+DATE_PATTERN = re.compile(
+    r"(?:(?P<month>[A-Z][a-z]+)\.? (?P<day>\d{1,2}),? (?P<year>\d{4})"
+    r"|(?P<iso_year>\d{4})-(?P<iso_month>\d{2})-(?P<iso_day>\d{2}))"
+    r"(?:,? (?P<hour>\d{1,2}):(?P<minute>\d{2}))?"
+    r"(?:\s*\(?(?:UTC|GMT)\s*(?:(?P<sign>[+\-−])\s*(?P<tz_hour>\d{1,2})(?::?(?P<tz_minute>\d{2}))?)?)?"
+)
+
+MONTHS = {
+    name: number
+    for number, names in enumerate(
+        (
+            ("January", "Jan"),
+            ("February", "Feb"),
+            ("March", "Mar"),
+            ("April", "Apr"),
+            ("May",),
+            ("June", "Jun"),
+            ("July", "Jul"),
+            ("August", "Aug"),
+            ("September", "Sep", "Sept"),
+            ("October", "Oct"),
+            ("November", "Nov"),
+            ("December", "Dec"),
+        ),
+        start=1,
+    )
+    for name in names
+}
+
+
+def parse_datetime(text: str | None, default_tz: timezone = UTC) -> datetime | None:
+    """
+    Normalisasi tanggal teks bebas dari wiki menjadi datetime ber-timezone.
+    Offset "(UTC+8)" dipakai jika ada, selain itu `default_tz` (UTC).
+    Teks tanpa tanggal ("Unknown", "Indefinite") menghasilkan None.
+    """
+    if not text:
+        return None
+    match = DATE_PATTERN.search(text)
+    if not match:
+        return None
+
+    if match["iso_year"]:
+        year, month, day = int(match["iso_year"]), int(match["iso_month"]), int(match["iso_day"])
+    else:
+        month = MONTHS.get(match["month"])
+        if month is None:
+            return None
+        year, day = int(match["year"]), int(match["day"])
+
+    tz = default_tz
+    if match["tz_hour"]:
+        offset = timedelta(hours=int(match["tz_hour"]), minutes=int(match["tz_minute"] or 0))
+        tz = timezone(-offset if match["sign"] in "-−" else offset)
+
+    try:
+        return datetime(
+            year, month, day, int(match["hour"] or 0), int(match["minute"] or 0), tzinfo=tz
+        )
+    except ValueError:
+        return None
+
+
+def make_duration(
+    discovered: str | None = None,
+    valid: str | None = None,
+    expired: str | None = None,
+    notes: str | None = None,
+) -> Duration:
+    """Duration lengkap dengan tanggal yang sudah dinormalisasi."""
+    return Duration(
+        discovered=discovered,
+        valid=valid,
+        expired=expired,
+        notes=notes,
+        discovered_at=parse_datetime(discovered),
+        valid_until=parse_datetime(valid),
+        expired_at=parse_datetime(expired),
+    )
+
+
+def parse_duration(text: str) -> Duration:
+    """
+    Parsing teks durasi dalam satu kali jalan untuk menangkap:
+    Discovered, Valid (until), Expired, dan Note(s).
+    Setiap nilai adalah teks di antara labelnya dan label berikutnya.
+    Jika satu label muncul lebih dari sekali, kemunculan pertama yang dipakai.
+    """
+    fields: dict[str, str] = {}
+    matches = list(LABEL_PATTERN.finditer(text))
+
+    for i, match in enumerate(matches):
+        field = LABEL_FIELDS[match.group(1)]
+        if field in fields:
+            continue
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        fields[field] = text[match.end() : end].strip()
+
+    return make_duration(**fields)
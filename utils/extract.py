@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .duration import make_duration, parse_duration
+from .models import Code, Duration, Reward
+
+if TYPE_CHECKING:
+    from bs4 import Tag
+
+    from .row_cache import RowCache
+
+# Peran kolom yang dikenali engine
+ROLES = ("code", "server", "rewards", "duration", "discovered", "valid", "expired", "notes")
+# Peran yang masing-masing mengisi satu field Duration (jika tidak ada kolom "duration")
+DURATION_FIELDS = ("discovered", "valid", "expired", "notes")
+
+CODE_CLEAN = re.compile(r"[^A-Z0-9]")
+REWARD_SPLIT = re.compile(r",|&|\+")
+
+
+def image_url(src: str) -> str:
+    """URL gambar CDN tanpa /revision/... & ukuran thumbnail (sama untuk semua mode ingest)."""
+    return src.split(".png")[0] + ".png"
+
+
+@dataclass(frozen=True)
+class Column:
+    """
+    Satu kolom tabel: perannya dan nama header yang cocok.
+    Header dicocokkan tanpa memperhatikan huruf besar/kecil, cukup diawali salah satu alias.
+    """
+
+    role: str
+    headers: tuple[str, ...]
+    required: bool = True
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """Cara membaca satu jenis tabel kode."""
+
+    columns: tuple[Column, ...]
+    # "items": span.item berisi gambar & nama; "text": teks dipisah koma/&/+
+    rewards: str = "items"
+    # Jika sel kode tidak punya tag <code>, pakai seluruh teks sel
+    code_fallback: bool = False
+
+
+class TableExtractor:
+    """
+    Ekstraksi kode dari baris tabel berdasarkan TableSpec.
+    Posisi kolom ditentukan sekali per tabel dari baris header, lalu setiap
+    baris data dibaca dalam satu loop dengan indeks yang sudah diketahui.
+    """
+
+    def __init__(self, spec: TableSpec):
+        self.spec = spec
+        self._headers = [(c.role, tuple(h.lower() for h in c.headers)) for c in spec.columns]
+        self._required = {c.role for c in spec.columns if c.required}
+        # Bagian key cache baris: hasil ekstraksi bergantung pada extractor & spec
+        self.scope = f"{type(self).__name__}:{spec!r}"
+
+    def resolve(self, header: Tag) -> dict[str, int] | None:
+        """Peta peran -> indeks kolom dari baris header, None jika kolom wajib tidak ada."""
+        names = self._header_names(header)
+        layout = {}
+        for role, aliases in self._headers:
+            for index, name in enumerate(names):
+                if name.startswith(aliases):
+                    layout[role] = index
+                    break
+        if not self._required <= layout.keys():
+            return None
+        return layout
+
+    def extract(
+        self,
+        rows: Iterable[tuple[int, Tag]],
+        statuses: tuple[str, ...] = (),
+        cache: RowCache | None = None,
+    ) -> Iterator[Code]:
+        """
+        Kode dari baris (indeks tabel, <tr>) berurutan; baris pertama tiap tabel adalah header.
+        `statuses` memberi status per tabel (nilai terakhir berlaku untuk tabel berikutnya);
+        kosong berarti status ditentukan dari teks durasi.
+        Dengan `cache` (utils.row_cache), baris yang isinya sudah dikenal tidak diekstrak ulang.
+        """
+        current = None
+        layout = None
+        status = None
+        scope = ""
+
+        for index, row in rows:
+            if index != current:
+                current = index
+                layout = self.resolve(row)
+                status = statuses[min(index, len(statuses) - 1)] if statuses else None
+                if layout is not None:
+                    scope = f"{self.scope}|{sorted(layout.items())}|{status}"
+                continue
+            if layout is None:
+                continue
+            if cache is None:
+                yield from self._row(row, layout, status)
+                continue
+
+            fingerprint = self._fingerprint(row)
+            codes = cache.get(scope, fingerprint)
+            if codes is None:
+                codes = tuple(self._row(row, layout, status))
+                cache.put(scope, fingerprint, codes)
+            yield from codes
+
+    # Akses sel: HTML (bs4 Tag); subclass untuk format lain (mis. utils.wikitext)
+    def _header_names(self, header: Tag) -> list[str]:
+        return [cell.get_text(" ", strip=True).lower() for cell in header.find_all(["th", "td"])]
+
+    def _cells(self, row: Tag) -> list:
+        return row.find_all("td")
+
+    def _text(self, cell: Tag, separator: str = "") -> str:
+        return cell.get_text(separator=separator, strip=True)
+
+    def _fingerprint(self, row: Tag) -> str:
+        """Isi mentah baris (tag, atribut & teks) untuk key cache; jauh lebih murah dari str()."""
+        parts = []
+        for node in row.descendants:
+            if node.name is None:
+                parts.append(node)
+            else:
+                parts.append(node.name)
+                if node.attrs:
+                    parts.append(repr(node.attrs))
+        return "\x1f".join(parts)
+
+    def _row(self, row: Tag, layout: dict[str, int], status: str | None) -> Iterator[Code]:
+        cells = self._cells(row)
+        if not cells or max(layout.values()) >= len(cells):
+            return
+
+        codes = self._codes(cells[layout["code"]])
+        if not codes:
+            return
+
+        server = self._text(cells[layout["server"]]) if "server" in layout else ""
+        # Satu tuple untuk semua kode di baris ini (Code tidak menyalinnya lagi)
+        rewards = self._rewards(cells[layout["rewards"]]) if "rewards" in layout else ()
+
+        if "duration" in layout:
+            # Separator spasi agar label (Discovered/Valid/...) tidak menempel ke nilai
+            text = self._text(cells[layout["duration"]], " ")
+            duration = parse_duration(text)
+        else:
+            text = ""
+            duration = make_duration(
+                **{
+                    field: self._text(cells[layout[field]])
+                    for field in DURATION_FIELDS
+                    if field in layout
+                }
+            )
+
+        row_status = status or self._status(duration, text)
+        for code in codes:
+            yield Code(
+                code=code,
+                server=server,
+                status=row_status,
+                rewards=rewards,
+                duration=duration,
+            )
+
+    def _codes(self, cell: Tag) -> list[str]:
+        """Semua kode dalam satu sel (satu baris bisa memuat beberapa tag <code>)."""
+        tags = cell.find_all("code")
+        if tags:
+            texts = [tag.get_text(strip=True) for tag in tags]
+        elif self.spec.code_fallback:
+            texts = [self._text(cell)]
+        else:
+            return []
+        return [code for code in (CODE_CLEAN.sub("", t.upper()) for t in texts) if code]
+
+    def _rewards(self, cell: Tag) -> tuple[Reward, ...]:
+        if self.spec.rewards == "text":
+            items = REWARD_SPLIT.split(self._text(cell))
+            return tuple(Reward.intern(name, "") for name in (i.strip() for i in items) if name)
+
+        rewards = []
+        for item in cell.find_all("span", class_="item"):
+            name_tag = item.find("span", class_="item-text")
+            if not name_tag:
+                continue
+
+            img_url = ""
+            img_tag = item.find("img")
+            if img_tag:
+                src = img_tag.get("data-src") or img_tag.get("src")
+                if src:
+                    img_url = image_url(src)
+            rewards.append(Reward.intern(name_tag.get_text(strip=True), img_url))
+        return tuple(rewards)
+
+    @staticmethod
+    def _status(duration: Duration, text: str) -> str:
+        """Status dari durasi untuk halaman yang mencampur kode aktif & kadaluarsa."""
+        if duration.expired:
+            return "expired"
+        if duration.valid and "Unknown" in duration.valid:
+            return "active"
+        if "expired" in text.lower():
+            return "expired"
+        return "active"
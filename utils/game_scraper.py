@@ -0,0 +1,229 @@
+from collections.abc import Collection, Iterable, Iterator
+from concurrent.futures import Future
+
+from .extract import TableExtractor
+from .games import GameSpec, PageSpec
+from .http_cache import Page
+from .models import Code
+from .procpool import extract_page
+from .scraper_base import ScraperBase
+from .wikitext import (
+    WikiCell,
+    WikitextExtractor,
+    api_url,
+    decode_file_info,
+    decode_response,
+    file_info_urls,
+    file_url,
+    item_files,
+    iter_wiki_rows,
+)
+
+# Sumber data halaman: HTML Fandom (+mirror) atau wikitext lewat MediaWiki API
+INGEST_MODES = ("html", "wikitext")
+
+
+class GameScraper(ScraperBase):
+    """Scraper generik: halaman & kolom tabel diambil dari GameSpec (utils.games)."""
+
+    def __init__(self, spec: GameSpec):
+        super().__init__(game_name=spec.name, game_color=spec.color, folder=spec.folder)
+        self.spec = spec
+        self.discord_color = spec.discord_color
+        self.extractors = {page.table: TableExtractor(page.table) for page in spec.pages}
+        # "wikitext": tabel dibaca langsung dari wikitext (tanpa HTML, skin & DOM)
+        self.ingest = "html"
+        self._wiki_extractors: dict[str, WikitextExtractor] = {}
+        # URL Special:FilePath -> URL CDN gambar, dari prop=imageinfo (mode wikitext)
+        self._file_urls: dict[str, str] = {}
+
+        # Mode watch: kode hasil ekstraksi terakhir per URL disimpan di memori,
+        # sehingga halaman yang tidak berubah/tidak dijadwalkan tidak diparse ulang
+        self.keep_state = False
+        self._codes: dict[str, list[Code]] = {}
+        self._extracted: dict[str, list[Code]] = {}
+
+    def _remember(self, url: str, codes: Iterable[Code]) -> Iterator[Code]:
+        """Teruskan kode sambil mencatatnya; baru dipakai setelah penyimpanan berhasil."""
+        collected = []
+        for code in codes:
+            collected.append(code)
+            yield code
+        self._extracted[url] = collected
+
+    def _pooled(self, url: str, future: Future) -> Iterator[Code]:
+        """Kode hasil worker process pool, plus span parse yang diukur di worker."""
+        codes, parse_seconds, size, rows = future.result()
+        self.metrics.add(self.game_key, "parse", parse_seconds, url, bytes=size, rows=rows)
+        yield from codes
+
+    def page_sources(self, spec: PageSpec) -> tuple[str, ...]:
+        """URL yang diminta untuk satu halaman sesuai mode ingest."""
+        if self.ingest == "wikitext":
+            return (api_url(spec.url),)
+        return spec.sources
+
+    def wiki_rows(
+        self, page: Page | None, all_tables: bool
+    ) -> Iterator[tuple[int, list[WikiCell]]]:
+        """Padanan iter_tables untuk respons wikitext MediaWiki API."""
+        if page is None:
+            return
+        content = page.content if page.content is not None else b"".join(page.iter_chunks())
+        with self.span("parse", page.url) as span:
+            span.bytes = len(content)
+            try:
+                rows = list(iter_wiki_rows(decode_response(content), all_tables))
+            except (ValueError, KeyError, TypeError) as e:
+                self.log(f"❌ Respons API tidak valid: {e}", style="bold red")
+                return
+
+        current = None
+        for index, row in rows:
+            if index == current:
+                self.metrics.count(rows=1)
+            current = index
+            yield index, row
+
+    def resolve_files(self, page_url: str, names: Iterable[str]) -> dict[str, str]:
+        """
+        URL CDN gambar untuk nama file di wiki `page_url`, seperti src gambar di
+        HTML. File yang belum dikenal diminta sekaligus (prop=imageinfo, 50 per request).
+        """
+        names = sorted(names)
+        missing = [name for name in names if file_url(page_url, name) not in self._file_urls]
+        for url in file_info_urls(page_url, missing):
+            page = self.fetch(url)
+            if page is None or page.content is None:
+                continue
+            try:
+                found = decode_file_info(page.content)
+            except (ValueError, KeyError, TypeError, IndexError) as e:
+                self.log(f"❌ Respons imageinfo tidak valid: {e}", style="bold red")
+                continue
+            for name, image in found.items():
+                self._file_urls[file_url(page_url, name)] = image
+
+        files = {}
+        for name in names:
+            image = self._file_urls.get(file_url(page_url, name))
+            if image:
+                files[name] = image
+        return files
+
+    def _wiki_codes(self, spec: PageSpec, page: Page | None) -> Iterable[Code]:
+        extractor = self._wiki_extractors.get(spec.url)
+        if extractor is None:
+            extractor = self._wiki_extractors[spec.url] = WikitextExtractor(spec.table, spec.url)
+        rows = list(self.wiki_rows(page, spec.all_tables))
+        names = item_files(rows) if spec.table.rewards == "items" else set()
+        extractor.files = self.resolve_files(spec.url, names)
+
+        cache = self.row_cache
+        if len(extractor.files) < len(names):
+            # Ada gambar yang belum terselesaikan (fallback Special:FilePath): jangan di-cache
+            self.log("⚠️ Sebagian URL gambar tidak ditemukan, memakai Special:FilePath.")
+            cache = None
+        return extractor.extract(rows, spec.statuses, cache)
+
+    def _page_codes(self, spec: PageSpec, page: Page | None) -> Iterable[Code]:
+        known = self._codes.get(spec.url)
+        if known is not None and (page is None or not page.changed):
+            return known
+
+        if self.ingest == "wikitext":
+            codes = self._wiki_codes(spec, page)
+        elif self.parse_pool is not None and page is not None and page.content is not None:
+            # Parsing & ekstraksi di proses lain, semua halaman satu game diproses bersamaan
+            future = self.parse_pool.submit(
+                extract_page,
+                page.content,
+                spec.table,
+                spec.statuses,
+                spec.all_tables,
+                self.parser_backend,
+                self.scoped_parse,
+            )
+            codes = self._pooled(spec.url, future)
+        else:
+            rows = self.iter_tables(page, spec.all_tables)
+            codes = self.extractors[spec.table].extract(rows, spec.statuses, self.row_cache)
+
+        if self.keep_state and page is not None:
+            codes = self._remember(spec.url, codes)
+        return codes
+
+    def _extract(self, pages: list[Page | None]) -> Iterator[Code]:
+        """
+        Kode dari semua halaman, baris demi baris, sesuai urutan di konfigurasi.
+        Kode yang muncul di beberapa halaman/sumber hanya diambil sekali (yang pertama).
+        """
+        # Dengan process pool, semua halaman sudah dikirim ke worker sebelum hasil pertama dibaca
+        sources = [
+            self._page_codes(spec, page) for spec, page in zip(self.spec.pages, pages, strict=True)
+        ]
+        seen: set[str] = set()
+        for codes in sources:
+            for code in codes:
+                if code.code not in seen:
+                    seen.add(code.code)
+                    yield code
+
+    def _known(self, url: str) -> Page | None:
+        """Halaman yang tidak diambil ulang tapi kodenya sudah ada di memori."""
+        if url in self._codes:
+            return Page(url=url, content=None, changed=False)
+        return None
+
+    def scrape(self, due: Collection[str] | None = None) -> dict[str, bool | None]:
+        """
+        Scrape semua halaman game, atau hanya URL di `due` (mode watch).
+        Halaman lain memakai kode yang sudah diekstrak sebelumnya jika ada.
+        Return status per URL yang diambil: True berubah, False sama, None gagal.
+        """
+        self.log("🔍 Memulai scraping...")
+        urls = [page.url for page in self.spec.pages]
+        # Halaman yang kodenya belum ada di memori selalu ikut diambil
+        targets = [url for url in urls if due is None or url in due or url not in self._codes]
+
+        # Semua halaman diambil bersamaan (paralel pada mode thread/async),
+        # masing-masing dari sumber tercepat di antara URL utama & mirror-nya
+        sources = {page.url: self.page_sources(page) for page in self.spec.pages}
+        fetched = dict(
+            zip(targets, self.fetch_pages([sources[url] for url in targets]), strict=True)
+        )
+        status = {url: None if page is None else page.changed for url, page in fetched.items()}
+        pages = [fetched.get(url) or self._known(url) for url in urls]
+
+        failed = [url for url, page in zip(urls, pages, strict=True) if page is None]
+        if failed:
+            # Tanpa halaman ini kodenya akan hilang dari output; pertahankan output lama
+            # dan jangan commit cache halaman lain agar run berikutnya mencoba lagi
+            self.log(
+                f"⚠️ {len(failed)} halaman gagal diambil, output lama dipertahankan.",
+                style="yellow",
+            )
+            self._discard_fetched()
+            return status
+
+        self._extracted = {}
+        if self.is_unchanged(pages):
+            return status
+
+        codes = self.timed("extract", self._extract(pages))
+
+        if self.stream:
+            # Kode langsung dialirkan ke writer tanpa menampung list
+            self.save_results(codes)
+        else:
+            results = list(codes)
+            active = sum(code.status == "active" for code in results)
+            self.log(
+                f"Ditemukan {len(results)} kode ({active} aktif, "
+                f"{len(results) - active} kadaluarsa)."
+            )
+            self.save_results(results)
+
+        self._codes.update(self._extracted)
+        self._extracted = {}
+        return status
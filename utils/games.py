@@ -0,0 +1,137 @@
+from dataclasses import dataclass
+
+from .extract import Column, TableSpec
+
+# Halaman kode aktif dicek sering, halaman history jarang berubah
+ACTIVE_INTERVAL = 180.0
+HISTORY_INTERVAL = 3600.0
+
+
+@dataclass(frozen=True)
+class PageSpec:
+    """Satu halaman wiki berisi tabel kode."""
+
+    url: str
+    table: TableSpec
+    # Status per tabel (nilai terakhir berlaku untuk tabel berikutnya), kosong = dari durasi
+    statuses: tuple[str, ...] = ()
+    # False: hanya table.wikitable pertama; True: semua tabel di halaman
+    all_tables: bool = False
+    # Interval polling dasar (detik) pada mode watch, lihat utils.watch
+    interval: float = ACTIVE_INTERVAL
+    # URL lain dengan tabel yang sama (saat ini action=render dari wiki yang sama), lihat fetch_any
+    mirrors: tuple[str, ...] = ()
+
+    @property
+    def sources(self) -> tuple[str, ...]:
+        return (self.url, *self.mirrors)
+
+
+def render_url(url: str) -> str:
+    """Konten artikel MediaWiki saja (action=render), tanpa skin/navigasi Fandom."""
+    return f"{url}?action=render"
+
+
+def wiki_page(url: str, table: TableSpec, **kwargs) -> PageSpec:
+    """
+    PageSpec halaman wiki dengan action=render sebagai mirror. Host-nya sama
+    (rate limit, slot koneksi & 403 ikut sama), jadi hanya fallback saat render
+    halaman penuh lambat/gagal, bukan sumber independen.
+    """
+    return PageSpec(url, table, mirrors=(render_url(url),), **kwargs)
+
+
+@dataclass(frozen=True)
+class GameSpec:
+    """Konfigurasi satu game: identitas, folder output, dan halaman yang di-scrape."""
+
+    name: str
+    color: str
+    folder: str
+    pages: tuple[PageSpec, ...]
+    # Warna embed Discord
+    discord_color: int = 0
+    # False: tidak ikut dijalankan tanpa --game (game baru yang belum diverifikasi)
+    default: bool = True
+
+
+# Tabel standar wiki Fandom HoYoverse: Code | Server | Rewards | Duration
+HOYO_TABLE = TableSpec(
+    columns=(
+        Column("code", ("code",)),
+        Column("server", ("server",)),
+        Column("rewards", ("reward",)),
+        Column("duration", ("duration",)),
+    )
+)
+
+# Honkai Impact 3rd: [#] | Code | Date | Occasion | Rewards, hadiah berupa teks
+HONKAI_TABLE = TableSpec(
+    columns=(
+        Column("code", ("code",)),
+        Column("valid", ("date",)),
+        Column("server", ("occasion",)),
+        Column("notes", ("occasion",), required=False),
+        Column("rewards", ("reward",)),
+    ),
+    rewards="text",
+    code_fallback=True,
+)
+
+GAMES = {
+    "genshin": GameSpec(
+        name="Genshin Impact",
+        color="blue",
+        folder="genshin",
+        pages=(
+            wiki_page(
+                "https://genshin-impact.fandom.com/wiki/Promotional_Code",
+                HOYO_TABLE,
+                statuses=("active",),
+            ),
+            wiki_page(
+                "https://genshin-impact.fandom.com/wiki/Promotional_Code/History",
+                HOYO_TABLE,
+                statuses=("expired",),
+                interval=HISTORY_INTERVAL,
+            ),
+        ),
+        discord_color=0x1E90FF,
+    ),
+    # Folder "honkai" dipertahankan karena sudah dipakai output Star Rail sejak awal
+    "starrail": GameSpec(
+        name="Honkai Star Rail",
+        color="magenta",
+        folder="honkai",
+        pages=(wiki_page("https://honkai-star-rail.fandom.com/wiki/Redemption_Code", HOYO_TABLE),),
+        discord_color=0x8A2BE2,
+    ),
+    "honkai": GameSpec(
+        name="Honkai Impact 3rd",
+        color="cyan",
+        folder="honkai3rd",
+        pages=(
+            wiki_page(
+                "https://honkaiimpact3.fandom.com/wiki/Exchange_Rewards",
+                HONKAI_TABLE,
+                # Tabel pertama kode aktif, sisanya history
+                statuses=("active", "expired"),
+                all_tables=True,
+            ),
+        ),
+        discord_color=0x00BFFF,
+        default=False,
+    ),
+    "zzz": GameSpec(
+        name="Zenless Zone Zero",
+        color="yellow",
+        folder="zzz",
+        pages=(wiki_page("https://zenless-zone-zero.fandom.com/wiki/Redemption_Code", HOYO_TABLE),),
+        discord_color=0xFFC400,
+        default=False,
+    ),
+}
+
+# Identitas game lama (nama folder) -> key registry, untuk migrasi DB & state notifikasi
+# yang ditulis sebelum keduanya memakai key registry
+LEGACY_KEYS = {spec.folder: key for key, spec in GAMES.items() if spec.folder != key}
@@ -0,0 +1,189 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+CACHE_DIR = os.path.join(".cache", "http")
+
+# Ukuran potongan saat body dibaca bertahap
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class Page:
+    """Hasil fetch satu URL beserta penanda perubahan konten."""
+
+    url: str
+    content: bytes | None
+    changed: bool = True
+    # Body bertahap (mode streaming), dipakai jika content None
+    stream: Iterator[bytes] | None = None
+
+    def iter_chunks(self) -> Iterator[bytes]:
+        """Body halaman sebagai potongan bytes, baik dari memori maupun stream."""
+        if self.content is None:
+            yield from self.stream or ()
+            return
+        for start in range(0, len(self.content), CHUNK_SIZE):
+            yield self.content[start : start + CHUNK_SIZE]
+
+
+class ResponseCache:
+    """
+    Cache respons HTTP di disk untuk conditional request.
+    Menyimpan ETag, Last-Modified, dan hash SHA-256 konten per URL,
+    plus body terakhir (gzip) agar respons 304 tetap bisa diparse bila perlu.
+
+    Entri baru ditahan sebagai 'pending' dan baru disimpan ke index setelah
+    commit(), yaitu setelah data game berhasil ditulis. Jika proses gagal di
+    tengah jalan, run berikutnya tidak akan salah menganggap halaman 'tidak berubah'.
+    """
+
+    def __init__(self, directory: str = CACHE_DIR):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+        self._lock = threading.Lock()
+        self._pending: dict[str, dict] = {}
+        self._index: dict[str, dict] = self._load()
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _body_path(self, digest: str) -> str:
+        return os.path.join(self.directory, f"{digest}.html.gz")
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """Header If-None-Match / If-Modified-Since untuk URL yang sudah dikenal."""
+        with self._lock:
+            entry = self._index.get(url)
+        if not entry or not os.path.exists(self._body_path(entry["sha256"])):
+            return {}
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def digest(self, url: str) -> str | None:
+        """SHA-256 body terakhir yang sudah diproses untuk URL (None jika belum dikenal)."""
+        with self._lock:
+            entry = self._index.get(url)
+        return entry["sha256"] if entry else None
+
+    def body(self, url: str) -> bytes | None:
+        """Body terakhir yang tersimpan untuk URL (dipakai saat server membalas 304)."""
+        with self._lock:
+            entry = self._index.get(url)
+        if not entry:
+            return None
+        try:
+            with gzip.open(self._body_path(entry["sha256"]), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def iter_body(self, url: str) -> Iterator[bytes]:
+        """Body terakhir untuk URL, dibaca bertahap dari file gzip."""
+        with self._lock:
+            entry = self._index.get(url)
+        if not entry:
+            return
+        with gzip.open(self._body_path(entry["sha256"]), "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                yield chunk
+
+    def _register(self, url: str, digest: str, headers) -> bool:
+        """Catat entri pending (dipanggil dengan lock). Return True jika konten berubah."""
+        previous = self._index.get(url)
+        self._pending[url] = {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "sha256": digest,
+        }
+        return not previous or previous["sha256"] != digest
+
+    def store(self, url: str, content: bytes, headers) -> bool:
+        """Simpan respons 200 sebagai pending. Return True jika konten berubah."""
+        digest = hashlib.sha256(content).hexdigest()
+
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            body_path = self._body_path(digest)
+            if not os.path.exists(body_path):
+                with gzip.open(body_path, "wb") as f:
+                    f.write(content)
+
+            return self._register(url, digest, headers)
+
+    def store_stream(self, url: str, chunks: Iterable[bytes], headers) -> Iterator[bytes]:
+        """
+        Versi streaming dari store(): body ditulis & di-hash sambil diteruskan
+        ke konsumen. Entri pending baru dicatat setelah body habis dibaca.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = os.path.join(self.directory, f"{uuid.uuid4().hex}.tmp")
+        hasher = hashlib.sha256()
+
+        try:
+            with gzip.open(tmp_path, "wb") as f:
+                for chunk in chunks:
+                    hasher.update(chunk)
+                    f.write(chunk)
+                    yield chunk
+
+            digest = hasher.hexdigest()
+            with self._lock:
+                os.replace(tmp_path, self._body_path(digest))
+                self._register(url, digest, headers)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def discard(self, url: str):
+        """Buang entri pending URL (respons yang tidak dipakai, mis. request hedge yang kalah)."""
+        with self._lock:
+            self._pending.pop(url, None)
+
+    def commit(self, urls: list[str]):
+        """Pindahkan entri pending milik URL tertentu ke index lalu simpan ke disk."""
+        with self._lock:
+            for url in urls:
+                if url in self._pending:
+                    self._index[url] = self._pending.pop(url)
+
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{self.index_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._index, f, indent=4)
+            os.replace(tmp_path, self.index_path)
+            self._prune()
+
+    def _prune(self):
+        """Hapus body yang sudah tidak dirujuk index maupun pending."""
+        live = {e["sha256"] for e in (*self._index.values(), *self._pending.values())}
+        for name in os.listdir(self.directory):
+            if name.endswith(".html.gz") and name.removesuffix(".html.gz") not in live:
+                os.remove(os.path.join(self.directory, name))
+
+    def clear(self):
+        """Kosongkan cache (dipakai saat --reset)."""
+        with self._lock:
+            self._index.clear()
+            self._pending.clear()
+            if os.path.isdir(self.directory):
+                for name in os.listdir(self.directory):
+                    os.remove(os.path.join(self.directory, name))
+
+
+# Cache bersama untuk semua scraper
+response_cache = ResponseCache()
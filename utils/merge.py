@@ -0,0 +1,63 @@
+import os
+import shutil
+from dataclasses import dataclass
+
+from .registry import ScraperEntry
+from .store import file_digest
+
+
+@dataclass(slots=True)
+class MergeResult:
+    """Asal output satu game setelah merge (source None = tidak ada di shard mana pun)."""
+
+    game: str
+    folder: str
+    source: str | None
+
+
+def find_output(sources: list[str], folder: str) -> list[str]:
+    """Direktori shard yang berisi output lengkap (all.json) untuk folder ini."""
+    return [src for src in sources if os.path.isfile(os.path.join(src, folder, "all.json"))]
+
+
+def plan_merge(sources: list[str], entries: list[ScraperEntry]) -> list[MergeResult]:
+    """
+    Tentukan asal setiap game sebelum ada file yang disalin. Satu game boleh ada
+    di beberapa shard hanya jika all.json-nya identik; selain itu ValueError.
+    """
+    plan = []
+    for entry in entries:
+        folder = entry.folder()
+        found = find_output(sources, folder)
+        digests = {file_digest(os.path.join(src, folder, "all.json")) for src in found}
+        if len(digests) > 1:
+            raise ValueError(f"Output {entry.key} berbeda di beberapa shard: {', '.join(found)}")
+        plan.append(MergeResult(entry.key, folder, found[0] if found else None))
+    return plan
+
+
+def replace_folder(source: str, target: str):
+    """Salin folder shard ke `target`; folder lama baru dihapus setelah salinan lengkap."""
+    tmp_path = f"{target}.merge-tmp"
+    old_path = f"{target}.merge-old"
+    for path in (tmp_path, old_path):
+        shutil.rmtree(path, ignore_errors=True)
+
+    shutil.copytree(source, tmp_path)
+    if os.path.exists(target):
+        os.replace(target, old_path)
+    os.replace(tmp_path, target)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+def merge_outputs(
+    sources: list[str], entries: list[ScraperEntry], dest: str = "."
+) -> list[MergeResult]:
+    """Gabungkan output game dari direktori shard (mis. artefak CI) ke `dest`."""
+    plan = plan_merge(sources, entries)
+    for result in plan:
+        source = os.path.join(result.source, result.folder) if result.source else None
+        target = os.path.join(dest, result.folder)
+        if source and os.path.abspath(source) != os.path.abspath(target):
+            replace_folder(source, target)
+    return plan
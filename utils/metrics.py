@@ -0,0 +1,199 @@
+import json
+import os
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+
+# Tahap pipeline yang diukur, sesuai urutan tampil
+STAGES = ("wait", "fetch", "parse", "extract", "serialize", "write")
+COUNTERS = ("bytes", "rows", "codes")
+
+_END = object()
+
+
+@dataclass(slots=True)
+class Span:
+    """Satu pengukuran tahap untuk satu game (dan URL, jika relevan)."""
+
+    game: str
+    stage: str
+    url: str | None = None
+    started_at: float = 0.0
+    # Waktu milik tahap ini sendiri, tanpa span lain yang bersarang di dalamnya
+    seconds: float = 0.0
+    bytes: int = 0
+    rows: int = 0
+    codes: int = 0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["started_at"] = datetime.fromtimestamp(self.started_at, UTC).isoformat()
+        return data
+
+
+class Metrics:
+    """
+    Kolektor span per tahap (thread-safe).
+    Span boleh bersarang: waktu span anak dikurangkan dari induknya sehingga
+    total per tahap tidak saling tumpang tindih. Counter (bytes/rows/codes)
+    dari count() masuk ke span terdalam yang sedang berjalan di thread ini.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._spans: list[Span] = []
+
+    def _stack(self) -> list[list]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def _timing(self, span: Span):
+        """Tambahkan waktu blok ini ke span (dikurangi waktu span anak)."""
+        stack = self._stack()
+        frame = [span, 0.0]
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            span.seconds += elapsed - frame[1]
+            if stack:
+                stack[-1][1] += elapsed
+
+    def record(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+
+    @contextmanager
+    def span(self, game: str, stage: str, url: str | None = None) -> Iterator[Span]:
+        """Ukur satu blok kode sebagai satu span."""
+        span = Span(game, stage, url, started_at=time.time())
+        try:
+            with self._timing(span):
+                yield span
+        finally:
+            self.record(span)
+
+    def iterate(
+        self,
+        game: str,
+        stage: str,
+        iterable: Iterable,
+        url: str | None = None,
+        unit: str = "codes",
+    ) -> Iterator:
+        """
+        Bungkus iterator (generator kode, chunk body) sebagai satu span.
+        Hanya waktu untuk menghasilkan item yang dihitung, bukan waktu konsumen.
+        Setiap item menambah counter `unit` (untuk "bytes": sebesar len(item)).
+        """
+        span = Span(game, stage, url, started_at=time.time())
+        iterator = iter(iterable)
+        try:
+            while True:
+                with self._timing(span):
+                    item = next(iterator, _END)
+                if item is _END:
+                    break
+                if unit == "bytes":
+                    span.bytes += len(item)
+                else:
+                    setattr(span, unit, getattr(span, unit) + 1)
+                yield item
+        finally:
+            self.record(span)
+
+    def add(self, game: str, stage: str, seconds: float, url: str | None = None, **counts):
+        """
+        Catat tahap yang durasinya diukur sendiri (mis. serialisasi di dalam store).
+        Jika dipanggil di dalam span lain, durasinya dikurangkan dari span tersebut.
+        """
+        span = Span(game, stage, url, started_at=time.time() - seconds, seconds=seconds, **counts)
+        stack = self._stack()
+        if stack:
+            stack[-1][1] += seconds
+        self.record(span)
+
+    def count(self, **counts: int):
+        """Tambah counter ke span terdalam yang sedang aktif (diabaikan jika tidak ada)."""
+        stack = self._stack()
+        if not stack:
+            return
+        span = stack[-1][0]
+        for name, value in counts.items():
+            setattr(span, name, getattr(span, name) + value)
+
+    def spans(self) -> list[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+    def summary(self) -> dict[tuple[str, str], dict]:
+        """Total per (game, tahap): jumlah span, detik, bytes, rows, codes."""
+        totals: dict[tuple[str, str], dict] = {}
+        for span in self.spans():
+            total = totals.setdefault(
+                (span.game, span.stage),
+                {"spans": 0, "seconds": 0.0, "bytes": 0, "rows": 0, "codes": 0},
+            )
+            total["spans"] += 1
+            total["seconds"] += span.seconds
+            for name in COUNTERS:
+                total[name] += getattr(span, name)
+
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        return dict(sorted(totals.items(), key=lambda kv: (kv[0][0], order.get(kv[0][1], 99))))
+
+    def write_jsonl(self, path: str, run_id: str | None = None):
+        """Tambahkan semua span run ini ke file JSON lines (satu span per baris)."""
+        run_id = run_id or datetime.now(UTC).isoformat(timespec="seconds")
+        with open(path, "a", encoding="utf-8") as f:
+            for span in self.spans():
+                f.write(json.dumps({"run": run_id, **span.to_dict()}, ensure_ascii=False) + "\n")
+
+    def write_prometheus(self, path: str, prefix: str = "hoyo_code"):
+        """
+        Tulis total per tahap dalam format textfile Prometheus (node_exporter).
+        File ditulis ke .tmp lalu di-rename agar collector tidak membaca file setengah jadi.
+        """
+        summary = self.summary()
+        metrics = (
+            ("seconds", "gauge", "Durasi total tahap pada run terakhir (detik)."),
+            ("bytes", "gauge", "Bytes yang diproses tahap pada run terakhir."),
+            ("rows", "gauge", "Baris tabel yang diproses tahap pada run terakhir."),
+            ("codes", "gauge", "Kode yang dihasilkan tahap pada run terakhir."),
+            ("spans", "gauge", "Jumlah span tahap pada run terakhir."),
+        )
+
+        lines = []
+        for name, kind, help_text in metrics:
+            metric = f"{prefix}_stage_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for (game, stage), total in summary.items():
+                lines.append(f'{metric}{{game="{game}",stage="{stage}"}} {total[name]}')
+
+        lines.append(f"# HELP {prefix}_last_run_timestamp_seconds Waktu selesai run terakhir.")
+        lines.append(f"# TYPE {prefix}_last_run_timestamp_seconds gauge")
+        lines.append(f"{prefix}_last_run_timestamp_seconds {time.time():.3f}")
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+
+# Kolektor bersama untuk semua scraper
+metrics = Metrics()
@@ -1,16 +1,30 @@
-# utils/models.py
+import sys
+import threading
 from dataclasses import dataclass
+from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Reward:
     """Represents an in-game reward item."""
 
     name: str
     image: str
 
+    @classmethod
+    def intern(cls, name: str, image: str) -> "Reward":
+        """Return the shared instance for this reward from the global reward table."""
+        return REWARD_TABLE.get(name, image)
 
-@dataclass
+    def __reduce__(self):
+        # Unpickling (e.g. results from a parse worker process) re-interns the reward
+        return (Reward.intern, (self.name, self.image))
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "image": self.image}
+
+
+@dataclass(slots=True, frozen=True)
 class Duration:
     """Represents the validity period of a code."""
 
@@ -18,15 +32,110 @@ class Duration:
     valid: str | None = None
     expired: str | None = None
     notes: str | None = None
+    # Normalized, timezone-aware dates parsed from the text fields above
+    discovered_at: datetime | None = None
+    valid_until: datetime | None = None
+    expired_at: datetime | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "discovered": self.discovered,
+            "valid": self.valid,
+            "expired": self.expired,
+            "notes": self.notes,
+            "discovered_at": _isoformat(self.discovered_at),
+            "valid_until": _isoformat(self.valid_until),
+            "expired_at": _isoformat(self.expired_at),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Duration":
+        """Rebuild a Duration from its to_dict() form (ISO dates become datetimes)."""
+        return cls(
+            discovered=data.get("discovered"),
+            valid=data.get("valid"),
+            expired=data.get("expired"),
+            notes=data.get("notes"),
+            discovered_at=_fromisoformat(data.get("discovered_at")),
+            valid_until=_fromisoformat(data.get("valid_until")),
+            expired_at=_fromisoformat(data.get("expired_at")),
+        )
 
 
-@dataclass
+def _isoformat(value: datetime | None) -> str | None:
+    return None if value is None else value.isoformat()
+
+
+def _fromisoformat(value: str | None) -> datetime | None:
+    return None if value is None else datetime.fromisoformat(value)
+
+
+@dataclass(slots=True, frozen=True)
 class Code:
     """Represents a single promotional code."""
 
     code: str
     server: str
     status: str
-    rewards: list[Reward]
+    rewards: tuple[Reward, ...]
     duration: Duration
     link: str | None = None
+
+    def __post_init__(self):
+        # Rewards are stored as an immutable tuple shared by every code in a row
+        if not isinstance(self.rewards, tuple):
+            object.__setattr__(self, "rewards", tuple(self.rewards))
+
+    def to_dict(self) -> dict:
+        """Fast equivalent of dataclasses.asdict() (same keys, same order)."""
+        return {
+            "code": self.code,
+            "server": self.server,
+            "status": self.status,
+            "rewards": [r.to_dict() for r in self.rewards],
+            "duration": self.duration.to_dict(),
+            "link": self.link,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Code":
+        """Rebuild a Code from its to_dict() form, interning its rewards."""
+        return cls(
+            code=data["code"],
+            server=data["server"],
+            status=data["status"],
+            rewards=tuple(Reward.intern(r["name"], r["image"]) for r in data["rewards"]),
+            duration=Duration.from_dict(data["duration"]),
+            link=data.get("link"),
+        )
+
+
+class RewardTable:
+    """
+    Deduplicated reward table.
+    Names like "Primogem" or "Mora" repeat thousands of times across the history,
+    so each unique (name, image) pair is stored once with interned strings.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._items: dict[tuple[str, str], Reward] = {}
+
+    def get(self, name: str, image: str) -> Reward:
+        key = (name, image)
+        reward = self._items.get(key)
+        if reward is None:
+            with self._lock:
+                reward = self._items.setdefault(
+                    key, Reward(name=sys.intern(name), image=sys.intern(image))
+                )
+        return reward
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(list(self._items.values()))
+
+
+REWARD_TABLE = RewardTable()
@@ -0,0 +1,222 @@
+import json
+import os
+import queue
+import threading
+import time
+from collections.abc import Iterable
+
+import requests
+
+from .console import console
+from .games import LEGACY_KEYS
+from .models import Code
+from .rate_limit import parse_retry_after
+from .session import get_session
+
+STATE_FILE = os.path.join(".cache", "discord_sent.json")
+# 1 = state per key registry (sebelumnya per nama folder)
+STATE_VERSION = 1
+# Batas Discord: maksimal 10 embed per pesan webhook
+MAX_EMBEDS = 10
+MAX_ATTEMPTS = 5
+# Jeda singkat menunggu embed lain agar satu panggilan berisi sebanyak mungkin embed
+BATCH_LINGER = 0.5
+
+_STOP = object()
+
+
+def make_embed(code: Code, game_name: str, color: int) -> dict:
+    """Embed Discord untuk satu kode."""
+    rewards = "\n".join(f"- {r.name}" for r in code.rewards) if code.rewards else "N/A"
+    return {
+        "author": {"name": game_name},
+        "title": f"`{code.code}`",
+        "description": f"**Server:** {code.server}\n**Rewards:**\n{rewards}",
+        "color": color,
+        "footer": {"text": "Hoyo Code Scraper"},
+    }
+
+
+class DiscordNotifier:
+    """
+    Pengumuman kode aktif baru ke webhook Discord, di luar jalur scraping.
+    - Kode yang sudah pernah diumumkan disimpan per game di STATE_FILE,
+      sehingga tidak ada kode yang diumumkan dua kali (juga setelah --reset).
+    - Game yang belum punya state hanya dicatat tanpa diumumkan (run pertama).
+    - Embed dikirim oleh satu worker thread, hingga 10 embed per panggilan,
+      mengikuti header rate limit Discord dan retry pada 429/5xx.
+    """
+
+    def __init__(
+        self,
+        webhook_url: str,
+        state_path: str = STATE_FILE,
+        session: requests.Session | None = None,
+    ):
+        self.webhook_url = webhook_url
+        self.state_path = state_path
+        self.session = session or get_session()
+
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._sent = self._load()
+        # Sudah diantrekan tapi belum terkirim
+        self._pending: set[tuple[str, str]] = set()
+        # Bucket rate limit dari header respons terakhir
+        self._remaining: int | None = None
+        self._reset_at = 0.0
+
+        self.sent_count = 0
+        self.failed_count = 0
+
+    def _load(self) -> dict[str, set[str]]:
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == STATE_VERSION:
+                return {game: set(codes) for game, codes in data["games"].items()}
+            # Format lama: per nama folder (Star Rail = "honkai"), dipetakan ke key registry
+            return {LEGACY_KEYS.get(game, game): set(codes) for game, codes in data.items()}
+        except (OSError, ValueError, AttributeError, KeyError, TypeError):
+            return {}
+
+    def _save(self):
+        """Tulis state secara atomik (dipanggil dengan lock dipegang)."""
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            games = {game: sorted(codes) for game, codes in self._sent.items()}
+            json.dump({"version": STATE_VERSION, "games": games}, f, indent=1)
+        os.replace(tmp_path, self.state_path)
+
+    def submit(self, game: str, game_name: str, color: int, codes: Iterable[Code]) -> int:
+        """Antrekan kode aktif yang belum pernah diumumkan. Return jumlah yang diantrekan."""
+        queued = 0
+        with self._lock:
+            seeding = game not in self._sent
+            sent = self._sent.setdefault(game, set())
+
+            for code in codes:
+                key = (game, code.code)
+                if code.status != "active" or code.code in sent or key in self._pending:
+                    continue
+                if seeding:
+                    sent.add(code.code)
+                    continue
+                self._pending.add(key)
+                self._queue.put((key, make_embed(code, game_name, color)))
+                queued += 1
+
+            if seeding:
+                self._save()
+            if queued and self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="discord", daemon=True)
+                self._worker.start()
+
+        if seeding:
+            console.print(
+                f"[dim]📣 Discord: {len(sent)} kode aktif {game_name} dicatat "
+                f"tanpa diumumkan (run pertama).[/dim]"
+            )
+        return queued
+
+    def _run(self):
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + BATCH_LINGER
+            while len(batch) < MAX_EMBEDS:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._send(batch)
+
+    def _wait_for_bucket(self):
+        if self._remaining == 0:
+            delay = self._reset_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+    def _update_bucket(self, headers):
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        if remaining is not None and reset_after is not None:
+            try:
+                self._remaining = int(remaining)
+                self._reset_at = time.monotonic() + float(reset_after)
+            except ValueError:
+                self._remaining = None
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> float:
+        """Jeda dari body 429 Discord (retry_after), lalu header Retry-After."""
+        try:
+            return float(response.json()["retry_after"])
+        except (ValueError, KeyError, TypeError):
+            return parse_retry_after(response.headers.get("Retry-After")) or 1.0
+
+    def _send(self, batch: list[tuple[tuple[str, str], dict]]):
+        payload = {"embeds": [embed for _, embed in batch]}
+        keys = [key for key, _ in batch]
+
+        for attempt in range(MAX_ATTEMPTS):
+            self._wait_for_bucket()
+            try:
+                response = self.session.post(
+                    self.webhook_url, params={"wait": "true"}, json=payload, timeout=10
+                )
+            except requests.RequestException as e:
+                console.print(f"[yellow]⚠️ Discord: {e}[/yellow]")
+                time.sleep(2**attempt)
+                continue
+
+            self._update_bucket(response.headers)
+            if response.status_code == 429:
+                time.sleep(self._retry_after(response))
+                continue
+            if response.status_code >= 500:
+                time.sleep(2**attempt)
+                continue
+            if response.ok:
+                with self._lock:
+                    for game, code in keys:
+                        self._sent.setdefault(game, set()).add(code)
+                        self._pending.discard((game, code))
+                    self.sent_count += len(keys)
+                    self._save()
+                return
+
+            console.print(f"[red]❌ Discord menolak pesan (HTTP {response.status_code}).[/red]")
+            break
+
+        # Gagal: tidak dicatat sebagai terkirim, dicoba lagi pada run berikutnya
+        with self._lock:
+            self._pending.difference_update(keys)
+            self.failed_count += len(keys)
+
+    def close(self, timeout: float | None = 120):
+        """Tunggu semua antrean terkirim (dipanggil sekali di akhir run)."""
+        with self._lock:
+            worker = self._worker
+        if worker is None:
+            return
+        self._queue.put(_STOP)
+        worker.join(timeout)
+
+        if self.sent_count or self.failed_count:
+            console.print(
+                f"[cyan]📣 Discord: {self.sent_count} kode diumumkan"
+                + (f", {self.failed_count} gagal" if self.failed_count else "")
+                + ".[/cyan]"
+            )
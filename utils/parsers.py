@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import importlib.util
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+# bs4 baru di-import saat parsing agar perintah ringan (check, query, --help) tetap cepat
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup, Tag
+
+# Semua data kode berada di dalam div konten utama MediaWiki
+CONTENT_CLASS = "mw-parser-output"
+
+BACKENDS = ("auto", "html.parser", "lxml", "selectolax")
+
+
+def has_module(name: str) -> bool:
+    """Cek apakah paket opsional terpasang tanpa meng-import-nya."""
+    return importlib.util.find_spec(name) is not None
+
+
+def available_backends() -> list[str]:
+    """Daftar backend yang bisa dipakai di environment saat ini."""
+    backends = ["html.parser"]
+    if has_module("selectolax"):
+        backends.append("selectolax")
+    if has_module("lxml"):
+        backends.append("lxml")
+    return backends
+
+
+def resolve_backend(name: str = "auto") -> str:
+    """
+    Terjemahkan nama backend ke backend yang benar-benar tersedia.
+    'auto' memilih lxml > selectolax > html.parser (lxml + SoupStrainer paling
+    stabil; selectolax unggul jika div konten jauh lebih kecil dari halaman).
+    """
+    available = available_backends()
+    if name == "auto":
+        return available[-1]
+    if name not in available:
+        raise ValueError(f"Backend parser '{name}' tidak tersedia (pip install {name}).")
+    return name
+
+
+def _tree_builder() -> str:
+    """Tree builder BeautifulSoup tercepat yang tersedia."""
+    return "lxml" if has_module("lxml") else "html.parser"
+
+
+def _content_only(content: bytes) -> bytes:
+    """Potong halaman menjadi HTML div konten saja memakai selectolax (parser C)."""
+    from selectolax.lexbor import LexborHTMLParser
+
+    node = LexborHTMLParser(content).css_first(f"div.{CONTENT_CLASS}")
+    return node.html.encode("utf-8") if node else b""
+
+
+def parse_html(content: bytes, backend: str = "html.parser", scoped: bool = True) -> BeautifulSoup:
+    """
+    Bangun BeautifulSoup dari konten halaman.
+    - html.parser / lxml: tree builder BeautifulSoup. Jika `scoped`, hanya
+      div.mw-parser-output yang dibangun (SoupStrainer), navigasi, script,
+      dan sidebar dilewati.
+    - selectolax: div konten dipotong dulu dengan selectolax, lalu hanya
+      potongan itu yang dibangun menjadi BeautifulSoup.
+    Hasilnya tetap objek BeautifulSoup, jadi logika _parse_table/scrape
+    tidak perlu diubah.
+    """
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    if backend == "selectolax":
+        if scoped:
+            return BeautifulSoup(_content_only(content), _tree_builder())
+        backend = _tree_builder()
+
+    if scoped:
+        strainer = SoupStrainer("div", class_=CONTENT_CLASS)
+        return BeautifulSoup(content, backend, parse_only=strainer)
+
+    return BeautifulSoup(content, backend)
+
+
+def soup_table_rows(
+    soup: BeautifulSoup | None, all_tables: bool = False
+) -> Iterator[tuple[int, Tag]]:
+    """
+    (indeks tabel, <tr>) dari table.wikitable di div konten, termasuk baris header.
+    Hanya tabel pertama, kecuali `all_tables` (padanan streaming.iter_table_rows).
+    """
+    content = soup.find("div", class_=CONTENT_CLASS) if soup else None
+    if not content:
+        return
+    if all_tables:
+        tables = content.find_all("table", class_="wikitable")
+    else:
+        tables = [t for t in [content.find("table", class_="wikitable")] if t]
+    for index, table in enumerate(tables):
+        for row in table.find_all("tr"):
+            yield index, row
@@ -0,0 +1,63 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .extract import TableExtractor, TableSpec
+from .models import Code
+from .parsers import CONTENT_CLASS, parse_html, soup_table_rows
+
+# Extractor per TableSpec di setiap proses worker (dibuat sekali per proses)
+_extractors: dict[TableSpec, TableExtractor] = {}
+
+
+def make_pool(workers: int = -1, backend: str = "html.parser") -> ProcessPoolExecutor:
+    """
+    Process pool untuk parsing & ekstraksi (-1 = jumlah core), backend parser
+    `backend` sudah dimuat di setiap worker.
+    Memakai 'spawn' karena proses utama sudah menjalankan thread fetch,
+    dan fork dari proses multi-thread rawan deadlock.
+    """
+    if workers < 1:
+        workers = os.cpu_count() or 1
+    pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+    # Worker dinyalakan (import bs4 & backend parser) sekarang, bersamaan dengan fetch halaman
+    for _ in range(workers):
+        pool.submit(_warm_up, backend)
+    return pool
+
+
+def _warm_up(backend: str):
+    """
+    Muat bs4 & backend parser di worker. parse_html meng-import keduanya secara
+    lazy, jadi dokumen kecil diparse sekali agar biaya import (bs4, lxml,
+    selectolax) tidak jatuh ke halaman pertama.
+    """
+    parse_html(f'<div class="{CONTENT_CLASS}"></div>'.encode(), backend)
+
+
+def extract_page(
+    content: bytes,
+    table: TableSpec,
+    statuses: tuple[str, ...],
+    all_tables: bool,
+    backend: str,
+    scoped: bool,
+) -> tuple[list[Code], float, int, int]:
+    """
+    Dijalankan di proses worker: parse HTML lalu ekstraksi kode dari tabelnya.
+    Hanya list Code yang dikirim balik (Reward & Duration yang sama di-pickle sekali),
+    plus (detik parsing, bytes, baris data) untuk instrumentasi di proses utama.
+    """
+    start = time.perf_counter()
+    soup = parse_html(content, backend, scoped=scoped)
+    parse_seconds = time.perf_counter() - start
+
+    extractor = _extractors.get(table)
+    if extractor is None:
+        extractor = _extractors[table] = TableExtractor(table)
+
+    rows = list(soup_table_rows(soup, all_tables))
+    tables = len({index for index, _ in rows})
+    codes = list(extractor.extract(rows, statuses))
+    return codes, parse_seconds, len(content), len(rows) - tables
@@ -0,0 +1,107 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """Token bucket sederhana: `rate` token per detik dengan kapasitas `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        # Waktu (monotonic) sebelum request berikutnya boleh dikirim
+        self.blocked_until = 0.0
+        # Pengali backoff adaptif, naik saat kena 429/403 dan turun saat sukses
+        self.penalty = 1.0
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate / self.penalty)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Ambil satu token, return lama waktu tunggu (0 jika masih dalam kuota)."""
+        now = time.monotonic()
+        self._refill(now)
+        wait = max(0.0, self.blocked_until - now)
+
+        self.tokens -= 1
+        if self.tokens < 0:
+            wait = max(wait, -self.tokens * self.penalty / self.rate)
+        return wait
+
+
+class HostRateLimiter:
+    """
+    Rate limiter per host berbasis token bucket.
+    Tidak menambah delay selama request masih di bawah kuota, dan
+    melambat secara adaptif ketika server membalas 429/403 atau Retry-After.
+    """
+
+    def __init__(self, rate: float = 1.0, burst: int = 4, max_penalty: float = 16.0):
+        if not rate > 0:
+            raise ValueError(f"rate harus lebih dari 0 (didapat {rate})")
+        if burst < 1:
+            raise ValueError(f"burst minimal 1 (didapat {burst})")
+        self.rate = rate
+        self.burst = burst
+        self.max_penalty = max_penalty
+        self._lock = threading.Lock()
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return self._buckets[host]
+
+    def acquire(self, url: str) -> float:
+        """Tunggu sampai host boleh di-request. Return lama waktu tunggu (detik)."""
+        with self._lock:
+            wait = self._bucket(url).reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def feedback(self, url: str, status_code: int, headers=None) -> float | None:
+        """
+        Update status bucket berdasarkan respons.
+        Return jeda (detik) yang diminta server jika terkena rate limit.
+        """
+        with self._lock:
+            bucket = self._bucket(url)
+
+            if status_code not in (429, 403):
+                # Sukses: pulihkan kecepatan perlahan
+                bucket.penalty = max(1.0, bucket.penalty / 2)
+                return None
+
+            bucket.penalty = min(self.max_penalty, bucket.penalty * 2)
+            delay = parse_retry_after((headers or {}).get("Retry-After"))
+            if delay is None:
+                # Tanpa Retry-After: kosongkan bucket dan mundur sesuai penalty
+                delay = bucket.penalty / self.rate
+                bucket.tokens = min(bucket.tokens, 1.0)
+            bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + delay)
+            return delay
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Header Retry-After bisa berupa jumlah detik atau tanggal HTTP."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+# Rate limiter bersama untuk semua scraper
+rate_limiter = HostRateLimiter()
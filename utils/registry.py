@@ -0,0 +1,146 @@
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from functools import cache
+
+from .console import console
+from .games import GAMES, GameSpec
+
+# Grup entry point untuk scraper tambahan dari paket lain, mis. di pyproject.toml:
+#   [project.entry-points."hoyo_code.scrapers"]
+#   wuwa = "hoyo_wuwa:GAME"           # GameSpec (deklaratif)
+#   custom = "hoyo_custom:MyScraper"  # subclass ScraperBase tanpa argumen
+ENTRY_POINT_GROUP = "hoyo_code.scrapers"
+
+
+@dataclass(frozen=True)
+class ScraperEntry:
+    """Satu scraper terdaftar: key CLI, pembuat instance, dan GameSpec jika deklaratif."""
+
+    key: str
+    factory: Callable[[], object]
+    # None untuk subclass ScraperBase kustom (tidak bisa dipakai check/watch)
+    spec: GameSpec | None = None
+    source: str = "builtin"
+
+    @property
+    def default(self) -> bool:
+        """Ikut dijalankan tanpa --game; scraper kustom & plugin selalu ikut."""
+        return self.spec.default if self.spec else True
+
+    @property
+    def weight(self) -> int:
+        """Perkiraan beban untuk pembagian shard: jumlah halaman."""
+        return len(self.spec.pages) if self.spec else 1
+
+    def create(self):
+        """Instance scraper; game_key = key registry (DB, metrics & notifikasi memakainya)."""
+        scraper = self.factory()
+        scraper.game_key = self.key
+        return scraper
+
+    def folder(self) -> str:
+        """Folder output; scraper kustom dibuat dulu untuk membacanya."""
+        return self.spec.folder if self.spec else self.create().game_folder
+
+
+def _warn(message: str):
+    console.print(f"[yellow]⚠️ {message}[/yellow]")
+
+
+def _game_scraper(spec: GameSpec):
+    # Import di sini agar registry tetap ringan (tanpa requests/bs4)
+    from .game_scraper import GameScraper
+
+    return GameScraper(spec)
+
+
+def _spec_entry(key: str, spec: GameSpec, source: str = "builtin") -> ScraperEntry:
+    return ScraperEntry(key, lambda: _game_scraper(spec), spec, source)
+
+
+def _plugin_entry(entry_point) -> ScraperEntry | None:
+    from .scraper_base import ScraperBase
+
+    target = entry_point.load()
+    source = entry_point.value
+    if isinstance(target, GameSpec):
+        return _spec_entry(entry_point.name, target, source)
+    if isinstance(target, type) and issubclass(target, ScraperBase):
+        return ScraperEntry(entry_point.name, target, None, source)
+    _warn(f"Entry point {source} bukan GameSpec/ScraperBase, dilewati.")
+    return None
+
+
+@cache
+def load_registry() -> dict[str, ScraperEntry]:
+    """
+    Semua scraper: game bawaan (utils.games) lalu plugin dari entry point,
+    diurutkan per nama. Plugin dengan key yang sudah dipakai dilewati.
+    """
+    from importlib.metadata import entry_points
+
+    registry = {key: _spec_entry(key, spec) for key, spec in GAMES.items()}
+    for entry_point in sorted(entry_points(group=ENTRY_POINT_GROUP), key=lambda ep: ep.name):
+        if entry_point.name in registry:
+            _warn(f"Scraper {entry_point.name} sudah terdaftar, {entry_point.value} dilewati.")
+            continue
+        try:
+            entry = _plugin_entry(entry_point)
+        except Exception as e:
+            _warn(f"Gagal memuat entry point {entry_point.value}: {e}")
+            continue
+        if entry:
+            registry[entry.key] = entry
+    return registry
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """`i/n` (1-based) -> (i, n)."""
+    index, _, count = value.partition("/")
+    if not (index.isdigit() and count.isdigit()) or not 1 <= int(index) <= int(count):
+        raise ValueError(f"Shard tidak valid: {value} (contoh: 1/3)")
+    return int(index), int(count)
+
+
+def assign_shards(entries: Iterable[ScraperEntry], count: int) -> list[list[ScraperEntry]]:
+    """
+    Bagi scraper ke `count` shard secara deterministik: yang terberat (halaman
+    terbanyak) lebih dulu, selalu ke shard dengan beban terkecil. Semua mesin
+    dengan registry yang sama mendapat pembagian yang sama.
+    """
+    entries = list(entries)
+    shards: list[list[ScraperEntry]] = [[] for _ in range(count)]
+    loads = [0] * count
+    order = sorted(range(len(entries)), key=lambda i: (-entries[i].weight, i))
+    for i in order:
+        target = loads.index(min(loads))
+        shards[target].append(entries[i])
+        loads[target] += entries[i].weight
+    # Urutan dalam shard mengikuti urutan registry
+    return [sorted(shard, key=entries.index) for shard in shards]
+
+
+def select(
+    games: Iterable[str] | None = None,
+    shard: tuple[int, int] | None = None,
+    registry: dict[str, ScraperEntry] | None = None,
+) -> list[ScraperEntry]:
+    """
+    Scraper yang dijalankan: filter `games` (None = semua entri default, game
+    opt-in hanya lewat `games`), lalu ambil bagian shard.
+    """
+    registry = load_registry() if registry is None else registry
+    if games:
+        unknown = [key for key in games if key not in registry]
+        if unknown:
+            raise ValueError(
+                f"Game tidak dikenal: {', '.join(unknown)} (pilihan: {', '.join(registry)})"
+            )
+        entries = [registry[key] for key in dict.fromkeys(games)]
+    else:
+        entries = [entry for entry in registry.values() if entry.default]
+
+    if shard:
+        index, count = shard
+        entries = assign_shards(entries, count)[index - 1]
+    return entries
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from .models import Code
+
+ROW_CACHE_FILE = os.path.join(".cache", "rows.json")
+# Batas jumlah baris tersimpan; baris yang paling lama tidak dipakai dibuang lebih dulu
+MAX_ROWS = 20_000
+# Modul yang menentukan hasil ekstraksi; isinya ikut di-hash sehingga cache
+# dari versi kode lain otomatis diabaikan
+EXTRACTION_MODULES = ("extract.py", "wikitext.py", "duration.py", "models.py")
+
+
+def extraction_version() -> str:
+    """Hash sumber modul ekstraksi, disimpan bersama cache."""
+    digest = hashlib.blake2b(digest_size=8)
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in EXTRACTION_MODULES:
+        try:
+            with open(os.path.join(directory, name), "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(name.encode())
+    return digest.hexdigest()
+
+
+def row_key(scope: str, fingerprint: str) -> str:
+    return hashlib.blake2b(f"{scope}\x1e{fingerprint}".encode(), digest_size=16).hexdigest()
+
+
+class RowCache:
+    """
+    Kode hasil ekstraksi per baris tabel. Key-nya hash isi mentah baris plus
+    `scope` (spec, layout kolom & status tabel), jadi baris riwayat yang tidak
+    berubah tidak diekstrak ulang dan biaya CPU per run mengikuti jumlah baris
+    baru/berubah. LRU dengan batas `max_rows`, disimpan ke ROW_CACHE_FILE.
+    File baru dibaca saat cache pertama kali dipakai, dan kode dari file baru
+    dibangun ulang saat barisnya benar-benar diminta.
+    """
+
+    def __init__(self, path: str = ROW_CACHE_FILE, max_rows: int = MAX_ROWS):
+        self.path = path
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        # key -> tuple Code, atau list dict (to_dict) yang belum dibangun ulang dari file
+        self._rows: OrderedDict[str, tuple[Code, ...] | list[dict]] | None = None
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self) -> OrderedDict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != extraction_version():
+                return OrderedDict()
+            rows = OrderedDict(data["rows"])
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return OrderedDict()
+        while len(rows) > self.max_rows:
+            rows.popitem(last=False)
+        return rows
+
+    def _entries(self) -> OrderedDict:
+        if self._rows is None:
+            self._rows = self._load()
+        return self._rows
+
+    def get(self, scope: str, fingerprint: str) -> tuple[Code, ...] | None:
+        """Kode untuk baris ini jika sudah pernah diekstrak, selain itu None."""
+        key = row_key(scope, fingerprint)
+        with self._lock:
+            rows = self._entries()
+            codes = rows.get(key)
+            if codes is None:
+                self.misses += 1
+                return None
+            if isinstance(codes, list):
+                codes = rows[key] = tuple(Code.from_dict(data) for data in codes)
+            rows.move_to_end(key)
+            self.hits += 1
+            self._dirty = True
+            return codes
+
+    def put(self, scope: str, fingerprint: str, codes: Iterable[Code]):
+        key = row_key(scope, fingerprint)
+        with self._lock:
+            rows = self._entries()
+            rows[key] = tuple(codes)
+            rows.move_to_end(key)
+            while len(rows) > self.max_rows:
+                rows.popitem(last=False)
+            self._dirty = True
+
+    def stats(self) -> tuple[int, int]:
+        """(hit, miss) sejak reset_stats() terakhir."""
+        return self.hits, self.misses
+
+    def reset_stats(self):
+        self.hits = self.misses = 0
+
+    def save(self):
+        """Tulis cache ke disk (atomik) jika ada perubahan sejak dimuat."""
+        with self._lock:
+            if not self._dirty or self._rows is None:
+                return
+            rows = {
+                key: codes if isinstance(codes, list) else [code.to_dict() for code in codes]
+                for key, codes in self._rows.items()
+            }
+            self._dirty = False
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": extraction_version(), "rows": rows}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Kosongkan cache (dipakai saat --reset)."""
+        with self._lock:
+            self._rows = OrderedDict()
+            self._dirty = False
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+# Cache baris bersama untuk semua scraper
+row_cache = RowCache()
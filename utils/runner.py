@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from .scraper_base import ScraperBase
+
+MODES = ("linear", "thread", "async")
+
+
+class HostLimiter:
+    """Membatasi jumlah request yang berjalan bersamaan untuk setiap host."""
+
+    def __init__(self, max_per_host: int):
+        self.max_per_host = max(1, max_per_host)
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+
+    def _semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._semaphores[host]
+
+    @contextmanager
+    def slot(self, url: str):
+        """Tahan satu slot koneksi untuk host dari URL selama blok berjalan."""
+        semaphore = self._semaphore(urlsplit(url).netloc)
+        with semaphore:
+            yield
+
+
+def _run_safely(scraper: ScraperBase):
+    """Jalankan scrape() tanpa menghentikan game lain jika terjadi error."""
+    try:
+        scraper.scrape()
+    except Exception as e:
+        scraper.log(f"❌ Scraper gagal: {e}", style="bold red")
+
+
+def _attach(scrapers: list[ScraperBase], executor: ThreadPoolExecutor, limiter: HostLimiter):
+    for scraper in scrapers:
+        scraper.fetch_executor = executor
+        scraper.host_limiter = limiter
+
+
+def _detach(scrapers: list[ScraperBase]):
+    for scraper in scrapers:
+        scraper.fetch_executor = None
+        scraper.host_limiter = None
+
+
+def run_linear(scrapers: Iterable[ScraperBase]):
+    """Eksekusi linear (satu per satu), perilaku bawaan."""
+    for scraper in scrapers:
+        scraper.scrape()
+
+
+def run_threaded(scrapers: Iterable[ScraperBase], max_per_host: int = 2):
+    """
+    Jalankan semua scraper di thread pool.
+    Setiap game mendapat thread sendiri, sedangkan halaman di dalam satu game
+    (mis. active + history Genshin) diambil paralel lewat pool fetch terpisah
+    agar thread game tidak saling menunggu slot.
+    """
+    scrapers = list(scrapers)
+    if not scrapers:
+        return
+
+    limiter = HostLimiter(max_per_host)
+    with (
+        ThreadPoolExecutor(len(scrapers), thread_name_prefix="game") as game_pool,
+        ThreadPoolExecutor(thread_name_prefix="fetch") as fetch_pool,
+    ):
+        _attach(scrapers, fetch_pool, limiter)
+        try:
+            for future in [game_pool.submit(_run_safely, s) for s in scrapers]:
+                future.result()
+        finally:
+            _detach(scrapers)
+
+
+async def _gather(scrapers: list[ScraperBase]):
+    import asyncio
+
+    await asyncio.gather(*(asyncio.to_thread(_run_safely, s) for s in scrapers))
+
+
+def run_async(scrapers: Iterable[ScraperBase], max_per_host: int = 2):
+    """
+    Jalankan semua scraper lewat event loop asyncio.
+    `requests` bersifat blocking, jadi setiap scrape() dijalankan dengan
+    asyncio.to_thread dan fetch halaman tetap memakai pool thread.
+    """
+    import asyncio
+
+    scrapers = list(scrapers)
+    if not scrapers:
+        return
+
+    limiter = HostLimiter(max_per_host)
+    with ThreadPoolExecutor(thread_name_prefix="fetch") as fetch_pool:
+        _attach(scrapers, fetch_pool, limiter)
+        try:
+            asyncio.run(_gather(scrapers))
+        finally:
+            _detach(scrapers)
+
+
+def run(scrapers: Iterable[ScraperBase], mode: str = "linear", max_per_host: int = 2):
+    """Dispatcher sesuai mode eksekusi dari CLI."""
+    if mode == "thread":
+        run_threaded(scrapers, max_per_host)
+    elif mode == "async":
+        run_async(scrapers, max_per_host)
+    else:
+        run_linear(scrapers)
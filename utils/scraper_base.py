@@ -1,28 +1,84 @@
 # utils/scraper_base.py
-import json
 import os
-import time
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Executor
+from contextlib import ExitStack
+from functools import partial
+from itertools import chain
 
 import requests
-from bs4 import BeautifulSoup
-from rich.console import Console
+from bs4 import BeautifulSoup, Tag
 
+from .console import console
+from .http_cache import CHUNK_SIZE, Page, response_cache
+from .metrics import metrics
 from .models import Code
+from .parsers import parse_html, resolve_backend, soup_table_rows
+from .rate_limit import rate_limiter
+from .row_cache import row_cache
+from .session import get_session
+from .sources import first_success, source_stats
+from .store import IncrementalStore
+from .streaming import iter_table_rows
 
-# Inisialisasi Rich Console
-console = Console()
+# Batas retry saat terkena rate limit (429/403) dan jeda Retry-After yang masih ditunggu
+MAX_RATE_LIMIT_RETRIES = 2
+MAX_RETRY_AFTER = 60
 
 
 class ScraperBase(ABC):
-    def __init__(self, game_name: str, game_color: str):
+    def __init__(
+        self,
+        game_name: str,
+        game_color: str,
+        session: requests.Session | None = None,
+        folder: str | None = None,
+    ):
         self.game_name = game_name
         self.game_color = game_color
-        self.game_folder = game_name.split()[0].lower()
-        self.discord_webhook_url = os.getenv("DISCORD_WEBHOOK_URL")
+        self.game_folder = folder or game_name.split()[0].lower()
+        # Identitas game untuk DB, metrics & notifikasi: key registry (diisi saat
+        # dibuat lewat registry), folder hanya dipakai untuk path file output
+        self.game_key = self.game_folder
+        # Notifikasi kode aktif baru (utils.notify.DiscordNotifier, None = nonaktif)
+        self.notifier = None
+        self.discord_color = 0
+
+        # Session HTTP bersama (keep-alive & pooling), bisa diinject
+        self.session = session or get_session()
+
+        # Rate limiter token bucket per host (None = tanpa pembatasan)
+        self.rate_limiter = rate_limiter
+
+        # Diisi oleh utils.runner pada mode paralel (thread/async)
+        self.fetch_executor: Executor | None = None
+        self.host_limiter = None
+
+        # Backend parser HTML & apakah hanya div konten yang diparse
+        self.parser_backend = resolve_backend("auto")
+        self.scoped_parse = True
+        # Parsing & penulisan bertahap baris demi baris (butuh lxml)
+        self.stream = False
+        # Process pool untuk parsing & ekstraksi (utils.procpool, None = di thread ini)
+        self.parse_pool = None
+
+        # Latensi & kesehatan per URL sumber untuk mirror/hedge (utils.sources)
+        self.sources = source_stats
+
+        # Cache conditional request (None = selalu unduh ulang)
+        self.cache = response_cache
+        self._fetched_urls: list[str] = []
+        # Kode hasil ekstraksi per baris tabel (utils.row_cache, None = selalu ekstraksi penuh)
+        self.row_cache = row_cache
 
         # Buat folder jika belum ada
         os.makedirs(self.game_folder, exist_ok=True)
+        self.store = IncrementalStore(self.game_folder)
+        # Backend SQLite opsional (utils.db.CodeDB)
+        self.db = None
+        # Kolektor span per tahap (wait/fetch/parse/extract/serialize/write)
+        self.metrics = metrics
 
     def log(self, message: str, style: str = "white"):
         """Helper untuk logging dengan warna spesifik game."""
@@ -30,25 +86,98 @@ class ScraperBase(ABC):
             f"[{self.game_color}][{self.game_name}][/{self.game_color}] {message}", style=style
         )
 
-    def get_soup(self, url: str) -> BeautifulSoup | None:
+    def span(self, stage: str, url: str | None = None):
+        """Context manager pengukur satu tahap untuk game ini (lihat utils.metrics)."""
+        return self.metrics.span(self.game_key, stage, url)
+
+    def timed(self, stage: str, iterable: Iterable, url: str | None = None, unit: str = "codes"):
+        """Bungkus iterator sebagai span; setiap item menambah counter `unit`."""
+        return self.metrics.iterate(self.game_key, stage, iterable, url, unit)
+
+    def _request(
+        self, url: str, headers: dict | None = None, stream: bool = False
+    ) -> requests.Response:
+        """GET lewat rate limiter per host, diulang jika server membalas 429/403."""
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            with ExitStack() as stack:
+                # Jeda rate limiter + antre slot koneksi host dihitung sebagai "wait"
+                with self.span("wait", url):
+                    if self.rate_limiter:
+                        self.rate_limiter.acquire(url)
+                    if self.host_limiter:
+                        stack.enter_context(self.host_limiter.slot(url))
+
+                with self.span("fetch", url) as span:
+                    response = self.session.get(url, headers=headers, timeout=20, stream=stream)
+                    if not stream:
+                        span.bytes = len(response.content)
+
+            if not self.rate_limiter:
+                break
+            delay = self.rate_limiter.feedback(url, response.status_code, response.headers)
+            if delay is None or attempt == MAX_RATE_LIMIT_RETRIES or delay > MAX_RETRY_AFTER:
+                break
+            self.log(
+                f"⏳ Terkena rate limit ({response.status_code}), "
+                f"coba lagi dalam {delay:.1f} detik...",
+                style="yellow",
+            )
+
+        return response
+
+    def fetch(self, url: str, track: bool = True) -> Page | None:
         """
-        Alur: Request (requests.get) -> Tunggu -> Parse
+        Alur: Conditional Request (session.get + rate limiter) -> Page
+        Jika server membalas 304, body diambil dari cache dan Page.changed = False.
+        Pada mode streaming, body tidak diunduh sekaligus melainkan dibaca
+        bertahap oleh konsumen lewat Page.iter_chunks().
+        `track` False: URL tidak dicatat untuk commit cache (dicatat oleh fetch_any).
         """
         self.log(f"Mengambil data dari: [dim]{url}[/dim]")
 
         try:
-            # Request POLOS tanpa headers custom
-            response = requests.get(url, timeout=20)
+            # Request lewat session bersama, ditambah header conditional dari cache
+            headers = self.cache.conditional_headers(url) if self.cache else {}
+            response = self._request(url, headers=headers, stream=self.stream)
+            self.sources.record(
+                url, response.elapsed.total_seconds(), response.status_code in (200, 304)
+            )
+
+            if response.status_code == 304 and self.cache:
+                if self.stream:
+                    self.log("♻️ Halaman tidak berubah (304 Not Modified).", style="dim green")
+                    body_stream = self.cache.iter_body(url)
+                    return Page(url=url, content=None, changed=False, stream=body_stream)
+
+                body = self.cache.body(url)
+                if body is not None:
+                    self.log("♻️ Halaman tidak berubah (304 Not Modified).", style="dim green")
+                    return Page(url=url, content=body, changed=False)
+
+                # Body cache hilang, ulangi tanpa header conditional
+                response = self._request(url, stream=self.stream)
 
             if response.status_code == 200:
-                self.log("✅ Koneksi berhasil (200 OK). Menunggu halaman termuat...", style="green")
+                self.log("✅ Koneksi berhasil (200 OK).", style="green")
+
+                if self.stream:
+                    chunks = response.iter_content(chunk_size=CHUNK_SIZE)
+                    if self.cache:
+                        chunks = self.cache.store_stream(url, chunks, response.headers)
+                        if track:
+                            self._fetched_urls.append(url)
+                    # Body diunduh saat dikonsumsi, waktunya tetap tercatat sebagai "fetch"
+                    chunks = self.timed("fetch", chunks, url, unit="bytes")
+                    # Hash baru diketahui setelah body habis, jadi dianggap berubah
+                    return Page(url=url, content=None, changed=True, stream=chunks)
 
-                # 1. Tunggu sejenak agar halaman 'settle' dan terlihat natural
-                time.sleep(3)
+                changed = True
+                if self.cache:
+                    changed = self.cache.store(url, response.content, response.headers)
+                    if track:
+                        self._fetched_urls.append(url)
 
-                # 2. Parse dengan BeautifulSoup
-                soup = BeautifulSoup(response.content, "html.parser")
-                return soup
+                return Page(url=url, content=response.content, changed=changed)
 
             elif response.status_code == 403:
                 self.log("❌ Akses Ditolak (403 Forbidden).", style="bold red")
@@ -56,66 +185,215 @@ class ScraperBase(ABC):
                 self.log(f"⚠️ Gagal memuat halaman. Status: {response.status_code}", style="yellow")
 
         except Exception as e:
+            self.sources.record(url, None, False)
             self.log(f"❌ Error koneksi: {e}", style="bold red")
 
         return None
 
-    def _send_discord_notification(self, code: Code):
-        """Mengirim notifikasi ke Discord (Opsional)."""
-        if not self.discord_webhook_url:
+    def fetch_any(self, urls: Sequence[str]) -> Page | None:
+        """
+        Satu halaman dari beberapa sumber berisi tabel yang sama (mirror).
+        Sumber sehat tercepat diminta lebih dulu; jika gagal, sumber berikutnya
+        langsung dicoba, dan jika lambat, sumber berikutnya ikut diminta (hedge)
+        lalu jawaban pertama yang dipakai (hasil sumber tidak digabung).
+        Mode streaming hanya memakai fallback.
+        Hanya sumber pemenang yang dicatat untuk commit cache; entri cache dari
+        request yang kalah dibuang begitu request itu selesai.
+        """
+        if len(urls) == 1:
+            return self.fetch(urls[0])
+
+        url, page = first_success(
+            partial(self.fetch, track=False),
+            list(urls),
+            self.sources,
+            hedge=not self.stream,
+            discard=self._discard_fetch,
+        )
+        if page is not None and self.cache:
+            self._fetched_urls.append(url)
+        if page is None:
+            self.log("❌ Semua sumber gagal.", style="bold red")
+        elif url != urls[0]:
+            self.log(f"🪞 Memakai sumber alternatif: [dim]{url}[/dim]", style="dim")
+        return page
+
+    def _discard_fetch(self, url: str, page: Page):
+        """Hasil request hedge yang kalah: entri cache pending-nya tidak boleh ikut di-commit."""
+        if self.cache:
+            self.cache.discard(url)
+
+    def _fetch_item(self, item: str | Sequence[str]) -> Page | None:
+        return self.fetch(item) if isinstance(item, str) else self.fetch_any(item)
+
+    def fetch_pages(self, urls: list[str | Sequence[str]]) -> list[Page | None]:
+        """
+        Ambil beberapa halaman sekaligus, paralel jika executor tersedia.
+        Setiap item berupa URL, atau daftar URL sumber untuk satu halaman (fetch_any).
+        """
+        if self.fetch_executor is None or len(urls) < 2:
+            return [self._fetch_item(item) for item in urls]
+        return list(self.fetch_executor.map(self._fetch_item, urls))
+
+    def make_soup(self, page: Page | None) -> BeautifulSoup | None:
+        """Parse konten halaman dengan backend parser yang dipilih."""
+        if page is None:
+            return None
+        content = page.content if page.content is not None else b"".join(page.iter_chunks())
+        with self.span("parse", page.url) as span:
+            span.bytes = len(content)
+            return parse_html(content, self.parser_backend, scoped=self.scoped_parse)
+
+    def get_soup(self, url: str) -> BeautifulSoup | None:
+        """
+        Alur: Request (session.get) -> Tunggu -> Parse
+        """
+        return self.make_soup(self.fetch(url))
+
+    def get_soups(self, urls: list[str]) -> list[BeautifulSoup | None]:
+        """Ambil & parse beberapa halaman sekaligus."""
+        return [self.make_soup(page) for page in self.fetch_pages(urls)]
+
+    def iter_tables(self, page: Page | None, all_tables: bool = False) -> Iterator[tuple[int, Tag]]:
+        """
+        (indeks tabel, <tr>) untuk setiap baris, termasuk header, dari table.wikitable
+        di div konten (hanya tabel pertama, kecuali `all_tables`).
+        Mode streaming: diparse bertahap dari body, memori tetap datar.
+        Mode biasa: dari BeautifulSoup halaman penuh.
+        """
+        if page is None:
             return
 
-        # Konversi warna string ke int (jika perlu)
-        color_int = 0
-        if self.game_color == "blue":
-            color_int = 0x1E90FF  # Genshin
-        elif self.game_color == "magenta":
-            color_int = 0x8A2BE2  # Starrail
-        elif self.game_color == "cyan":
-            color_int = 0x00BFFF  # Honkai
-
-        embed = {
-            "title": f"`{code.code}`",
-            "description": f"**Server:** {code.server}\n**Rewards:**\n"
-            + ("\n".join([f"- {r.name}" for r in code.rewards]) if code.rewards else "N/A"),
-            "color": color_int,
-            "footer": {"text": "Hoyo Code Scraper"},
-        }
+        if self.stream:
+            rows = iter_table_rows(page.iter_chunks(), all_tables=all_tables)
+        else:
+            rows = soup_table_rows(self.make_soup(page), all_tables)
+
+        current = None
+        for index, row in rows:
+            # Baris pertama tiap tabel adalah header, sisanya dihitung sebagai baris data
+            if index == current:
+                self.metrics.count(rows=1)
+            current = index
+            yield index, row
+
+    def is_unchanged(self, pages: list[Page | None]) -> bool:
+        """
+        True jika semua halaman identik dengan run sebelumnya (304 / hash sama)
+        dan file output masih ada, sehingga parsing & penulisan bisa dilewati.
+        """
+        if not pages or any(page is None or page.changed for page in pages):
+            return False
+        if not os.path.exists(os.path.join(self.game_folder, "all.json")):
+            return False
 
+        self.log("⏭️ Tidak ada perubahan sejak run sebelumnya, lewati parsing.", style="dim")
+        self._commit_cache(self._take_fetched())
+        return True
+
+    def _take_fetched(self) -> list[str]:
+        urls, self._fetched_urls = self._fetched_urls, []
+        return urls
+
+    def _discard_fetched(self):
+        """Buang entri cache pending halaman yang sudah diambil (run dibatalkan)."""
+        for url in self._take_fetched():
+            if self.cache:
+                self.cache.discard(url)
+
+    def _commit_cache(self, urls: list[str]):
+        """Tandai halaman yang sudah diambil sebagai 'sudah diproses' di cache."""
+        if self.cache:
+            self.cache.commit(urls)
+
+    def _published(self, urls: list[str]) -> Callable[[float], None]:
+        """Callback store: catat waktu fsync & swap, lalu commit cache HTTP halaman ini."""
+
+        def published(seconds: float):
+            self.metrics.add(self.game_key, "write", seconds)
+            self._commit_cache(urls)
+
+        return published
+
+    def wait_saved(self) -> bool:
+        """Tunggu output terakhir terpasang di disk (store berjalan di background)."""
         try:
-            requests.post(self.discord_webhook_url, json={"embeds": [embed]}, timeout=10)
-        except Exception:
-            pass
+            self.store.wait()
+        except OSError as e:
+            self.log(f"❌ Gagal memasang file output: {e}", style="bold red")
+            return False
+        return True
+
+    @staticmethod
+    def _tap_active(codes: Iterable[Code], active: list[Code]) -> Iterator[Code]:
+        """Teruskan semua kode sambil mengumpulkan kode aktif (untuk notifikasi)."""
+        for code in codes:
+            if code.status == "active":
+                active.append(code)
+            yield code
 
-    def save_results(self, codes: list[Code]):
-        """Menyimpan data ke JSON dan TXT."""
-        if not codes:
+    def save_results(self, codes: Iterable[Code]):
+        """
+        Menyimpan data ke JSON dan TXT secara incremental.
+        `codes` boleh berupa generator. Hanya file yang isinya berubah yang
+        ditulis ulang, dan diff per kode dicatat ke changelog.json.
+        Jika backend SQLite aktif, kode di-upsert ke database lalu file diekspor darinya.
+        """
+        codes = iter(codes)
+        first = next(codes, None)
+        if first is None:
             self.log("Tidak ada kode untuk disimpan.", style="dim yellow")
+            # Halaman tetap dianggap sudah diproses; `check` melaporkannya sebagai "empty"
+            self.store.mark_empty()
+            self._commit_cache(self._take_fetched())
             return
 
-        # Pisahkan Active dan Expired
-        active_codes = [c for c in codes if c.status == "active"]
-        expired_codes = [c for c in codes if c.status == "expired"]
-
-        data_map = {"all": codes, "active": active_codes, "expired": expired_codes}
+        self.log("Menyimpan data...", style="cyan")
+        codes = chain([first], codes)
+        active: list[Code] = []
+        if self.notifier:
+            codes = self._tap_active(codes, active)
+        with self.span("write") as span:
+            if self.db:
+                # SQLite sebagai sumber utama, JSON/TXT diekspor darinya
+                run = self.db.upsert(self.game_key, codes)
+                codes = self.db.export(self.game_key, run)
 
-        self.log(
-            f"Menyimpan data... (Active: {len(active_codes)} | Expired: {len(expired_codes)})",
-            style="cyan",
-        )
+            # Cache HTTP baru di-commit setelah file output benar-benar terpasang
+            on_published = self._published(self._take_fetched())
+            diff, counts, changed_files = self.store.save(codes, on_published)
 
-        for key, data_list in data_map.items():
-            # Simpan JSON
-            json_path = os.path.join(self.game_folder, f"{key}.json")
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump([c.model_dump() for c in data_list], f, indent=4, ensure_ascii=False)
+            # Waktu encode diukur di dalam store, dipisah dari penulisan file
+            stats = self.store.last_stats
+            if stats.repaired:
+                self.log(
+                    f"🩹 {len(stats.repaired)} file tidak cocok dengan manifest "
+                    f"(publish sebelumnya terputus), dipasang ulang.",
+                    style="yellow",
+                )
+            span.bytes = stats.bytes_written
+            span.codes = stats.codes
+            self.metrics.add(self.game_key, "serialize", stats.serialize_seconds, codes=stats.codes)
 
-            # Simpan TXT
-            txt_path = os.path.join(self.game_folder, f"{key}.txt")
-            with open(txt_path, "w", encoding="utf-8") as f:
-                f.write("\n".join(c.code for c in data_list))
+        if diff.is_empty() and not changed_files:
+            self.log(
+                f"✅ Tidak ada perubahan data. "
+                f"(Active: {counts['active']} | Expired: {counts['expired']})",
+                style="bold green",
+            )
+        else:
+            self.log(f"📝 Perubahan: {diff.summary()}", style="cyan")
+            self.log(
+                f"✅ Data berhasil disimpan ke folder ({len(changed_files)} file berubah). "
+                f"(Active: {counts['active']} | Expired: {counts['expired']})",
+                style="bold green",
+            )
 
-        self.log("✅ Data berhasil disimpan ke folder.", style="bold green")
+        # Dikirim di background oleh notifier, scraping tidak menunggu Discord
+        if self.notifier and active:
+            queued = self.notifier.submit(self.game_key, self.game_name, self.discord_color, active)
+            if queued:
+                self.log(f"📣 {queued} kode aktif baru diantrekan ke Discord.", style="cyan")
 
     @abstractmethod
     def scrape(self):
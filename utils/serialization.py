@@ -0,0 +1,157 @@
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from json.encoder import encode_basestring
+
+from .models import Code, Duration, Reward
+from .parsers import has_module
+
+BACKENDS = ("auto", "orjson", "msgspec", "json")
+
+
+@dataclass(frozen=True)
+class OutputFormat:
+    """Cara menulis satu jenis file output dari fragmen per kode."""
+
+    suffix: str
+    # Fragmen yang dipakai: "pretty", "compact", atau "code" (teks kode saja)
+    piece: str
+    open: bytes
+    sep: bytes
+    close: bytes
+    empty: bytes
+    compression: str | None = None
+
+
+FORMATS = {
+    # File bawaan (format lama, identik dengan json.dump(indent=4))
+    "json": OutputFormat(".json", "pretty", b"[\n    ", b",\n    ", b"\n]", b"[]"),
+    "txt": OutputFormat(".txt", "code", b"", b"\n", b"", b""),
+    # Format ringkas opsional
+    "min": OutputFormat(".min.json", "compact", b"[", b",", b"]", b"[]"),
+    "ndjson": OutputFormat(".ndjson", "compact", b"", b"\n", b"\n", b""),
+    "gz": OutputFormat(".min.json.gz", "compact", b"[", b",", b"]", b"[]", "gzip"),
+    "zst": OutputFormat(".min.json.zst", "compact", b"[", b",", b"]", b"[]", "zstd"),
+}
+DEFAULT_FORMATS = ("json", "txt")
+
+
+def available_formats() -> list[str]:
+    """Format yang bisa dipakai (zst butuh paket zstandard)."""
+    return [name for name in FORMATS if name != "zst" or has_module("zstandard")]
+
+
+def resolve_backend(name: str = "auto") -> str:
+    """Pilih encoder JSON ringkas: orjson > msgspec > json (stdlib)."""
+    available = [b for b in ("orjson", "msgspec") if has_module(b)] + ["json"]
+    if name == "auto":
+        return available[0]
+    if name not in available:
+        raise ValueError(f"Backend serialisasi '{name}' tidak tersedia (pip install {name}).")
+    return name
+
+
+def _compact_encoder(backend: str) -> Callable[[Code], bytes]:
+    """Encoder satu Code ke JSON minified (UTF-8, urutan key sama dengan to_dict)."""
+    # Lewat to_dict() agar format tanggal (isoformat) sama persis di semua backend
+    if backend == "orjson":
+        import orjson
+
+        return lambda code: orjson.dumps(code.to_dict())
+    if backend == "msgspec":
+        import msgspec
+
+        encode = msgspec.json.Encoder().encode
+        return lambda code: encode(code.to_dict())
+
+    def encode(code: Code) -> bytes:
+        return json.dumps(code.to_dict(), ensure_ascii=False, separators=(",", ":")).encode()
+
+    return encode
+
+
+def _str(value: str | None) -> str:
+    return "null" if value is None else encode_basestring(value)
+
+
+def _date(value: datetime | None) -> str:
+    return "null" if value is None else f'"{value.isoformat()}"'
+
+
+class CodeEncoder:
+    """
+    Serialisasi setiap Code tepat sekali per format fragmen, lalu fragmen itu
+    dipakai ulang untuk semua file (all/active/expired) yang memuat kode tersebut.
+
+    Fragmen "pretty" disusun dari template dan cache per Reward/Duration
+    (keduanya dibagi antar baris), hasilnya identik byte-per-byte dengan
+    json.dumps(code.to_dict(), indent=4, ensure_ascii=False) sebagai elemen list.
+    """
+
+    def __init__(self, backend: str = "auto"):
+        self.backend = resolve_backend(backend)
+        self.compact = _compact_encoder(self.backend)
+        self._rewards: dict[Reward, str] = {}
+        self._durations: dict[Duration, str] = {}
+
+    def _reward(self, reward: Reward) -> str:
+        fragment = self._rewards.get(reward)
+        if fragment is None:
+            fragment = self._rewards[reward] = (
+                "{\n"
+                f'                "name": {_str(reward.name)},\n'
+                f'                "image": {_str(reward.image)}\n'
+                "            }"
+            )
+        return fragment
+
+    def _duration(self, duration: Duration) -> str:
+        fragment = self._durations.get(duration)
+        if fragment is None:
+            fragment = self._durations[duration] = (
+                "{\n"
+                f'            "discovered": {_str(duration.discovered)},\n'
+                f'            "valid": {_str(duration.valid)},\n'
+                f'            "expired": {_str(duration.expired)},\n'
+                f'            "notes": {_str(duration.notes)},\n'
+                f'            "discovered_at": {_date(duration.discovered_at)},\n'
+                f'            "valid_until": {_date(duration.valid_until)},\n'
+                f'            "expired_at": {_date(duration.expired_at)}\n'
+                "        }"
+            )
+        return fragment
+
+    def pretty(self, code: Code) -> bytes:
+        """Elemen list JSON ber-indent 4 (sudah ter-indent satu level)."""
+        if code.rewards:
+            rewards = (
+                "[\n            "
+                + ",\n            ".join(self._reward(r) for r in code.rewards)
+                + "\n        ]"
+            )
+        else:
+            rewards = "[]"
+
+        return (
+            "{\n"
+            f'        "code": {_str(code.code)},\n'
+            f'        "server": {_str(code.server)},\n'
+            f'        "status": {_str(code.status)},\n'
+            f'        "rewards": {rewards},\n'
+            f'        "duration": {self._duration(code.duration)},\n'
+            f'        "link": {_str(code.link)}\n'
+            "    }"
+        ).encode()
+
+    def loads(self, data: bytes):
+        """Decode JSON memakai backend tercepat yang tersedia."""
+        if self.backend == "orjson":
+            import orjson
+
+            return orjson.loads(data)
+        if self.backend == "msgspec":
+            import msgspec
+
+            return msgspec.json.decode(data)
+        return json.loads(data)
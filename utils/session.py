@@ -0,0 +1,77 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry, make_headers
+
+# Host yang dipakai scraper bawaan, mendapat pool koneksi sendiri
+DEFAULT_HOSTS = (
+    "genshin-impact.fandom.com",
+    "honkai-star-rail.fandom.com",
+    "honkaiimpact3.fandom.com",
+    "discord.com",
+)
+
+_lock = threading.Lock()
+_session: requests.Session | None = None
+
+
+def build_session(
+    retries: int = 3,
+    backoff: float = 1.0,
+    pool_maxsize: int = 2,
+    host_pool_sizes: dict[str, int] | None = None,
+) -> requests.Session:
+    """
+    Buat requests.Session dengan connection pooling & keep-alive.
+    - retries/backoff: retry otomatis untuk error koneksi dan 5xx, hanya untuk
+      GET/HEAD; POST (webhook Discord) tidak diulang di sini agar tidak terkirim
+      dua kali, retry-nya ditangani utils.notify.
+    - pool_maxsize: jumlah koneksi keep-alive per host (bawaan).
+    - host_pool_sizes: override ukuran pool untuk host tertentu.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        # 429 & Retry-After ditangani utils.rate_limit agar limiter per host ikut belajar
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+
+    session = requests.Session()
+    # gzip/deflate selalu, brotli otomatis jika paket brotli terpasang
+    session.headers.update(make_headers(accept_encoding=True))
+
+    def adapter(size: int, pools: int = 1) -> HTTPAdapter:
+        return HTTPAdapter(pool_connections=pools, pool_maxsize=size, max_retries=retry)
+
+    session.mount("https://", adapter(pool_maxsize, pools=10))
+    session.mount("http://", adapter(pool_maxsize, pools=10))
+
+    sizes = dict.fromkeys(DEFAULT_HOSTS, pool_maxsize)
+    sizes.update(host_pool_sizes or {})
+    for host, size in sizes.items():
+        session.mount(f"https://{host}/", adapter(size))
+
+    return session
+
+
+def configure_session(**kwargs) -> requests.Session:
+    """Ganti session bersama dengan konfigurasi baru (dipanggil dari CLI)."""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _session = build_session(**kwargs)
+        return _session
+
+
+def get_session() -> requests.Session:
+    """Session bersama untuk semua scraper, dibuat saat pertama kali dipakai."""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = build_session()
+        return _session
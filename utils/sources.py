@@ -0,0 +1,191 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+
+STATS_FILE = os.path.join(".cache", "sources.json")
+# Bobot sampel baru pada rata-rata latensi (EWMA)
+EWMA_ALPHA = 0.3
+# Jeda sebelum sumber cadangan ikut diminta jika latensi sumber utama belum diketahui
+HEDGE_DELAY = 2.0
+# Batas bawah jeda hedge, dan kelipatan rata-rata latensi yang dianggap "lambat"
+MIN_HEDGE_DELAY = 0.25
+HEDGE_FACTOR = 2.0
+# Sumber yang baru gagal diletakkan di belakang selama jeda ini (detik)
+FAILURE_COOLDOWN = 600.0
+
+
+@dataclass
+class SourceStat:
+    """Statistik satu URL sumber: rata-rata latensi (detik) & riwayat gagal."""
+
+    latency: float | None = None
+    successes: int = 0
+    failures: int = 0
+    # Gagal beruntun & waktu (epoch) gagal terakhir, untuk cooldown
+    streak: int = 0
+    failed_at: float = 0.0
+
+    def healthy(self, now: float) -> bool:
+        return self.streak == 0 or now - self.failed_at > FAILURE_COOLDOWN * self.streak
+
+
+class SourceStats:
+    """
+    Latensi & kesehatan per URL sumber, dipakai untuk memilih sumber tercepat
+    yang sehat dan menentukan kapan hedge request dikirim. Disimpan ke
+    STATS_FILE agar run berikutnya langsung memilih sumber yang tepat.
+    """
+
+    def __init__(self, path: str = STATS_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stats = self._load()
+
+    def _load(self) -> dict[str, SourceStat]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return {url: SourceStat(**stat) for url, stat in json.load(f).items()}
+        except (OSError, ValueError, TypeError):
+            return {}
+
+    def save(self):
+        with self._lock:
+            data = {url: asdict(stat) for url, stat in self._stats.items()}
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def get(self, url: str) -> SourceStat:
+        with self._lock:
+            return self._stats.get(url) or SourceStat()
+
+    def record(self, url: str, seconds: float | None, ok: bool):
+        """Catat hasil satu request (seconds = waktu sampai header diterima)."""
+        with self._lock:
+            stat = self._stats.setdefault(url, SourceStat())
+            if ok:
+                stat.successes += 1
+                stat.streak = 0
+                if seconds is not None:
+                    previous = stat.latency
+                    stat.latency = (
+                        seconds
+                        if previous is None
+                        else EWMA_ALPHA * seconds + (1 - EWMA_ALPHA) * previous
+                    )
+            else:
+                stat.failures += 1
+                stat.streak += 1
+                stat.failed_at = time.time()
+
+    def rank(self, urls: list[str]) -> list[str]:
+        """
+        Urutan sumber yang dicoba: yang sehat dulu, lalu latensi terkecil.
+        Sumber yang belum pernah diukur mengikuti urutan konfigurasi.
+        """
+        now = time.time()
+        with self._lock:
+            stats = [self._stats.get(url) or SourceStat() for url in urls]
+
+        def key(i):
+            stat = stats[i]
+            known = stat.latency is not None
+            return (not stat.healthy(now), not known, stat.latency if known else 0, i)
+
+        return [urls[i] for i in sorted(range(len(urls)), key=key)]
+
+    def hedge_delay(self, url: str) -> float:
+        """Berapa lama menunggu `url` sebelum sumber berikutnya ikut diminta."""
+        latency = self.get(url).latency
+        if latency is None:
+            return HEDGE_DELAY
+        return max(MIN_HEDGE_DELAY, latency * HEDGE_FACTOR)
+
+    def rows(self, urls) -> list[tuple[str, str, int, int]]:
+        """(url, latensi ms, sukses, gagal) untuk tabel --timings."""
+        rows = []
+        for url in urls:
+            stat = self.get(url)
+            latency = f"{stat.latency * 1000:.0f}" if stat.latency is not None else "-"
+            rows.append((url, latency, stat.successes, stat.failures))
+        return rows
+
+
+# Pool khusus hedge request; terpisah dari pool fetch agar tidak saling menunggu slot
+_hedge_pool: ThreadPoolExecutor | None = None
+_hedge_lock = threading.Lock()
+
+
+def hedge_pool() -> ThreadPoolExecutor:
+    global _hedge_pool
+    with _hedge_lock:
+        if _hedge_pool is None:
+            _hedge_pool = ThreadPoolExecutor(thread_name_prefix="hedge")
+        return _hedge_pool
+
+
+def _abandon(pending: dict[Future, str], discard):
+    """Batalkan request yang kalah; yang sudah berjalan diserahkan ke `discard` saat selesai."""
+
+    def drop(future: Future, url: str):
+        if not future.cancelled() and future.exception() is None and future.result() is not None:
+            discard(url, future.result())
+
+    for future, url in pending.items():
+        if not future.cancel() and discard:
+            future.add_done_callback(lambda future, url=url: drop(future, url))
+
+
+def first_success(fetch, urls: list[str], stats: SourceStats, hedge: bool = True, discard=None):
+    """
+    Jalankan `fetch(url)` untuk sumber berurutan (sesuai stats.rank) dan return
+    (url, hasil) pertama yang bukan None. Sumber berikutnya ikut diminta jika
+    sumber sebelumnya gagal, atau (hedge) belum menjawab setelah hedge_delay.
+    Request yang kalah dibatalkan jika belum berjalan; yang sudah berjalan
+    dibiarkan selesai, lalu hasilnya diberikan ke `discard(url, hasil)` agar
+    efek sampingnya (mis. entri cache) bisa dibuang.
+    """
+    order = stats.rank(urls)
+    if not hedge:
+        for url in order:
+            result = fetch(url)
+            if result is not None:
+                return url, result
+        return None, None
+
+    pool = hedge_pool()
+    pending: dict[Future, str] = {}
+    remaining = iter(order)
+
+    def launch() -> bool:
+        url = next(remaining, None)
+        if url is None:
+            return False
+        pending[pool.submit(fetch, url)] = url
+        return True
+
+    launch()
+    while pending:
+        delay = stats.hedge_delay(list(pending.values())[-1])
+        done, _ = wait(pending, timeout=delay, return_when=FIRST_COMPLETED)
+        if not done:
+            launch()
+            continue
+        for future in done:
+            url = pending.pop(future)
+            result = future.result()
+            if result is not None:
+                _abandon(pending, discard)
+                return url, result
+            # Gagal: langsung coba sumber berikutnya tanpa menunggu jeda hedge
+            launch()
+    return None, None
+
+
+# Statistik bersama untuk semua scraper
+source_stats = SourceStats()
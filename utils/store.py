@@ -0,0 +1,446 @@
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+from .models import Code
+from .serialization import DEFAULT_FORMATS, FORMATS, CodeEncoder, OutputFormat
+
+OUTPUT_KEYS = ("all", "active", "expired")
+CHANGELOG_FILE = "changelog.json"
+# Daftar file output beserta SHA-256 & ukurannya, ditulis paling akhir setiap ada perubahan
+MANIFEST_FILE = "manifest.json"
+
+
+@dataclass
+class Diff:
+    """Perubahan data satu game dibanding run sebelumnya (kunci: kode)."""
+
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    # (kode, status lama, status baru)
+    status_changed: list[tuple[str, str, str]] = field(default_factory=list)
+    # Status sama tetapi isi lain (rewards/duration/server) berubah
+    updated: list[str] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.status_changed or self.updated)
+
+    def summary(self) -> str:
+        return (
+            f"+{len(self.added)} baru | -{len(self.removed)} hilang | "
+            f"~{len(self.status_changed)} status | *{len(self.updated)} diperbarui"
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "added": self.added,
+            "removed": self.removed,
+            "status_changed": [
+                {"code": code, "from": old, "to": new} for code, old, new in self.status_changed
+            ],
+            "updated": self.updated,
+        }
+
+
+@dataclass
+class SaveStats:
+    """Ringkasan save() terakhir untuk instrumentasi (utils.metrics)."""
+
+    codes: int = 0
+    # Waktu encode fragmen (CodeEncoder) saja, tanpa penulisan file
+    serialize_seconds: float = 0.0
+    # Bytes yang sampai ke disk (setelah kompresi), termasuk file yang tidak berubah
+    bytes_written: int = 0
+    # File yang isinya tidak cocok dengan manifest lama (swap sebelumnya terputus)
+    repaired: list[str] = field(default_factory=list)
+
+
+class _HashedWriter:
+    """
+    Satu file output: ditulis ke file sementara sambil menghitung SHA-256
+    dari bytes yang benar-benar sampai ke disk (setelah kompresi, jika ada).
+    """
+
+    def __init__(self, path: str, fmt: OutputFormat):
+        self.path = f"{path}.tmp"
+        self.fmt = fmt
+        self.count = 0
+        self.size = 0
+        self.hasher = hashlib.sha256()
+        self.file = open(self.path, "wb")
+        self.sink = self._compressor(fmt.compression)
+
+    def _compressor(self, compression: str | None):
+        if compression == "gzip":
+            # mtime=0 agar hasil kompresi deterministik (hash stabil antar run)
+            return gzip.GzipFile(filename="", mode="wb", fileobj=self, mtime=0)
+        if compression == "zstd":
+            import zstandard
+
+            return zstandard.ZstdCompressor().stream_writer(self, closefd=False)
+        return None
+
+    def write(self, data: bytes):
+        """Tulis bytes mentah ke disk (dipanggil langsung atau oleh kompresor)."""
+        self.hasher.update(data)
+        self.size += len(data)
+        self.file.write(data)
+        return len(data)
+
+    def flush(self):
+        self.file.flush()
+
+    def add(self, item: bytes):
+        """Tambah satu fragmen kode dengan pemisah sesuai format."""
+        (self.sink or self).write((self.fmt.open if self.count == 0 else self.fmt.sep) + item)
+        self.count += 1
+
+    def finish(self):
+        (self.sink or self).write(self.fmt.close if self.count else self.fmt.empty)
+        if self.sink:
+            self.sink.close()
+            self.sink = None
+
+    def close(self):
+        if self.sink:
+            self.sink.close()
+            self.sink = None
+        self.file.close()
+
+
+def read_manifest(folder: str) -> dict | None:
+    """Manifest output suatu folder, None jika belum ada/rusak."""
+    try:
+        with open(os.path.join(folder, MANIFEST_FILE), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if isinstance(manifest, dict) else None
+
+
+def _fsync_file(path: str):
+    fd = os.open(path, os.O_RDWR)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(path: str):
+    """fsync direktori agar rename di dalamnya tahan crash (tidak didukung Windows)."""
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+# Pool untuk fsync & swap output di background, dipakai semua IncrementalStore
+_publish_pool: ThreadPoolExecutor | None = None
+_publish_lock = threading.Lock()
+
+
+def publish_pool() -> ThreadPoolExecutor:
+    global _publish_pool
+    with _publish_lock:
+        if _publish_pool is None:
+            _publish_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="publish")
+        return _publish_pool
+
+
+def file_digest(path: str) -> str | None:
+    """SHA-256 isi file, None jika file belum ada."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+    except OSError:
+        return None
+
+
+class IncrementalStore:
+    """
+    Penyimpanan all/active/expired untuk satu folder game.
+    - Membandingkan hasil baru dengan all.json sebelumnya per kode.
+    - Setiap kode diserialisasi sekali (CodeEncoder), fragmennya dipakai ulang
+      untuk semua file dan format (json, txt, serta min/ndjson/gz/zst opsional).
+    - Output ditulis bertahap ke file sementara, lalu hanya file yang isinya
+      benar-benar berbeda yang menggantikan file lama.
+    - Diff dicatat ke changelog.json jika ada perubahan.
+    - File sementara di-fsync dalam satu batch, lalu dipasang satu per satu
+      dengan os.replace: setiap file atomik (pembaca tidak pernah melihat file
+      setengah jadi), tetapi tidak sebagai satu kelompok, jadi di antara dua
+      replace pembaca bisa melihat all.json baru dengan active.json lama.
+      manifest.json (SHA-256 & ukuran per file) ditulis paling akhir sebagai
+      penanda publish lengkap; save() berikutnya memasang ulang file yang
+      tidak cocok dengan manifest (swap yang terputus). Dengan `background`,
+      tahap ini berjalan di publish_pool sementara scraper lanjut ke pekerjaan
+      berikutnya; save() berikutnya & wait() menunggu hingga selesai.
+    - `reset`: data lama diabaikan dan file lain di folder (mis. format yang
+      tidak lagi dipakai) baru dihapus setelah output baru terpasang.
+    """
+
+    def __init__(
+        self,
+        folder: str,
+        formats=DEFAULT_FORMATS,
+        backend: str = "auto",
+        reset: bool = False,
+        background: bool = False,
+    ):
+        self.folder = folder
+        self.formats = tuple(formats)
+        self.encoder = CodeEncoder(backend)
+        self.last_stats = SaveStats()
+        self.reset = reset
+        self.background = background
+        self._publishing: Future | None = None
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.folder, name)
+
+    def load_previous(self) -> dict[str, tuple[str, str]]:
+        """State run sebelumnya yang ringkas: {kode: (status, hash isi)}."""
+        try:
+            with open(self._path("all.json"), "rb") as f:
+                items = self.encoder.loads(f.read())
+        except (OSError, ValueError):
+            return {}
+
+        previous = {}
+        for item in items:
+            digest = hashlib.sha256(self.encoder.compact(Code.from_dict(item))).hexdigest()
+            previous.setdefault(item["code"], (item["status"], digest))
+        return previous
+
+    def wait(self):
+        """Tunggu output save() terakhir terpasang; error saat memasang di-raise di sini."""
+        publishing, self._publishing = self._publishing, None
+        if publishing is not None:
+            publishing.result()
+
+    def save(
+        self, codes: Iterable[Code], on_published: Callable[[float], None] | None = None
+    ) -> tuple[Diff, dict[str, int], list[str]]:
+        """
+        Tulis kode (boleh generator) ke semua file output.
+        Return (diff, jumlah kode per key, daftar file yang berubah).
+        `on_published(detik)` dipanggil setelah semua file terpasang dan tersimpan di disk
+        (file dipasang satu per satu, lihat docstring kelas).
+        """
+        self.wait()
+        os.makedirs(self.folder, exist_ok=True)
+        previous = {} if self.reset else self.load_previous()
+        diff = Diff()
+        stats = self.last_stats = SaveStats()
+        seen: set[str] = set()
+        pieces = {FORMATS[name].piece for name in self.formats}
+
+        writers: dict[str, list[_HashedWriter]] = {}
+        try:
+            for key in OUTPUT_KEYS:
+                writers[key] = [
+                    _HashedWriter(self._path(key + FORMATS[name].suffix), FORMATS[name])
+                    for name in self.formats
+                ]
+
+            for code in codes:
+                # Serialisasi sekali per kode, dipakai ulang oleh semua file
+                start = time.perf_counter()
+                compact = self.encoder.compact(code)
+                fragments = {
+                    "compact": compact,
+                    "code": code.code.encode(),
+                    "pretty": self.encoder.pretty(code) if "pretty" in pieces else b"",
+                }
+                stats.serialize_seconds += time.perf_counter() - start
+                stats.codes += 1
+                self._track(code, compact, previous, seen, diff)
+
+                for key in ("all", code.status):
+                    for writer in writers.get(key, ()):
+                        writer.add(fragments[writer.fmt.piece])
+
+            for group in writers.values():
+                for writer in group:
+                    writer.finish()
+        except BaseException:
+            # Gagal di tengah jalan: file lama tetap utuh, buang file sementara
+            self._discard(writers)
+            raise
+        finally:
+            for group in writers.values():
+                for writer in group:
+                    writer.close()
+
+        diff.removed = sorted(set(previous) - seen)
+        stats.bytes_written = sum(writer.size for group in writers.values() for writer in group)
+        counts = {key: group[0].count if group else 0 for key, group in writers.items()}
+
+        staged = self._stage(writers, stats)
+        changed_files = [os.path.basename(final_path) for _, final_path in staged]
+        manifest = self._manifest(writers, counts, bool(staged))
+        if not diff.is_empty():
+            staged.append(self._write_changelog(diff))
+
+        if self.background:
+            self._publishing = publish_pool().submit(self._publish, staged, manifest, on_published)
+        else:
+            self._publish(staged, manifest, on_published)
+        return diff, counts, changed_files
+
+    def mark_empty(self):
+        """
+        Catat run yang tidak menemukan kode saat folder belum punya output:
+        manifest tanpa file, agar `check` membedakannya dari output yang hilang.
+        """
+        self.wait()
+        if os.path.exists(self._path("all.json")):
+            return
+        os.makedirs(self.folder, exist_ok=True)
+        manifest = {
+            "generated_at": datetime.now(UTC).isoformat(timespec="seconds"),
+            "codes": dict.fromkeys(OUTPUT_KEYS, 0),
+            "files": {},
+        }
+        self._publish([], manifest, None)
+
+    @staticmethod
+    def _track(code: Code, compact: bytes, previous: dict, seen: set, diff: Diff):
+        """Bandingkan satu kode dengan state sebelumnya."""
+        if code.code in seen:
+            return
+        seen.add(code.code)
+
+        if code.code not in previous:
+            diff.added.append(code.code)
+            return
+
+        old_status, old_digest = previous[code.code]
+        if old_status != code.status:
+            diff.status_changed.append((code.code, old_status, code.status))
+        elif old_digest != hashlib.sha256(compact).hexdigest():
+            diff.updated.append(code.code)
+
+    def _stage(
+        self, writers: dict[str, list[_HashedWriter]], stats: SaveStats
+    ) -> list[tuple[str, str]]:
+        """
+        (file sementara, tujuan) yang isinya berbeda dari file lama; file sementara
+        yang isinya sama langsung dibuang. Pada reset semua file dipasang ulang.
+        File yang tidak cocok dengan manifest lama berarti publish sebelumnya
+        terputus di tengah swap: file itu dipasang ulang (dicatat di stats.repaired)
+        walaupun isinya sudah sama, agar manifest ikut ditulis ulang.
+        """
+        listed = (read_manifest(self.folder) or {}).get("files") or {}
+        staged = []
+        for group in writers.values():
+            for writer in group:
+                final_path = writer.path.removesuffix(".tmp")
+                current = file_digest(final_path)
+                entry = listed.get(os.path.basename(final_path))
+                stale = isinstance(entry, dict) and entry.get("sha256") != current
+                if stale:
+                    stats.repaired.append(os.path.basename(final_path))
+                if not self.reset and not stale and current == writer.hasher.hexdigest():
+                    os.remove(writer.path)
+                else:
+                    staged.append((writer.path, final_path))
+        return staged
+
+    def _manifest(
+        self, writers: dict[str, list[_HashedWriter]], counts: dict[str, int], changed: bool
+    ) -> dict | None:
+        """Manifest baru, None jika manifest yang ada sudah sama (tidak perlu ditulis)."""
+        files = {
+            os.path.basename(writer.path.removesuffix(".tmp")): {
+                "sha256": writer.hasher.hexdigest(),
+                "size": writer.size,
+            }
+            for group in writers.values()
+            for writer in group
+        }
+        current = read_manifest(self.folder)
+        if not changed and current and current.get("files") == files:
+            return None
+        return {
+            "generated_at": datetime.now(UTC).isoformat(timespec="seconds"),
+            "codes": counts,
+            "files": files,
+        }
+
+    def _publish(
+        self,
+        staged: list[tuple[str, str]],
+        manifest: dict | None,
+        on_published: Callable[[float], None] | None,
+    ):
+        """
+        Pasang output: fsync semua file sementara sekaligus, os.replace satu per
+        satu, manifest terakhir, lalu fsync direktori sekali. Jika gagal di tengah,
+        file yang sudah di-replace tetap baru, yang belum tetap lama (file sementara
+        dibuang), dan manifest lama tidak lagi cocok; save() berikutnya memperbaikinya.
+        """
+        start = time.perf_counter()
+        try:
+            if manifest is not None:
+                manifest_path = self._path(MANIFEST_FILE)
+                with open(f"{manifest_path}.tmp", "w", encoding="utf-8") as f:
+                    json.dump(manifest, f, indent=4)
+                staged = [*staged, (f"{manifest_path}.tmp", manifest_path)]
+
+            for tmp_path, _ in staged:
+                _fsync_file(tmp_path)
+            for tmp_path, final_path in staged:
+                os.replace(tmp_path, final_path)
+            if staged:
+                _fsync_dir(self.folder)
+        except BaseException:
+            for tmp_path, _ in staged:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            raise
+
+        if self.reset:
+            self._remove_stale(manifest)
+            self.reset = False
+        if on_published:
+            on_published(time.perf_counter() - start)
+
+    def _remove_stale(self, manifest: dict | None):
+        """Hapus file yang bukan bagian output baru (setelah output baru terpasang)."""
+        keep = {CHANGELOG_FILE, MANIFEST_FILE, *((manifest or {}).get("files") or ())}
+        for name in os.listdir(self.folder):
+            path = self._path(name)
+            if name in keep:
+                continue
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+
+    @staticmethod
+    def _discard(writers: dict[str, list[_HashedWriter]]):
+        for group in writers.values():
+            for writer in group:
+                writer.close()
+                if os.path.exists(writer.path):
+                    os.remove(writer.path)
+
+    def _write_changelog(self, diff: Diff) -> tuple[str, str]:
+        """Siapkan diff terakhir sebagai artifact changelog.json (dipasang bersama output)."""
+        entry = {"generated_at": datetime.now(UTC).isoformat(timespec="seconds")}
+        entry.update(diff.to_dict())
+        path = self._path(CHANGELOG_FILE)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(entry, f, indent=4, ensure_ascii=False)
+        return f"{path}.tmp", path
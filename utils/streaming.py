@@ -0,0 +1,86 @@
+from collections.abc import Iterable, Iterator
+
+from bs4 import BeautifulSoup, Tag
+
+from .parsers import CONTENT_CLASS, has_module
+
+
+def streaming_available() -> bool:
+    """Mode streaming membutuhkan lxml (HTMLPullParser)."""
+    return has_module("lxml")
+
+
+def _classes(element) -> list[str]:
+    return (element.get("class") or "").split()
+
+
+def _to_tag(element) -> Tag | None:
+    """Ubah satu elemen <tr> lxml menjadi Tag BeautifulSoup kecil."""
+    from lxml import etree
+
+    html = etree.tostring(element, encoding="unicode", method="html", with_tail=False)
+    return BeautifulSoup(f"<table>{html}</table>", "lxml").find("tr")
+
+
+def iter_table_rows(
+    chunks: Iterable[bytes], encoding: str = "utf-8", all_tables: bool = False
+) -> Iterator[tuple[int, Tag]]:
+    """
+    Parse HTML secara bertahap dan yield (indeks tabel, <tr>) untuk setiap baris,
+    termasuk header, dari table.wikitable di dalam div.mw-parser-output.
+    Hanya tabel pertama, kecuali `all_tables`.
+
+    Setiap baris yang sudah di-yield langsung dibuang dari tree lxml, sehingga
+    memori tetap datar berapapun jumlah baris di halaman. Sisa chunk setelah
+    tabel terakhir tetap dikonsumsi (tanpa parsing) agar cache/hash body lengkap.
+    Halaman MediaWiki selalu UTF-8, jadi encoding tidak ditebak dari chunk awal.
+    """
+    from lxml import etree
+
+    parser = etree.HTMLPullParser(events=("start", "end"), encoding=encoding)
+    chunks = iter(chunks)
+
+    in_content = False
+    table = None
+    index = -1
+    nested = 0
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            tag = element.tag
+
+            if table is None:
+                if event == "start" and tag == "div" and CONTENT_CLASS in _classes(element):
+                    in_content = True
+                elif in_content and event == "start" and tag == "table":
+                    if "wikitable" in _classes(element):
+                        table = element
+                        index += 1
+                continue
+
+            if tag == "table" and element is not table:
+                # Tabel bersarang di dalam sel, bukan baris milik tabel utama
+                nested += 1 if event == "start" else -1
+                continue
+
+            if event == "end" and element is table:
+                table = None
+                if all_tables:
+                    continue
+                # Tabel selesai: habiskan sisa body tanpa parsing
+                for _ in chunks:
+                    pass
+                return
+
+            if event != "end" or tag != "tr" or nested:
+                continue
+
+            row = _to_tag(element)
+            if row is not None:
+                yield index, row
+
+            # Buang baris yang sudah diproses agar tree tidak membesar
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
@@ -0,0 +1,135 @@
+import random
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from .game_scraper import GameScraper
+from .runner import HostLimiter
+
+# Halaman yang tidak berubah dicek makin jarang, hingga MAX_FACTOR x interval dasar
+GROWTH = 1.5
+MAX_FACTOR = 4
+# Variasi acak jadwal agar halaman di host yang sama tidak selalu dicek bersamaan
+JITTER = 0.1
+
+
+def format_interval(seconds: float) -> str:
+    """Interval polling dalam bentuk yang mudah dibaca di log."""
+    if seconds < 120:
+        return f"{seconds:.0f} detik"
+    return f"{seconds / 60:.0f} menit"
+
+
+@dataclass(slots=True)
+class Schedule:
+    """Jadwal polling adaptif untuk satu URL."""
+
+    url: str
+    base: float
+    interval: float = 0.0
+    next_at: float = 0.0
+    failures: int = 0
+
+    def update(self, changed: bool | None, now: float):
+        """
+        Atur jadwal berikutnya dari hasil polling:
+        berubah -> kembali ke interval dasar, sama -> diperpanjang,
+        gagal (None) -> backoff eksponensial.
+        """
+        if changed is None:
+            self.failures += 1
+            interval = self.base * 2**self.failures
+        elif changed:
+            self.failures = 0
+            interval = self.base
+        else:
+            self.failures = 0
+            interval = max(self.interval, self.base) * GROWTH
+
+        self.interval = min(interval, self.base * MAX_FACTOR)
+        self.next_at = now + self.interval * random.uniform(1 - JITTER, 1 + JITTER)
+
+
+class Watcher:
+    """
+    Mode daemon: scraper tetap hidup dan setiap URL dicek sesuai jadwalnya sendiri.
+    Session, cache, dan kode hasil ekstraksi tetap hangat di memori, sehingga
+    satu siklus hanya mengambil halaman yang jatuh tempo. Halaman yang berubah
+    langsung ditulis & diumumkan seperti pada run biasa.
+    """
+
+    def __init__(
+        self,
+        scrapers: list[GameScraper],
+        scale: float = 1.0,
+        max_per_host: int = 2,
+        on_cycle: Callable[[], None] | None = None,
+    ):
+        self.scrapers = scrapers
+        self.max_per_host = max_per_host
+        self.on_cycle = on_cycle
+        self.schedules = {
+            scraper: [Schedule(page.url, page.interval * scale) for page in scraper.spec.pages]
+            for scraper in scrapers
+        }
+        self._stop = threading.Event()
+
+    def stop(self):
+        """Hentikan loop setelah siklus yang sedang berjalan (mis. dari handler SIGTERM)."""
+        self._stop.set()
+
+    def due(self, now: float) -> dict[GameScraper, list[Schedule]]:
+        """Jadwal yang sudah jatuh tempo, dikelompokkan per game."""
+        due = {}
+        for scraper, schedules in self.schedules.items():
+            ready = [s for s in schedules if s.next_at <= now]
+            if ready:
+                due[scraper] = ready
+        return due
+
+    @staticmethod
+    def _poll(scraper: GameScraper, schedules: list[Schedule]) -> dict[str, bool | None]:
+        try:
+            return scraper.scrape({s.url for s in schedules})
+        except Exception as e:
+            scraper.log(f"❌ Scraper gagal: {e}", style="bold red")
+            return {}
+
+    def _cycle(self, pool: ThreadPoolExecutor, due: dict[GameScraper, list[Schedule]]):
+        futures = {scraper: pool.submit(self._poll, scraper, s) for scraper, s in due.items()}
+        for scraper, future in futures.items():
+            status = future.result()
+            now = time.monotonic()
+            for schedule in due[scraper]:
+                schedule.update(status.get(schedule.url), now)
+                scraper.log(
+                    f"⏰ Cek lagi dalam {format_interval(schedule.interval)}: "
+                    f"[dim]{schedule.url}[/dim]",
+                    style="dim",
+                )
+
+    def run(self):
+        """Loop polling hingga stop() dipanggil (atau KeyboardInterrupt)."""
+        limiter = HostLimiter(self.max_per_host)
+        with (
+            ThreadPoolExecutor(len(self.scrapers), thread_name_prefix="game") as game_pool,
+            ThreadPoolExecutor(thread_name_prefix="fetch") as fetch_pool,
+        ):
+            for scraper in self.scrapers:
+                scraper.keep_state = True
+                scraper.fetch_executor = fetch_pool
+                scraper.host_limiter = limiter
+
+            while not self._stop.is_set():
+                now = time.monotonic()
+                due = self.due(now)
+                if not due:
+                    next_at = min(s.next_at for group in self.schedules.values() for s in group)
+                    self._stop.wait(next_at - now)
+                    continue
+
+                self._cycle(game_pool, due)
+                if self.on_cycle:
+                    self.on_cycle()
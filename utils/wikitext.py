@@ -0,0 +1,398 @@
+import html
+import json
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from urllib.parse import quote, urlsplit
+
+from .extract import CODE_CLEAN, REWARD_SPLIT, TableExtractor, TableSpec, image_url
+from .models import Reward
+
+# Wikitext mentah satu halaman lewat MediaWiki API (jauh lebih kecil dari HTML Fandom)
+API_PARAMS = "action=parse&prop=wikitext&format=json&formatversion=2&redirects=1"
+
+# Template hadiah: {{Item|Primogem|60}} / {{Item|Primogem|x=60}} / {{Card|Mora|10000}}
+ITEM_TEMPLATES = ("item", "card")
+# Daftar hadiah dalam satu template: {{Card List|Primogem*60;Mora*10000}}
+ITEM_LIST_TEMPLATES = ("item list", "card list")
+# Nama file gambar hadiah, seperti data-image-name pada HTML Fandom
+ITEM_FILE = "Item {}.png"
+# URL CDN file lewat API (sama dengan src gambar di HTML), maksimal 50 judul per request
+FILE_INFO_PARAMS = "action=query&prop=imageinfo&iiprop=url&format=json&formatversion=2&redirects=1"
+FILE_INFO_BATCH = 50
+# Template yang isinya kode: {{Code|GENSHINGIFT}}
+CODE_TEMPLATES = ("code",)
+
+# Token yang mempengaruhi kedalaman: template, link internal, dan pemisah
+TOKENS = re.compile(r"\{\{|\}\}|\[\[|\]\]|\|\||!!|\|")
+ATTRIBUTES = re.compile(r"""\s*(?:[\w-]+\s*=\s*(?:"[^"]*"|'[^']*'|[^\s|]+)\s*)+""")
+COMMENT = re.compile(r"<!--.*?-->", re.S)
+CODE_TAG = re.compile(r"<code[^>]*>(.*?)</code>", re.S | re.I)
+LINE_BREAK = re.compile(r"<br\s*/?>", re.I)
+HTML_TAG = re.compile(r"</?[a-zA-Z][^>]*>")
+FILE_LINK = re.compile(r"\[\[(?:File|Image):[^\[\]]*(?:\[\[[^\]]*\]\][^\[\]]*)*\]\]", re.I)
+WIKI_LINK = re.compile(r"\[\[(?:[^|\]]*\|)?([^\]]*)\]\]")
+EXTERNAL_LINK = re.compile(r"\[(?:https?:)?//[^\s\]]+\s*([^\]]*)\]")
+BOLD_ITALIC = re.compile(r"'{2,}")
+# Teks tanpa karakter ini tidak berisi markup, cukup di-strip
+MARKUP = re.compile(r"[\[{<'&\n]")
+
+
+def api_url(page_url: str) -> str:
+    """URL MediaWiki API untuk wikitext halaman /wiki/<judul>."""
+    parts = urlsplit(page_url)
+    title = parts.path.split("/wiki/", 1)[-1]
+    return f"{parts.scheme}://{parts.netloc}/api.php?{API_PARAMS}&page={title}"
+
+
+def file_url(page_url: str, name: str) -> str:
+    """URL gambar dari nama file lewat Special:FilePath (redirect ke CDN wiki)."""
+    parts = urlsplit(page_url)
+    return f"{parts.scheme}://{parts.netloc}/wiki/Special:FilePath/{quote(name.replace(' ', '_'))}"
+
+
+def file_info_urls(page_url: str, names: list[str]) -> list[str]:
+    """URL API imageinfo untuk `names` (nama file tanpa "File:"), dibagi per FILE_INFO_BATCH."""
+    parts = urlsplit(page_url)
+    base = f"{parts.scheme}://{parts.netloc}/api.php?{FILE_INFO_PARAMS}&titles="
+    return [
+        base + quote("|".join(f"File:{name}" for name in names[i : i + FILE_INFO_BATCH]))
+        for i in range(0, len(names), FILE_INFO_BATCH)
+    ]
+
+
+def decode_file_info(content: bytes) -> dict[str, str]:
+    """
+    {nama file yang diminta: URL CDN} dari respons prop=imageinfo. Judul yang
+    dinormalisasi/redirect oleh API dipetakan balik; file yang tidak ada dilewati.
+    """
+    data = json.loads(content)
+    if "error" in data:
+        error = data["error"]
+        raise ValueError(f"MediaWiki API: {error.get('info') or error.get('code')}")
+    query = data.get("query") or {}
+    pages = query.get("pages") or []
+    # formatversion=1 memakai {pageid: page}
+    if isinstance(pages, dict):
+        pages = list(pages.values())
+    urls = {
+        page["title"]: image_url(page["imageinfo"][0]["url"])
+        for page in pages
+        if page.get("imageinfo")
+    }
+
+    aliases: dict[str, str] = {}
+    for step in (*(query.get("normalized") or ()), *(query.get("redirects") or ())):
+        aliases[step["from"]] = step["to"]
+    result = {}
+    for title in {*urls, *aliases}:
+        target = title
+        for _ in range(len(aliases) + 1):
+            if target not in aliases:
+                break
+            target = aliases[target]
+        if target in urls:
+            result[title.removeprefix("File:")] = urls[target]
+    return result
+
+
+def decode_response(content: bytes) -> str:
+    """Wikitext dari respons JSON action=parse; ValueError jika API membalas error."""
+    data = json.loads(content)
+    if "error" in data:
+        error = data["error"]
+        raise ValueError(f"MediaWiki API: {error.get('info') or error.get('code')}")
+    wikitext = data["parse"]["wikitext"]
+    # formatversion=1 membungkus teks dalam {"*": ...}
+    return wikitext["*"] if isinstance(wikitext, dict) else wikitext
+
+
+def split_top(text: str, separators: tuple[str, ...] = ("|",), limit: int = -1) -> list[str]:
+    """Pisah `text` pada separator yang tidak berada di dalam {{...}} atau [[...]]."""
+    parts = []
+    depth = 0
+    start = 0
+    for match in TOKENS.finditer(text):
+        token = match.group()
+        if token in ("{{", "[["):
+            depth += 1
+        elif token in ("}}", "]]"):
+            depth = max(depth - 1, 0)
+        elif depth == 0 and token in separators and limit != len(parts):
+            parts.append(text[start : match.start()])
+            start = match.end()
+        elif depth == 0 and token == "||" and "|" in separators and limit != len(parts):
+            # Parameter kosong: "a||b" = "a", "", "b"
+            parts.extend((text[start : match.start()], ""))
+            start = match.end()
+    parts.append(text[start:])
+    return parts
+
+
+def depth_change(text: str) -> int:
+    """Selisih pembuka & penutup {{ }} / [[ ]] di `text`."""
+    return text.count("{{") + text.count("[[") - text.count("}}") - text.count("]]")
+
+
+@dataclass(frozen=True, slots=True)
+class Template:
+    """Satu pemanggilan template: nama (lowercase) dan argumennya."""
+
+    name: str
+    args: tuple[str, ...]
+    named: dict[str, str]
+
+
+def iter_templates(text: str) -> Iterator[tuple[int, int, Template]]:
+    """(awal, akhir, template) untuk setiap template tingkat teratas di `text`."""
+    depth = 0
+    start = 0
+    for match in re.finditer(r"\{\{|\}\}", text):
+        if match.group() == "{{":
+            if depth == 0:
+                start = match.start()
+            depth += 1
+        elif depth:
+            depth -= 1
+            if depth == 0:
+                name, *params = split_top(text[start + 2 : match.start()])
+                args = []
+                named = {}
+                for param in params:
+                    key, sep, value = param.partition("=")
+                    if sep and "{{" not in key and "[[" not in key:
+                        named[key.strip().lower()] = value.strip()
+                    else:
+                        args.append(param.strip())
+                template = Template(name.strip().lower().replace("_", " "), tuple(args), named)
+                yield start, match.end(), template
+
+
+def plain_text(text: str, separator: str = "", render=None) -> str:
+    """
+    Teks biasa dari wikitext, padanan Tag.get_text(separator, strip=True):
+    link & format dihapus, <br> dan baris baru menjadi `separator`.
+    Template dirender lewat `render(template)` (None/"" = dihapus).
+    """
+    if not MARKUP.search(text):
+        return text.strip()
+
+    text = COMMENT.sub("", text)
+    if "{{" in text:
+        pieces = []
+        last = 0
+        for start, end, template in iter_templates(text):
+            pieces.append(text[last:start])
+            pieces.append((render(template) if render else None) or "")
+            last = end
+        pieces.append(text[last:])
+        text = "".join(pieces)
+
+    text = LINE_BREAK.sub("\n", text)
+    text = FILE_LINK.sub("", text)
+    text = WIKI_LINK.sub(r"\1", text)
+    text = EXTERNAL_LINK.sub(r"\1", text)
+    text = BOLD_ITALIC.sub("", text)
+    text = html.unescape(HTML_TAG.sub("", text)).replace("\xa0", " ")
+    return separator.join(line.strip() for line in text.splitlines() if line.strip())
+
+
+@dataclass(slots=True)
+class WikiCell:
+    """Satu sel tabel wikitext: header (!) atau data (|), isi tanpa atribut."""
+
+    header: bool
+    text: str
+
+
+def _cell(raw: str, header: bool) -> WikiCell:
+    # `style="..." | isi`: bagian sebelum | tunggal pertama adalah atribut
+    parts = split_top(raw, ("|",), limit=1)
+    if len(parts) == 2 and ATTRIBUTES.fullmatch(parts[0]):
+        raw = parts[1]
+    return WikiCell(header, raw.strip())
+
+
+def iter_wiki_rows(text: str, all_tables: bool = False) -> Iterator[tuple[int, list[WikiCell]]]:
+    """
+    (indeks tabel, sel) untuk setiap baris tabel wikitable di wikitext, termasuk
+    baris header; padanan parsers.soup_table_rows. Hanya tabel pertama, kecuali
+    `all_tables`. Tabel di dalam sel dan tabel non-wikitable dilewati.
+    """
+    index = -1
+    nesting = 0
+    active = False
+    row: list[WikiCell] = []
+    # Isi sel terakhir masih terbuka (template/link multi-baris)
+    pending = 0
+
+    def flush():
+        if active and row:
+            yield index, list(row)
+        row.clear()
+
+    for line in COMMENT.sub("", text).splitlines():
+        stripped = line.strip()
+
+        if pending > 0 and row:
+            row[-1].text += "\n" + line
+            pending += depth_change(line)
+            continue
+        pending = 0
+
+        if stripped.startswith("{|"):
+            nesting += 1
+            if nesting == 1:
+                active = "wikitable" in stripped
+                if active:
+                    if index >= 0 and not all_tables:
+                        return
+                    index += 1
+            elif active and row:
+                row[-1].text += "\n" + line
+            continue
+        if nesting > 1:
+            if stripped.startswith("|}"):
+                nesting -= 1
+            if active and row:
+                row[-1].text += "\n" + line
+            continue
+        if nesting == 0:
+            continue
+
+        if stripped.startswith("|}"):
+            yield from flush()
+            nesting -= 1
+            active = False
+        elif stripped.startswith("|-"):
+            yield from flush()
+        elif stripped.startswith("|+"):
+            continue
+        elif stripped.startswith(("!", "|")):
+            header = stripped.startswith("!")
+            separators = ("!!", "||") if header else ("||",)
+            for raw in split_top(stripped[1:], separators):
+                row.append(_cell(raw, header))
+            pending = depth_change(stripped)
+        elif row:
+            row[-1].text += "\n" + line
+            pending = depth_change(line)
+
+    yield from flush()
+
+
+def item_files(rows: list[tuple[int, list[WikiCell]]]) -> set[str]:
+    """Nama file gambar semua hadiah {{Item}}/{{Card}}/{{Card List}} di baris tabel."""
+    names = set()
+    for _, row in rows:
+        for cell in row:
+            if "{{" not in cell.text:
+                continue
+            for _, _, template in iter_templates(cell.text):
+                if not template.args:
+                    continue
+                if template.name in ITEM_TEMPLATES:
+                    names.add(ITEM_FILE.format(plain_text(template.args[0])))
+                elif template.name in ITEM_LIST_TEMPLATES:
+                    names.update(
+                        ITEM_FILE.format(name) for _, name in _list_items(template.args[0])
+                    )
+    return names
+
+
+def _list_items(value: str) -> Iterator[tuple[str, str]]:
+    """(nama tampil, nama item) dari "Nama*jumlah;Nama*jumlah"."""
+    for entry in value.split(";"):
+        name, _, count = entry.partition("*")
+        name = plain_text(name)
+        if name:
+            yield (f"{name}×{count.strip()}" if count.strip() else name), name
+
+
+class WikitextExtractor(TableExtractor):
+    """
+    TableExtractor untuk tabel wikitext: kode dari <code>/{{Code}}, hadiah dari
+    template {{Item}}/{{Card}} (atau teks, sesuai TableSpec), durasi dari teks sel.
+    Gambar hadiah memakai URL CDN dari `files` (lihat decode_file_info), sama
+    dengan mode HTML; file yang belum diketahui memakai Special:FilePath.
+    """
+
+    def __init__(self, spec: TableSpec, page_url: str):
+        super().__init__(spec)
+        self.page_url = page_url
+        # URL gambar hadiah bergantung pada wiki halaman
+        self.scope += f":{page_url}"
+        # Nama file -> URL CDN, diisi GameScraper sebelum ekstraksi
+        self.files: dict[str, str] = {}
+        # Reward per (nama tampil, URL gambar); item yang sama muncul di banyak baris
+        self._items: dict[tuple[str, str], Reward] = {}
+
+    def image(self, name: str) -> str:
+        file = ITEM_FILE.format(name)
+        return self.files.get(file) or file_url(self.page_url, file)
+
+    def _header_names(self, header: list[WikiCell]) -> list[str]:
+        return [plain_text(cell.text, " ").lower() for cell in header]
+
+    def _cells(self, row: list[WikiCell]) -> list[WikiCell]:
+        return [cell for cell in row if not cell.header]
+
+    def _text(self, cell: WikiCell, separator: str = "") -> str:
+        return plain_text(cell.text, separator, self._render)
+
+    def _fingerprint(self, row: list[WikiCell]) -> str:
+        return "\x1f".join(("!" if cell.header else "|") + cell.text for cell in row)
+
+    def _render(self, template: Template) -> str:
+        """Teks template yang dikenal, padanan hasil render HTML-nya."""
+        if template.name in CODE_TEMPLATES and template.args:
+            return template.args[0]
+        if template.name in ITEM_TEMPLATES and template.args:
+            return self._item_name(template)
+        if template.name in ITEM_LIST_TEMPLATES and template.args:
+            return ", ".join(name for name, _ in self._list_items(template))
+        return ""
+
+    @staticmethod
+    def _item_name(template: Template) -> str:
+        name = plain_text(template.args[0])
+        count = template.named.get("x") or (template.args[1] if len(template.args) > 1 else "")
+        return f"{name}×{count}" if count else name
+
+    @staticmethod
+    def _list_items(template: Template) -> Iterator[tuple[str, str]]:
+        return _list_items(template.args[0])
+
+    def _codes(self, cell: WikiCell) -> list[str]:
+        texts = [plain_text(inner) for inner in CODE_TAG.findall(cell.text)]
+        texts += [
+            plain_text(template.args[0])
+            for _, _, template in iter_templates(cell.text)
+            if template.name in CODE_TEMPLATES and template.args
+        ]
+        if not texts and self.spec.code_fallback:
+            texts = [self._text(cell)]
+        return [code for code in (CODE_CLEAN.sub("", t.upper()) for t in texts) if code]
+
+    def _rewards(self, cell: WikiCell) -> tuple[Reward, ...]:
+        if self.spec.rewards == "text":
+            items = REWARD_SPLIT.split(self._text(cell))
+            return tuple(Reward.intern(name, "") for name in (i.strip() for i in items) if name)
+
+        rewards = []
+        for _, _, template in iter_templates(cell.text):
+            if not template.args:
+                continue
+            if template.name in ITEM_TEMPLATES:
+                items = [(self._item_name(template), plain_text(template.args[0]))]
+            elif template.name in ITEM_LIST_TEMPLATES:
+                items = list(self._list_items(template))
+            else:
+                continue
+            for label, name in items:
+                key = (label, self.image(name))
+                reward = self._items.get(key)
+                if reward is None:
+                    reward = self._items[key] = Reward.intern(*key)
+                rewards.append(reward)
+        return tuple(rewards)